@@ -0,0 +1,6 @@
+"""离线基准测试
+
+在 AstrBot 的插件目录下以模块方式运行（不访问网络）::
+
+    python -m astrbot_plugin_github_star_verify.benchmarks --sizes 1000,100000
+"""
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from .bench_github_manager import (
+    bench_check_user_starred,
+    bench_fetch_stargazers,
+    bench_lookups,
+    bench_starred_recheck,
+    bench_sync_stargazers,
+    make_manager,
+)
+from ..etag_cache import StarredPageCache
+from ..storage import STORAGE_MEMORY, STORAGE_SQLITE, create_storage
+from .fake_github import FakeGitHub
+from .report import build_report, compare_reports, load_report, write_report
+
+DEFAULT_SIZES = "1000,100000"
+FULL_SIZES = "1000,100000,1000000"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GitHub Star Verify 离线基准测试")
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"模拟仓库的Star数量，逗号分隔（默认 {DEFAULT_SIZES}）",
+    )
+    parser.add_argument(
+        "--full", action="store_true", help=f"使用完整规模 {FULL_SIZES}"
+    )
+    parser.add_argument(
+        "--storage",
+        choices=(STORAGE_SQLITE, STORAGE_MEMORY),
+        default=STORAGE_SQLITE,
+        help="存储后端；memory 排除磁盘 I/O，只测量验证逻辑的 CPU 开销",
+    )
+    parser.add_argument("--samples", type=int, default=2000, help="查询延迟的采样次数")
+    parser.add_argument("--output", default="", help="结果JSON路径（默认写入 benchmarks/results/）")
+    parser.add_argument("--baseline", default="", help="用于比较的基线结果JSON")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="允许的相对退化比例（默认 0.2）"
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args) -> dict:
+    sizes = [int(s) for s in (FULL_SIZES if args.full else args.sizes).split(",") if s]
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="github-star-bench-") as tmp:
+        # 使用临时数据库，避免污染插件数据
+        storage = create_storage(args.storage, tmp)
+        await storage.init()
+
+        fake = FakeGitHub()
+        manager = make_manager(fake, storage=storage)
+        try:
+            for stars in sizes:
+                print(f"[bench] fetch_stargazers {stars} ...", flush=True)
+                results[f"fetch_stargazers_{stars}"] = await bench_fetch_stargazers(
+                    manager, fake, stars
+                )
+                print(f"[bench] sync_stargazers {stars} ...", flush=True)
+                results[f"sync_stargazers_{stars}"] = await bench_sync_stargazers(
+                    manager, stars
+                )
+                print(f"[bench] lookups {stars} ...", flush=True)
+                results[f"lookups_{stars}"] = await bench_lookups(
+                    manager, stars, samples=args.samples
+                )
+
+            print("[bench] check_user_starred_directly ...", flush=True)
+            results["check_user_starred"] = await bench_check_user_starred(manager, fake)
+        finally:
+            await manager.close()
+
+        print("[bench] starred recheck with ETag cache ...", flush=True)
+        cache = StarredPageCache(os.path.join(tmp, "http_cache.db"))
+        cached_manager = make_manager(fake, etag_cache=cache, storage=storage)
+        try:
+            results["starred_recheck"] = await bench_starred_recheck(cached_manager, fake)
+        finally:
+            await cached_manager.close()
+
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    report = build_report(results)
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "results",
+        f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json",
+    )
+    write_report(report, output)
+
+    for bench, metrics in results.items():
+        print(f"\n{bench}")
+        for name, value in metrics.items():
+            print(f"  {name}: {value:.4g}")
+    print(f"\n结果已写入: {output}")
+
+    if args.baseline:
+        regressions = compare_reports(load_report(args.baseline), report, args.tolerance)
+        if regressions:
+            print("\n性能退化:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\n与基线相比无明显退化")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
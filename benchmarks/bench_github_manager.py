@@ -0,0 +1,176 @@
+"""GitHubStarManager / MultiRepoGitHubStarManager 的离线基准测试"""
+
+import random
+import statistics
+import time
+from typing import Dict, List
+from .. import github_manager
+from ..etag_cache import StarredPageCache
+from ..github_manager import MultiRepoGitHubStarManager
+from ..storage import StarStorage
+from .fake_github import FakeGitHub
+
+TARGET_REPO = "bench/target"
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "p50_ms": pick(0.50) * 1000,
+        "p95_ms": pick(0.95) * 1000,
+        "p99_ms": pick(0.99) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+def repo_name(stars: int) -> str:
+    return f"bench/stars-{stars}"
+
+
+def make_manager(
+    fake: FakeGitHub, etag_cache: StarredPageCache = None, storage: StarStorage = None
+) -> MultiRepoGitHubStarManager:
+    """创建使用模拟 GitHub 的管理器，翻页间隔设为 0 以测量纯处理开销"""
+    manager = MultiRepoGitHubStarManager(
+        github_token="offline-benchmark",
+        default_repo=TARGET_REPO,
+        group_repo_map={},
+        etag_cache=etag_cache,
+        storage=storage,
+    )
+    manager.http_client = fake.client(timeout=30.0)
+    github_manager.GitHubStarManager.page_delay = 0
+    return manager
+
+
+async def bench_fetch_stargazers(
+    manager: MultiRepoGitHubStarManager, fake: FakeGitHub, stars: int
+) -> Dict[str, float]:
+    """fetch_stargazers 吞吐：用户数/秒、页数/秒（已扣除模拟服务端耗时）"""
+    repo = repo_name(stars)
+    fake.add_repo(repo, stars)
+    fake.reset_counters()
+
+    start = time.perf_counter()
+    users = await manager.get_manager_for_repo(repo).fetch_stargazers()
+    elapsed = time.perf_counter() - start
+    client_elapsed = max(elapsed - fake.server_seconds, 1e-9)
+
+    assert len(users) == stars, f"expected {stars} stargazers, got {len(users)}"
+    return {
+        "stars": stars,
+        "requests": fake.request_count,
+        "wall_seconds": elapsed,
+        "client_seconds": client_elapsed,
+        "users_per_second": stars / client_elapsed,
+        "pages_per_second": fake.request_count / client_elapsed,
+    }
+
+
+async def bench_sync_stargazers(
+    manager: MultiRepoGitHubStarManager, stars: int
+) -> Dict[str, float]:
+    """sync_stargazers 写入速度：首次全量写入与重复同步（无新增）"""
+    repo = repo_name(stars)
+    users = [f"user{i}" for i in range(stars)]
+    repo_manager = manager.get_manager_for_repo(repo)
+
+    start = time.perf_counter()
+    await repo_manager.sync_stargazers(users)
+    initial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await repo_manager.sync_stargazers(users)
+    resync = time.perf_counter() - start
+
+    return {
+        "rows": stars,
+        "initial_seconds": initial,
+        "resync_seconds": resync,
+        "initial_rows_per_second": stars / max(initial, 1e-9),
+        "resync_rows_per_second": stars / max(resync, 1e-9),
+    }
+
+
+async def bench_check_user_starred(
+    manager: MultiRepoGitHubStarManager, fake: FakeGitHub
+) -> Dict[str, float]:
+    """check_user_starred_directly 的请求数：目标仓库在第1页、第5页、未Star（10页）"""
+    cases = {
+        "first_page": (10, 1),
+        "fifth_page": (10, 5),
+        "not_starred": (10, None),
+    }
+    results: Dict[str, float] = {}
+    for case, (pages, target_page) in cases.items():
+        login = f"starred-{case}"
+        fake.add_starred_user(login, pages, TARGET_REPO, target_page)
+        fake.reset_counters()
+
+        start = time.perf_counter()
+        starred = await manager.check_user_starred_directly(login, TARGET_REPO)
+        elapsed = time.perf_counter() - start
+
+        assert starred == (target_page is not None)
+        results[f"{case}_requests"] = fake.request_count
+        results[f"{case}_client_ms"] = max(elapsed - fake.server_seconds, 0) * 1000
+    return results
+
+
+async def bench_starred_recheck(
+    manager: MultiRepoGitHubStarManager, fake: FakeGitHub, pages: int = 10
+) -> Dict[str, float]:
+    """开启ETag缓存时重复检查同一用户：第二次检查的304数量与消耗的配额"""
+    login = "starred-recheck"
+    fake.add_starred_user(login, pages, TARGET_REPO, None)
+    results: Dict[str, float] = {}
+    for run in ("first", "recheck"):
+        fake.reset_counters()
+        start = time.perf_counter()
+        assert not await manager.check_user_starred_directly(login, TARGET_REPO)
+        elapsed = time.perf_counter() - start
+        results[f"{run}_requests"] = fake.request_count
+        results[f"{run}_not_modified"] = fake.not_modified
+        results[f"{run}_quota_used"] = fake.rate_limit - fake.remaining
+        results[f"{run}_client_ms"] = max(elapsed - fake.server_seconds, 0) * 1000
+    return results
+
+
+async def bench_lookups(
+    manager: MultiRepoGitHubStarManager, stars: int, samples: int = 2000
+) -> Dict[str, float]:
+    """is_stargazer 与 bind_github_qq_to_repo 的单次延迟分布"""
+    repo = repo_name(stars)
+    rng = random.Random(stars)
+
+    hit_latencies = []
+    miss_latencies = []
+    for _ in range(samples):
+        login = f"user{rng.randrange(stars)}"
+        start = time.perf_counter()
+        assert await manager.is_stargazer(login, repo)
+        hit_latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        assert not await manager.is_stargazer(f"missing{rng.randrange(stars)}", repo)
+        miss_latencies.append(time.perf_counter() - start)
+
+    bind_latencies = []
+    for i in range(min(samples, stars)):
+        start = time.perf_counter()
+        assert await manager.bind_github_qq_to_repo(f"user{i}", str(10_000_000 + i), repo)
+        bind_latencies.append(time.perf_counter() - start)
+
+    results: Dict[str, float] = {}
+    for name, latencies in (
+        ("is_stargazer_hit", hit_latencies),
+        ("is_stargazer_miss", miss_latencies),
+        ("bind", bind_latencies),
+    ):
+        for key, value in _percentiles(latencies).items():
+            results[f"{name}_{key}"] = value
+    return results
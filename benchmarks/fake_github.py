@@ -0,0 +1,247 @@
+"""离线的 GitHub API 模拟，基于 httpx.MockTransport
+
+提供 /repos/{owner}/{repo}、/repos/{owner}/{repo}/stargazers、/users/{user}/starred 接口以及
+X-RateLimit-* 响应头，starred 接口支持 ETag 条件请求。仓库的 Star 用户按序号确定性生成（user0, user1, ...），
+响应体字段与真实接口保持一致的规模，以便基准测试反映真实的解析开销。
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Dict, Optional
+import httpx
+
+API_HOST = "api.github.com"
+
+_REPO_RE = re.compile(r"^/repos/([^/]+/[^/]+)$")
+_STARGAZERS_RE = re.compile(r"^/repos/([^/]+/[^/]+)/stargazers$")
+_STARRED_RE = re.compile(r"^/users/([^/]+)/starred$")
+
+
+def _user_object(login: str, user_id: int) -> Dict:
+    """与 GitHub 返回的 simple-user 对象字段一致"""
+    base = f"https://api.github.com/users/{login}"
+    return {
+        "login": login,
+        "id": user_id,
+        "node_id": f"MDQ6VXNlcj{user_id:08d}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{user_id}?v=4",
+        "gravatar_id": "",
+        "url": base,
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"{base}/followers",
+        "following_url": f"{base}/following{{/other_user}}",
+        "gists_url": f"{base}/gists{{/gist_id}}",
+        "starred_url": f"{base}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{base}/subscriptions",
+        "organizations_url": f"{base}/orgs",
+        "repos_url": f"{base}/repos",
+        "events_url": f"{base}/events{{/privacy}}",
+        "received_events_url": f"{base}/received_events",
+        "type": "User",
+        "user_view_type": "public",
+        "site_admin": False,
+    }
+
+
+def _starred_at(index: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1704067200 + index * 3600))
+
+
+def _repo_object(full_name: str, repo_id: int) -> Dict:
+    """精简但字段规模接近真实接口的仓库对象"""
+    owner, name = full_name.split("/", 1)
+    base = f"https://api.github.com/repos/{full_name}"
+    return {
+        "id": repo_id,
+        "node_id": f"MDEwOlJlcG9zaXRvcnk{repo_id:08d}",
+        "name": name,
+        "full_name": full_name,
+        "private": False,
+        "owner": _user_object(owner, repo_id),
+        "html_url": f"https://github.com/{full_name}",
+        "description": "Synthetic repository for offline benchmarks",
+        "fork": False,
+        "url": base,
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "pushed_at": "2024-01-01T00:00:00Z",
+        "homepage": None,
+        "size": 1024,
+        "stargazers_count": 100,
+        "watchers_count": 100,
+        "language": "Python",
+        "forks_count": 10,
+        "open_issues_count": 1,
+        "license": None,
+        "topics": [],
+        "visibility": "public",
+        "default_branch": "main",
+    }
+
+
+class FakeGitHub:
+    """模拟 GitHub API 的状态与路由
+
+    - repos: 仓库名 -> Star 用户数量，Star 用户为 user0 ... user{n-1}
+    - starred_pages: 用户名 -> (Star列表总页数, 目标仓库所在页或None, 目标仓库)
+    - latency: 每个请求附加的模拟延迟（秒），0 表示不延迟
+    """
+
+    def __init__(self, rate_limit: int = 1_000_000_000, latency: float = 0.0):
+        self.repos: Dict[str, int] = {}
+        self.starred_pages: Dict[str, tuple] = {}
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.latency = latency
+        self.request_count = 0
+        self.not_modified = 0
+        self.requests_by_endpoint: Dict[str, int] = {}
+        # 生成响应所花的时间，基准结果中会扣除以只统计客户端开销
+        self.server_seconds = 0.0
+
+    def add_repo(self, full_name: str, stars: int):
+        self.repos[full_name] = stars
+
+    def add_starred_user(
+        self, login: str, pages: int, target_repo: str, target_page: Optional[int]
+    ):
+        """为用户生成 pages 页 Star 列表，目标仓库位于 target_page 页（None 表示未Star）"""
+        self.starred_pages[login] = (pages, target_page, target_repo)
+
+    def reset_counters(self):
+        self.request_count = 0
+        self.not_modified = 0
+        self.requests_by_endpoint = {}
+        self.server_seconds = 0.0
+        self.remaining = self.rate_limit
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def client(self, **kwargs) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=self.transport(), **kwargs)
+
+    def _headers(self, request: httpx.Request, page: int, last_page: int) -> Dict[str, str]:
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+            "X-RateLimit-Used": str(self.rate_limit - max(self.remaining, 0)),
+        }
+        links = []
+        url = request.url
+        if page < last_page:
+            links.append(f'<{url.copy_set_param("page", page + 1)}>; rel="next"')
+            links.append(f'<{url.copy_set_param("page", last_page)}>; rel="last"')
+        if page > 1:
+            links.append(f'<{url.copy_set_param("page", 1)}>; rel="first"')
+            links.append(f'<{url.copy_set_param("page", page - 1)}>; rel="prev"')
+        if links:
+            headers["Link"] = ", ".join(links)
+        return headers
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.handle_sync(request)
+
+    def handle_sync(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            return self._route(request)
+        finally:
+            self.server_seconds += time.perf_counter() - start
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        self.request_count += 1
+        self.remaining -= 1
+
+        if request.url.host != API_HOST:
+            return httpx.Response(404, json={"message": "Not Found"})
+        if self.remaining < 0:
+            return httpx.Response(
+                403,
+                json={"message": "API rate limit exceeded"},
+                headers={"X-RateLimit-Remaining": "0"},
+            )
+
+        path = request.url.path
+        page = int(request.url.params.get("page", 1))
+        per_page = min(int(request.url.params.get("per_page", 30)), 100)
+
+        match = _STARGAZERS_RE.match(path)
+        if match:
+            self._count("stargazers")
+            return self._stargazers(request, match.group(1), page, per_page)
+
+        match = _REPO_RE.match(path)
+        if match and match.group(1) in self.repos:
+            self._count("repo")
+            body = _repo_object(match.group(1), 1)
+            body["stargazers_count"] = body["watchers_count"] = self.repos[match.group(1)]
+            return httpx.Response(200, json=body, headers=self._headers(request, 1, 1))
+
+        match = _STARRED_RE.match(path)
+        if match:
+            self._count("starred")
+            return self._starred(request, match.group(1), page, per_page)
+
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    def _count(self, endpoint: str):
+        self.requests_by_endpoint[endpoint] = self.requests_by_endpoint.get(endpoint, 0) + 1
+
+    def _stargazers(self, request, repo: str, page: int, per_page: int) -> httpx.Response:
+        if repo not in self.repos:
+            return httpx.Response(404, json={"message": "Not Found"})
+
+        total = self.repos[repo]
+        last_page = max((total + per_page - 1) // per_page, 1)
+        start = (page - 1) * per_page
+        end = min(start + per_page, total)
+        body = [_user_object(f"user{i}", i + 1) for i in range(start, end)]
+        if "star+json" in request.headers.get("Accept", ""):
+            # 与 GitHub 一致：star+json 格式在每个用户外包一层并附带 Star 时间（每小时一个）
+            body = [
+                {"starred_at": _starred_at(start + offset), "user": user}
+                for offset, user in enumerate(body)
+            ]
+        return httpx.Response(
+            200,
+            content=json.dumps(body).encode(),
+            headers=self._headers(request, page, last_page),
+        )
+
+    def _starred(self, request, login: str, page: int, per_page: int) -> httpx.Response:
+        if login not in self.starred_pages:
+            return httpx.Response(404, json={"message": "Not Found"})
+
+        pages, target_page, target_repo = self.starred_pages[login]
+        if page > pages:
+            body = []
+        else:
+            body = []
+            for i in range(per_page):
+                index = (page - 1) * per_page + i
+                full_name = f"other-{index}/repo-{index}"
+                if page == target_page and i == per_page // 2:
+                    full_name = target_repo
+                body.append(
+                    {
+                        "starred_at": "2024-01-01T00:00:00Z",
+                        "repo": _repo_object(full_name, index + 1),
+                    }
+                )
+        content = json.dumps(body).encode()
+        headers = self._headers(request, page, pages)
+        headers["ETag"] = f'"{hashlib.sha1(content).hexdigest()}"'
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            # 与 GitHub 一致：条件请求命中时返回 304，且不计入配额
+            self.remaining += 1
+            self.not_modified += 1
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, content=content, headers=headers)
@@ -0,0 +1,153 @@
+"""用于压测与回放的 aiocqhttp 替身：模拟 bot.api.call_action、Context 与事件对象"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeOneBotApi:
+    """记录所有 OneBot 调用，可为每次调用附加模拟延迟"""
+
+    def __init__(self, self_id: str, latency: float = 0.0):
+        self.self_id = self_id
+        self.latency = latency
+        self.calls: List[Tuple[float, str, Dict[str, Any]]] = []
+        self.call_counts: Dict[str, int] = {}
+        self.members: Dict[int, Dict[str, str]] = {}  # group_id -> {user_id: nickname}
+        self.listeners = []
+
+    async def call_action(self, action: str, **params) -> Any:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        now = time.perf_counter()
+        self.calls.append((now, action, params))
+        self.call_counts[action] = self.call_counts.get(action, 0) + 1
+        for listener in self.listeners:
+            listener(now, action, params)
+
+        group_id = params.get("group_id")
+        if action == "get_group_member_info":
+            user_id = str(params.get("user_id"))
+            if user_id == self.self_id:
+                return {"user_id": int(user_id), "role": "admin"}
+            nickname = self.members.get(group_id, {}).get(user_id, user_id)
+            return {"user_id": int(user_id), "nickname": nickname, "role": "member"}
+        if action == "get_group_member_list":
+            return [
+                {"user_id": int(uid), "nickname": name, "card": ""}
+                for uid, name in self.members.get(group_id, {}).items()
+            ]
+        if action == "set_group_kick":
+            self.members.get(group_id, {}).pop(str(params.get("user_id")), None)
+            return None
+        if action in ("send_group_msg", "set_group_add_request"):
+            return {"message_id": len(self.calls)}
+        return {}
+
+
+class FakeBot:
+    def __init__(self, self_id: str = "10000", latency: float = 0.0):
+        self.self_id = self_id
+        self.api = FakeOneBotApi(self_id, latency)
+
+
+class FakePlatform:
+    def __init__(self, bot: FakeBot):
+        self.bot = bot
+
+    def get_client(self) -> FakeBot:
+        return self.bot
+
+
+class FakeContext:
+    """满足插件所用接口的最小 Context"""
+
+    def __init__(self, bot: FakeBot):
+        self.bot = bot
+
+    def get_platform(self, name: str) -> FakePlatform:
+        return FakePlatform(self.bot)
+
+
+class _MessageObject:
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw_message = raw
+
+
+class FakeEvent:
+    """按原始 OneBot 事件构造的 AstrMessageEvent 替身"""
+
+    def __init__(self, bot: FakeBot, raw: Dict[str, Any], message_str: str = ""):
+        self.bot = bot
+        self.message_obj = _MessageObject(raw)
+        self.message_str = message_str
+        self.stopped = False
+
+    def get_platform_name(self) -> str:
+        return "aiocqhttp"
+
+    def get_self_id(self) -> str:
+        return self.bot.self_id
+
+    def get_sender_id(self) -> str:
+        return str(self.message_obj.raw_message.get("user_id"))
+
+    def get_group_id(self) -> Optional[str]:
+        group_id = self.message_obj.raw_message.get("group_id")
+        return str(group_id) if group_id is not None else None
+
+    def stop_event(self):
+        self.stopped = True
+
+    def plain_result(self, text: str) -> str:
+        return text
+
+
+def join_event(bot: FakeBot, user_id: int, group_id: int) -> FakeEvent:
+    return FakeEvent(
+        bot,
+        {
+            "post_type": "notice",
+            "notice_type": "group_increase",
+            "sub_type": "approve",
+            "user_id": user_id,
+            "group_id": group_id,
+            "self_id": int(bot.self_id),
+            "time": int(time.time()),
+        },
+    )
+
+
+def leave_event(bot: FakeBot, user_id: int, group_id: int) -> FakeEvent:
+    return FakeEvent(
+        bot,
+        {
+            "post_type": "notice",
+            "notice_type": "group_decrease",
+            "sub_type": "leave",
+            "user_id": user_id,
+            "group_id": group_id,
+            "self_id": int(bot.self_id),
+            "time": int(time.time()),
+        },
+    )
+
+
+def reply_event(bot: FakeBot, user_id: int, group_id: int, text: str) -> FakeEvent:
+    """@机器人 并回复文本的群消息"""
+    return FakeEvent(
+        bot,
+        {
+            "post_type": "message",
+            "message_type": "group",
+            "user_id": user_id,
+            "group_id": group_id,
+            "self_id": int(bot.self_id),
+            "time": int(time.time()),
+            "message": [
+                {"type": "at", "data": {"qq": bot.self_id}},
+                {"type": "text", "data": {"text": f" {text}"}},
+            ],
+        },
+        message_str=f"[CQ:at,qq={bot.self_id}] {text}",
+    )
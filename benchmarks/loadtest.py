@@ -0,0 +1,270 @@
+"""事件级压测：模拟入群潮
+
+构造 GitHubStarVerifyPlugin（替身 Context 与 aiocqhttp bot、模拟 GitHub、临时数据库），
+按设定速率在多个群中回放 group_increase、验证回复与 group_decrease 事件，
+统计吞吐、事件处理延迟、入群到欢迎消息的延迟、存活任务数、内存增长以及
+每次验证的 OneBot 调用数。
+
+    python -m astrbot_plugin_github_star_verify.benchmarks.loadtest --joins 5000 --duration 60 --groups 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from typing import Dict, List
+from ..main import GitHubStarVerifyPlugin
+from .bench_github_manager import TARGET_REPO, _percentiles, make_manager
+from .fake_github import FakeGitHub
+from .fake_onebot import FakeBot, FakeContext, join_event, leave_event, reply_event
+from .report import build_report, write_report
+from ..storage import STORAGE_MEMORY, STORAGE_SQLITE, create_storage
+
+WELCOME_TAG = "[welcome]"
+_AT_RE = re.compile(r"\[CQ:at,qq=(\d+)\]")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GitHub Star Verify 入群潮压测")
+    parser.add_argument("--joins", type=int, default=5000, help="入群事件总数")
+    parser.add_argument("--duration", type=float, default=60.0, help="入群事件分布的时长（秒）")
+    parser.add_argument("--groups", type=int, default=50, help="群数量")
+    parser.add_argument("--stars", type=int, default=100_000, help="数据库中预置的Star用户数")
+    parser.add_argument("--reply-ratio", type=float, default=0.7, help="回复有效用户名的比例")
+    parser.add_argument("--api-ratio", type=float, default=0.1, help="回复中需走GitHub API的比例")
+    parser.add_argument("--leave-ratio", type=float, default=0.1, help="验证前主动退群的比例")
+    parser.add_argument("--reply-delay", type=float, default=3.0, help="入群到回复的最大延迟（秒）")
+    parser.add_argument("--timeout", type=int, default=10, help="插件 verification_timeout（秒）")
+    parser.add_argument("--kick-delay", type=int, default=2, help="插件 kick_delay（秒）")
+    parser.add_argument("--onebot-latency", type=float, default=0.005, help="每次OneBot调用的模拟延迟")
+    parser.add_argument("--github-latency", type=float, default=0.05, help="每次GitHub请求的模拟延迟")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="覆盖插件配置项，VALUE 按 JSON 解析（如 --set send_rate=5）",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=(STORAGE_SQLITE, STORAGE_MEMORY),
+        default=STORAGE_SQLITE,
+        help="存储后端；memory 排除磁盘 I/O",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="使用 tracemalloc 统计Python内存分配（会显著降低吞吐）",
+    )
+    parser.add_argument("--output", default="", help="结果JSON路径（默认写入 benchmarks/results/）")
+    return parser.parse_args(argv)
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.bot = FakeBot(latency=args.onebot_latency)
+        self.fake_github = FakeGitHub(latency=args.github_latency)
+        self.handle_latencies: Dict[str, List[float]] = {"join": [], "reply": [], "leave": []}
+        self.join_at: Dict[str, float] = {}
+        self.welcome_latencies: List[float] = []
+        self.max_tasks = 0
+        self.events = 0
+
+    def make_plugin(self) -> GitHubStarVerifyPlugin:
+        config = {
+            "github_token": "offline-loadtest",
+            "github_repo": TARGET_REPO,
+            "verification_timeout": self.args.timeout,
+            "kick_delay": self.args.kick_delay,
+            "welcome_message": WELCOME_TAG + " {at_user}",
+        }
+        for item in self.args.set:
+            key, _, value = item.partition("=")
+            try:
+                config[key] = json.loads(value)
+            except ValueError:
+                config[key] = value
+        return GitHubStarVerifyPlugin(FakeContext(self.bot), config)
+
+    def _on_call(self, now: float, action: str, params: Dict):
+        if action != "send_group_msg":
+            return
+        message = params.get("message", "")
+        if not message.startswith(WELCOME_TAG):
+            return
+        for uid in _AT_RE.findall(message):
+            joined = self.join_at.pop(uid, None)
+            if joined is not None:
+                self.welcome_latencies.append(now - joined)
+
+    async def _dispatch(self, plugin, kind: str, event):
+        start = time.perf_counter()
+        await plugin.handle_event(event)
+        self.handle_latencies[kind].append(time.perf_counter() - start)
+        self.events += 1
+
+    async def _member_lifecycle(self, plugin, uid: int, gid: int, join_delay: float):
+        await asyncio.sleep(join_delay)
+        self.bot.api.members.setdefault(gid, {})[str(uid)] = f"member{uid}"
+        self.join_at[str(uid)] = time.perf_counter()
+        await self._dispatch(plugin, "join", join_event(self.bot, uid, gid))
+
+        roll = self.rng.random()
+        await asyncio.sleep(self.rng.uniform(0.2, self.args.reply_delay))
+        if roll < self.args.leave_ratio:
+            self.bot.api.members.get(gid, {}).pop(str(uid), None)
+            self.join_at.pop(str(uid), None)
+            await self._dispatch(plugin, "leave", leave_event(self.bot, uid, gid))
+        elif roll < self.args.leave_ratio + self.args.reply_ratio:
+            if self.rng.random() < self.args.api_ratio:
+                # 数据库中不存在，需要通过GitHub API确认
+                login = f"api-user{uid}"
+                self.fake_github.add_starred_user(login, 3, TARGET_REPO, 2)
+            else:
+                login = f"user{self.rng.randrange(self.args.stars)}"
+            await self._dispatch(plugin, "reply", reply_event(self.bot, uid, gid, login))
+        # 其余成员不回复，等待超时踢出
+
+    def _memory_kib(self) -> float:
+        """tracemalloc 开启时为Python已分配内存，否则为进程峰值RSS"""
+        if tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0] / 1024
+        return self._peak_memory_kib()
+
+    def _peak_memory_kib(self) -> float:
+        if tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[1] / 1024
+        if resource is None:
+            return 0.0
+        # Linux 下 ru_maxrss 单位为 KiB，macOS 为字节
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024 if sys.platform == "darwin" else float(rss)
+
+    async def _sample_tasks(self, stop: asyncio.Event):
+        while not stop.is_set():
+            self.max_tasks = max(self.max_tasks, len(asyncio.all_tasks()))
+            await asyncio.sleep(0.1)
+
+    async def run(self) -> Dict[str, Dict[str, float]]:
+        args = self.args
+        self.bot.api.listeners.append(self._on_call)
+
+        with tempfile.TemporaryDirectory(prefix="github-star-loadtest-") as tmp:
+            plugin = self.make_plugin()
+            plugin.github_manager = make_manager(
+                self.fake_github, storage=create_storage(args.storage, tmp)
+            )
+            await plugin.github_manager.init_database()
+            await plugin.github_manager.get_manager_for_repo(TARGET_REPO).sync_stargazers(
+                [f"user{i}" for i in range(args.stars)]
+            )
+
+            if args.tracemalloc:
+                tracemalloc.start()
+            baseline_memory = self._memory_kib()
+            baseline_tasks = len(asyncio.all_tasks())
+
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(self._sample_tasks(stop))
+            start = time.perf_counter()
+
+            members = [
+                self._member_lifecycle(
+                    plugin,
+                    uid=2_000_000 + i,
+                    gid=100_000 + i % args.groups,
+                    join_delay=self.rng.uniform(0, args.duration),
+                )
+                for i in range(args.joins)
+            ]
+            await asyncio.gather(*members)
+            events_done = time.perf_counter()
+
+            # 等待所有超时、踢出与出站消息完成
+            while (
+                plugin.pending
+                or plugin.outbound.pending_count()
+                or plugin.verification_pool.in_flight()
+            ):
+                await asyncio.sleep(0.2)
+            drained = time.perf_counter()
+
+            stop.set()
+            await sampler
+            final_memory = self._memory_kib()
+            peak_memory = self._peak_memory_kib()
+            if args.tracemalloc:
+                tracemalloc.stop()
+            await plugin.__aexit__(None, None, None)
+
+        counts = self.bot.api.call_counts
+        verified = len(self.welcome_latencies)
+        total_calls = sum(counts.values())
+        results: Dict[str, Dict[str, float]] = {
+            "throughput": {
+                "events": self.events,
+                "event_phase_seconds": events_done - start,
+                "drain_seconds": drained - events_done,
+                "events_per_second": self.events / max(events_done - start, 1e-9),
+            },
+            "resources": {
+                "baseline_tasks": baseline_tasks,
+                "max_tasks_alive": self.max_tasks,
+                "memory_growth_kib": final_memory - baseline_memory,
+                "memory_peak_kib": peak_memory,
+            },
+            "onebot": {
+                "total_calls": total_calls,
+                "verified": verified,
+                "calls_per_verification": total_calls / max(verified, 1),
+                **{f"{action}_calls": n for action, n in sorted(counts.items())},
+            },
+            "github": {
+                "requests": self.fake_github.request_count,
+            },
+        }
+        for kind, latencies in self.handle_latencies.items():
+            if latencies:
+                results[f"handle_{kind}"] = _percentiles(latencies)
+        if self.welcome_latencies:
+            results["join_to_welcome"] = _percentiles(self.welcome_latencies)
+        return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(LoadTest(args).run())
+    report = build_report(results)
+    report["params"] = vars(args)
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "results",
+        f"loadtest-{time.strftime('%Y%m%d-%H%M%S')}.json",
+    )
+    write_report(report, output)
+
+    for section, metrics in results.items():
+        print(f"\n{section}")
+        for name, value in metrics.items():
+            print(f"  {name}: {value:.4g}")
+    print(f"\n结果已写入: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""回放生产环境录制的流量
+
+读取 record_enabled 录制的 gzip JSONL 文件，按原始时间间隔（或按 --speed 加速）
+将 OneBot 事件送入替身 Context 构造的插件；GitHub 请求由录制的结果摘要应答，
+并按录制耗时（同样按倍速缩放）延迟返回。统计项与 loadtest 相同，便于在真实
+流量形态下比较缓存、调度等改动前后的表现。
+
+    python -m astrbot_plugin_github_star_verify.benchmarks.replay recording.jsonl.gz --speed 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Tuple
+import httpx
+from ..trace_recorder import load_trace
+from .bench_github_manager import _percentiles, make_manager
+from .fake_github import _repo_object, _user_object
+from .fake_onebot import FakeBot, FakeEvent
+from .loadtest import LoadTest
+from .report import build_report, write_report
+from ..storage import SQLiteStarStorage
+
+_EVENT_KINDS = {"group_increase": "join", "group_decrease": "leave"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GitHub Star Verify 录制流量回放")
+    parser.add_argument("recording", help="录制文件（.jsonl.gz）")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="回放倍速，0 表示不等待、尽快回放"
+    )
+    parser.add_argument(
+        "--db", default="", help="作为初始状态的数据库快照（会复制后使用），默认空数据库"
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=10, help="插件 verification_timeout（秒，不随倍速缩放）"
+    )
+    parser.add_argument("--kick-delay", type=int, default=2, help="插件 kick_delay（秒）")
+    parser.add_argument("--onebot-latency", type=float, default=0.005, help="每次OneBot调用的模拟延迟")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="覆盖插件配置项，VALUE 按 JSON 解析（如 --set send_rate=5）",
+    )
+    parser.add_argument("--output", default="", help="结果JSON路径（默认写入 benchmarks/results/）")
+    args = parser.parse_args(argv)
+    # LoadTest 所需但回放不使用的参数
+    args.seed = 1
+    args.github_latency = 0.0
+    args.tracemalloc = False
+    return args
+
+
+class RecordedGitHub:
+    """按录制的结果摘要应答 GitHub 请求
+
+    同一 (接口, 用户名/仓库, 页码) 录制了多次时按顺序依次返回，用尽后重复最后一次；
+    未录制的请求返回 404。
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], speed: float):
+        self.speed = speed
+        self.outcomes: Dict[Tuple[str, str, int], Deque[Dict[str, Any]]] = defaultdict(deque)
+        for record in records:
+            key = (record["endpoint"], record["subject"], record.get("page") or 1)
+            self.outcomes[key].append(record)
+        self.request_count = 0
+        self.unmatched = 0
+
+    def client(self, **kwargs) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle), **kwargs)
+
+    def _next_outcome(self, key) -> Dict[str, Any]:
+        queue = self.outcomes.get(key)
+        if not queue:
+            return None
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.request_count += 1
+        parts = request.url.path.strip("/").split("/")
+        if parts[0] == "repos" and len(parts) == 3:
+            endpoint, subject = "repo", "/".join(parts[1:])
+        else:
+            endpoint, subject = parts[-1], "/".join(parts[1:-1])
+        page = int(request.url.params.get("page", 1))
+
+        outcome = self._next_outcome((endpoint, subject, page))
+        if outcome is None:
+            self.unmatched += 1
+            return httpx.Response(404, json={"message": "Not Found"})
+        if self.speed > 0:
+            await asyncio.sleep(outcome["elapsed_ms"] / 1000 / self.speed)
+
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        if outcome.get("remaining") is not None:
+            headers["X-RateLimit-Remaining"] = str(outcome["remaining"])
+        if outcome.get("has_next"):
+            next_url = request.url.copy_set_param("page", page + 1)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        if outcome["status"] != 200:
+            return httpx.Response(outcome["status"], json={"message": "recorded"}, headers=headers)
+        return httpx.Response(200, json=self._body(outcome, page), headers=headers)
+
+    def _body(self, outcome: Dict[str, Any], page: int) -> Any:
+        count = outcome.get("count", 0)
+        if outcome["endpoint"] == "repo":
+            return {"full_name": outcome["subject"], "stargazers_count": count}
+        if outcome["endpoint"] == "stargazers":
+            # 插件以 star+json 格式请求 stargazers
+            return [
+                {
+                    "starred_at": "2024-01-01T00:00:00Z",
+                    "user": _user_object(f"replay-{page}-{i}", page * 1000 + i),
+                }
+                for i in range(count)
+            ]
+        body = [
+            {
+                "starred_at": "2024-01-01T00:00:00Z",
+                "repo": _repo_object(f"replay/repo-{page}-{i}", page * 1000 + i),
+            }
+            for i in range(count)
+        ]
+        if outcome.get("matched") and body:
+            body[-1]["repo"] = _repo_object(outcome["target"], 1)
+        return body
+
+
+class Replay(LoadTest):
+    def __init__(self, args):
+        super().__init__(args)
+        records = load_trace(args.recording)
+        self.event_records = [r for r in records if r.get("kind") == "event"]
+        self.github = RecordedGitHub(
+            [r for r in records if r.get("kind") == "github"], args.speed
+        )
+        self.handle_latencies["other"] = []
+
+        self_ids = [
+            r["event"]["self_id"] for r in self.event_records if r["event"].get("self_id")
+        ]
+        self.bot = FakeBot(
+            self_id=str(self_ids[0]) if self_ids else "10000", latency=args.onebot_latency
+        )
+
+    def make_plugin(self):
+        group_repos = {}
+        for record in self.event_records:
+            gid = record["event"].get("group_id")
+            if gid is not None and record.get("repo"):
+                group_repos[str(gid)] = record["repo"]
+        # 录制中的群号已脱敏，按录制的 群号 -> 仓库 关系重建映射（--set 仍可覆盖）
+        mapping = [f"{gid}:{repo}" for gid, repo in group_repos.items()]
+        self.args.set = [
+            "github_repo=" + json.dumps(next(iter(group_repos.values()), "")),
+            "group_repo_map=" + json.dumps(mapping),
+        ] + list(self.args.set)
+        return super().make_plugin()
+
+    def _make_event(self, record: Dict[str, Any]) -> Tuple[str, FakeEvent]:
+        raw = dict(record["event"])
+        if raw.get("post_type") == "message":
+            kind = "reply"
+        else:
+            kind = _EVENT_KINDS.get(raw.get("notice_type"), "other")
+        gid = raw.get("group_id")
+        uid = str(raw.get("user_id"))
+        if kind == "join":
+            self.bot.api.members.setdefault(gid, {})[uid] = f"member{uid}"
+            self.join_at[uid] = time.perf_counter()
+        elif kind == "leave":
+            self.bot.api.members.get(gid, {}).pop(uid, None)
+            self.join_at.pop(uid, None)
+        return kind, FakeEvent(self.bot, raw, record.get("message_str", ""))
+
+    async def _feed(self, plugin):
+        start = time.perf_counter()
+        origin = self.event_records[0]["t"] if self.event_records else 0.0
+        dispatches = []
+        for record in self.event_records:
+            if self.args.speed > 0:
+                due = start + (record["t"] - origin) / self.args.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            kind, event = self._make_event(record)
+            # 与真实适配器一样并发处理事件，不等待上一个事件完成
+            dispatches.append(asyncio.create_task(self._dispatch(plugin, kind, event)))
+        await asyncio.gather(*dispatches)
+
+    async def run(self) -> Dict[str, Dict[str, float]]:
+        self.bot.api.listeners.append(self._on_call)
+        with tempfile.TemporaryDirectory(prefix="github-star-replay-") as tmp:
+            storage = SQLiteStarStorage(os.path.join(tmp, "github_stars.db"))
+            if self.args.db:
+                shutil.copyfile(self.args.db, storage.path)
+            plugin = self.make_plugin()
+            plugin.github_manager = make_manager(self.github, storage=storage)
+            plugin.github_manager.default_repo = plugin.default_repo
+            plugin.github_manager.group_repo_map = plugin.group_repo_map
+            await plugin.github_manager.init_database()
+
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(self._sample_tasks(stop))
+            start = time.perf_counter()
+            await self._feed(plugin)
+            events_done = time.perf_counter()
+
+            while (
+                plugin.pending
+                or plugin.outbound.pending_count()
+                or plugin.verification_pool.in_flight()
+            ):
+                await asyncio.sleep(0.2)
+            drained = time.perf_counter()
+            stop.set()
+            await sampler
+            peak_memory = self._peak_memory_kib()
+            await plugin.__aexit__(None, None, None)
+
+        counts = self.bot.api.call_counts
+        verified = len(self.welcome_latencies)
+        total_calls = sum(counts.values())
+        results: Dict[str, Dict[str, float]] = {
+            "throughput": {
+                "events": self.events,
+                "event_phase_seconds": events_done - start,
+                "drain_seconds": drained - events_done,
+                "events_per_second": self.events / max(events_done - start, 1e-9),
+            },
+            "resources": {
+                "max_tasks_alive": self.max_tasks,
+                "memory_peak_kib": peak_memory,
+            },
+            "onebot": {
+                "total_calls": total_calls,
+                "verified": verified,
+                "calls_per_verification": total_calls / max(verified, 1),
+                **{f"{action}_calls": n for action, n in sorted(counts.items())},
+            },
+            "github": {
+                "requests": self.github.request_count,
+                "unmatched_requests": self.github.unmatched,
+            },
+        }
+        for kind, latencies in self.handle_latencies.items():
+            if latencies:
+                results[f"handle_{kind}"] = _percentiles(latencies)
+        if self.welcome_latencies:
+            results["join_to_welcome"] = _percentiles(self.welcome_latencies)
+        return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    replay = Replay(args)
+    if not replay.event_records:
+        print(f"录制文件中没有事件: {args.recording}")
+        return 1
+    results = asyncio.run(replay.run())
+    report = build_report(results)
+    report["params"] = vars(args)
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "results",
+        f"replay-{time.strftime('%Y%m%d-%H%M%S')}.json",
+    )
+    write_report(report, output)
+
+    for section, metrics in results.items():
+        print(f"\n{section}")
+        for name, value in metrics.items():
+            print(f"  {name}: {value:.4g}")
+    print(f"\n结果已写入: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
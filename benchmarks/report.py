@@ -0,0 +1,74 @@
+"""基准测试结果的读写与回归比较"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Dict, List
+
+# 各指标的方向：True 表示越大越好（吞吐），False 表示越小越好（延迟、请求数）
+HIGHER_IS_BETTER_SUFFIXES = ("_per_second",)
+
+
+def _git_revision(path: str) -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=path,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return "unknown"
+
+
+def build_report(results: Dict[str, Dict[str, float]]) -> Dict:
+    """results: 基准名 -> {指标名: 数值}"""
+    plugin_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return {
+        "schema": 1,
+        "timestamp": int(time.time()),
+        "revision": _git_revision(plugin_dir),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def write_report(report: Dict, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float = 0.2) -> List[str]:
+    """返回超过容差的退化项描述；tolerance 为允许的相对变化比例"""
+    regressions = []
+    for bench, metrics in current.get("results", {}).items():
+        base_metrics = baseline.get("results", {}).get(bench, {})
+        for name, value in metrics.items():
+            base = base_metrics.get(name)
+            if not isinstance(base, (int, float)) or not isinstance(value, (int, float)):
+                continue
+            if base == 0:
+                continue
+            change = (value - base) / abs(base)
+            higher_is_better = name.endswith(HIGHER_IS_BETTER_SUFFIXES)
+            if (higher_is_better and change < -tolerance) or (
+                not higher_is_better and change > tolerance
+            ):
+                regressions.append(
+                    f"{bench}.{name}: {base:.4g} -> {value:.4g} ({change:+.1%})"
+                )
+    return regressions
@@ -0,0 +1,164 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from astrbot.api import logger
+from .page_decoder import loads
+from .storage import COLUMNS, StarStorage
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:  # 未安装 orjson 时使用标准库
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
+def _open(path: str, mode: str):
+    """按扩展名选择格式；.gz 结尾时使用 gzip 压缩"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _is_csv(path: str) -> bool:
+    return path.removesuffix(".gz").endswith(".csv")
+
+
+def _encode_page(rows: List[tuple], as_csv: bool) -> str:
+    if as_csv:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(
+            ["" if value is None else value for value in row] for row in rows
+        )
+        return buffer.getvalue()
+    return "".join(_dumps(dict(zip(COLUMNS, row))) + "\n" for row in rows)
+
+
+async def export_bindings(
+    storage: StarStorage,
+    path: str,
+    repo: Optional[str] = None,
+    bound_only: bool = False,
+    page_size: int = 5000,
+) -> Tuple[int, float]:
+    """按 (repo, github_id) 顺序分页导出全部记录，逐页写入 JSONL 或 CSV
+
+    存储逐页返回数据（SQLite 使用键集分页，不使用 OFFSET），内存占用与表大小无关。
+    返回 (导出行数, 耗时秒数)。
+    """
+    start = time.perf_counter()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    as_csv = _is_csv(path)
+    total = 0
+    with _open(path, "w") as f:
+        if as_csv:
+            f.write(",".join(COLUMNS) + "\n")
+        async for rows in storage.iter_rows(repo, bound_only, page_size):
+            f.write(_encode_page(rows, as_csv))
+            total += len(rows)
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"[GitHub Star Verify] 已导出 {total} 行到 {path}，用时 {elapsed:.2f}s")
+    return total, elapsed
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    return int(float(value))
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    with _open(path, "r") as f:
+        if _is_csv(path):
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                yield {}  # 记为无效行
+
+
+def _row_params(record: Dict[str, Any], now: int) -> Optional[tuple]:
+    github_id = str(record.get("github_id") or "").strip()
+    repo = str(record.get("repo") or "").strip()
+    if not github_id or not repo:
+        return None
+    created_at = _int_or_none(record.get("created_at")) or now
+    return (
+        github_id,
+        repo,
+        str(record["qq_id"]).strip() if record.get("qq_id") not in (None, "") else None,
+        created_at,
+        _int_or_none(record.get("updated_at")) or created_at,
+        _float_or_none(record.get("seen_at")),
+        _float_or_none(record.get("starred_at")),
+    )
+
+
+async def import_bindings(
+    storage: StarStorage, path: str, chunk_size: int = 5000
+) -> Tuple[int, int, int, float]:
+    """流式读取 JSONL 或 CSV，每 chunk_size 行在一个事务中 UPSERT
+
+    已存在的 (github_id, repo) 以导入的绑定与时间为准，created_at 保留较早的值；
+    QQ号在同一仓库已绑定其他GitHub用户的行不导入。
+    返回 (导入行数, 跳过的无效行数, 因绑定冲突拒绝的行数, 耗时秒数)。
+    """
+    start = time.perf_counter()
+    now = int(time.time())
+    imported = skipped = rejected = 0
+
+    async def write(chunk: List[tuple]):
+        nonlocal imported, rejected
+        conflicts = await storage.import_rows(chunk)
+        for github_id, repo, qq_id, *_ in conflicts[:5]:
+            logger.warning(
+                f"[GitHub Star Verify] 导入跳过 {github_id}（{repo}）：QQ号 {qq_id} 已绑定其他GitHub用户"
+            )
+        imported += len(chunk) - len(conflicts)
+        rejected += len(conflicts)
+
+    chunk: List[tuple] = []
+    for record in _read_rows(path):
+        try:
+            params = _row_params(record, now)
+        except (TypeError, ValueError, AttributeError):
+            params = None
+        if params is None:
+            skipped += 1
+            continue
+        chunk.append(params)
+        if len(chunk) >= chunk_size:
+            await write(chunk)
+            chunk = []
+    if chunk:
+        await write(chunk)
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"[GitHub Star Verify] 已从 {path} 导入 {imported} 行（跳过 {skipped} 行，"
+        f"绑定冲突 {rejected} 行），用时 {elapsed:.2f}s"
+    )
+    return imported, skipped, rejected, elapsed
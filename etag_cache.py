@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import aiosqlite
+from astrbot.api import logger
+
+
+class StarredPageCache:
+    """用户 Star 列表页面的条件请求缓存
+
+    以 (令牌, URL) 为键保存 ETag / Last-Modified 与页面摘要（仓库全名列表、是否有下一页），
+    下次请求同一页面时发送条件请求，收到 304 时直接使用摘要。304 响应不消耗 GitHub API 配额。
+    条目数超过 max_entries 时按最近访问时间淘汰。
+    数据库连接在首次使用时打开并一直复用，插件停止时通过 close() 关闭。
+    """
+
+    # 每写入多少条检查一次容量，避免每次写入都执行淘汰查询
+    evict_every = 50
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._conn_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(token: str, url: str) -> str:
+        # 不在磁盘上保存令牌本身
+        return hashlib.sha256(f"{token}\n{url}".encode("utf-8")).hexdigest()
+
+    async def _connection(self) -> aiosqlite.Connection:
+        """返回复用的数据库连接，首次调用时打开并建表"""
+        if self._conn is not None:
+            return self._conn
+        async with self._conn_lock:
+            if self._conn is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = await aiosqlite.connect(self.path, timeout=30.0)
+                try:
+                    await conn.execute("""
+                        CREATE TABLE IF NOT EXISTS starred_pages (
+                            key TEXT PRIMARY KEY,
+                            etag TEXT,
+                            last_modified TEXT,
+                            full_names TEXT NOT NULL,
+                            has_next INTEGER NOT NULL,
+                            accessed_at REAL NOT NULL
+                        )
+                    """)
+                    await conn.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_starred_pages_accessed
+                        ON starred_pages(accessed_at)
+                    """)
+                    await conn.commit()
+                except Exception:
+                    await conn.close()
+                    raise
+                self._conn = conn
+        return self._conn
+
+    async def close(self):
+        """关闭数据库连接，之后再次使用时会重新打开"""
+        async with self._conn_lock:
+            conn, self._conn = self._conn, None
+            if conn is not None:
+                await conn.close()
+
+    async def get(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], List[str], bool]]:
+        """返回 (etag, last_modified, 仓库全名列表, 是否有下一页)，未缓存时返回 None"""
+        try:
+            conn = await self._connection()
+            async with conn.execute(
+                "SELECT etag, last_modified, full_names, has_next FROM starred_pages WHERE key = ?",
+                (key,),
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                return None
+            return row[0], row[1], json.loads(row[2]), bool(row[3])
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 读取ETag缓存失败: {e}")
+            return None
+
+    async def touch(self, key: str):
+        """命中 304 时刷新访问时间"""
+        self.hits += 1
+        try:
+            conn = await self._connection()
+            await conn.execute(
+                "UPDATE starred_pages SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            await conn.commit()
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 更新ETag缓存失败: {e}")
+
+    async def put(
+        self,
+        key: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        full_names: List[str],
+        has_next: bool,
+    ):
+        self.misses += 1
+        if not etag and not last_modified:
+            return
+        try:
+            conn = await self._connection()
+            await conn.execute(
+                """
+                INSERT OR REPLACE INTO starred_pages
+                    (key, etag, last_modified, full_names, has_next, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, etag, last_modified, json.dumps(full_names), int(has_next), time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                # 保留最近访问的 max_entries 条
+                await conn.execute(
+                    """
+                    DELETE FROM starred_pages WHERE key IN (
+                        SELECT key FROM starred_pages
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+            await conn.commit()
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 写入ETag缓存失败: {e}")
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MemoryStarredPageCache(StarredPageCache):
+    """保存在进程内存中的条件请求缓存，用于内存存储后端（不在磁盘上创建 http_cache.db）
+
+    重启后清空；条目数超过 max_entries 时淘汰最久未访问的条目。
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        super().__init__("", max_entries=max_entries)
+        self._pages: "OrderedDict[str, Tuple[Optional[str], Optional[str], List[str], bool]]" = (
+            OrderedDict()
+        )
+
+    async def get(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], List[str], bool]]:
+        page = self._pages.get(key)
+        if page is None:
+            return None
+        etag, last_modified, full_names, has_next = page
+        return etag, last_modified, list(full_names), has_next
+
+    async def touch(self, key: str):
+        self.hits += 1
+        if key in self._pages:
+            self._pages.move_to_end(key)
+
+    async def put(
+        self,
+        key: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        full_names: List[str],
+        has_next: bool,
+    ):
+        self.misses += 1
+        if not etag and not last_modified:
+            return
+        self._pages[key] = (etag, last_modified, list(full_names), has_next)
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
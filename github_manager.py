@@ -1,63 +1,136 @@
-import aiosqlite
 import httpx
 import asyncio
 import time
 import os
-from typing import List, Optional, Dict
+import socket
+import uuid
+from datetime import date, timedelta
+from typing import Awaitable, Callable, List, Optional, Dict
 from astrbot.api import logger
-from astrbot.api.star import StarTools
-
-# 数据库文件路径
-DB_PATH = str(StarTools.get_data_dir("github_star_verify") / "github_stars.db")
-
-
-async def init_database():
-    """初始化数据库表结构"""
-    # 确保数据库目录存在
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-
-    async with aiosqlite.connect(DB_PATH) as conn:
-        # 创建GitHub Star用户表，使用复合主键
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS github_stars (
-                github_id TEXT NOT NULL,
-                repo TEXT NOT NULL,
-                qq_id TEXT,
-                created_at INTEGER NOT NULL,
-                updated_at INTEGER NOT NULL,
-                PRIMARY KEY (github_id, repo)
-            )
-        """)
-
-        # 创建索引（主键字段会自动创建索引，这里只需要为其他字段创建）
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_github_stars_qq_id ON github_stars(qq_id)
-        """)
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_github_stars_repo ON github_stars(repo)
-        """)
-
-        await conn.commit()
-
-    logger.info(f"[GitHub Star Verify] 数据库初始化完成: {DB_PATH}")
+from .metrics import (
+    GITHUB_REQUESTS,
+    GITHUB_REQUEST_SECONDS,
+    GITHUB_RATELIMIT_REMAINING,
+    SYNC_SECONDS,
+    SYNC_PAGES_PER_SECOND,
+    observe_db,
+)
+from .etag_cache import StarredPageCache
+from .page_decoder import find_starred_repo, parse_stargazers, parse_timestamp, starred_full_names
+from .request_scheduler import LANE_BULK, LANE_INTERACTIVE, RequestScheduler
+from .sync_jobs import SyncJob
+from .repo_rules import RULE_ALL, RepoRule, parse_repo_rule
+from .stargazer_snapshot import StargazerSnapshot, snapshot_path, write_snapshot
+from .storage import METRICS, SQLiteStarStorage, StarStorage
+from .tracing import TRACER
+from .trace_recorder import RECORDER
+
+# 本进程的实例标识，作为同步租约持有者的前缀（每次获取租约另加随机令牌）
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
 
 
 class GitHubStarManager:
     """单仓库GitHub Star管理器"""
 
+    # 翻页间隔（秒），避免触发GitHub API限制
+    page_delay = 0.1
+
     def __init__(
         self,
         github_token: str,
         github_repo: str,
         http_client: httpx.AsyncClient,
+        etag_cache: Optional[StarredPageCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        use_snapshot: bool = True,
+        storage: Optional[StarStorage] = None,
     ):
         self.github_token = github_token
         self.github_repo = github_repo
         self.http_client = http_client
+        self.etag_cache = etag_cache
+        self.scheduler = scheduler
+        self.storage = storage or SQLiteStarStorage()
+        # 与数据库同目录的已排序用户名快照，启动后无需预热即可快速确认Star用户
+        self.snapshot = (
+            StargazerSnapshot(snapshot_path(self.storage.snapshot_dir, github_repo))
+            if use_snapshot and self.storage.snapshot_dir
+            else None
+        )
+        self.last_fetch_pages = 0
+        self.last_fetch_count = 0
+        # 上次获取是否正常翻到最后一页（出错或中途停止时为 False）
+        self.last_fetch_complete = False
+        # API检查时获得的Star时间，保存记录时写入 starred_at
+        self._star_times: Dict[str, float] = {}
+
+    async def _get(
+        self, endpoint: str, url: str, lane: str = LANE_INTERACTIVE, **kwargs
+    ) -> httpx.Response:
+        """发送GET请求并记录请求数、耗时与剩余配额；lane 决定调度优先级"""
+        start = time.perf_counter()
+        status = "error"
+        span = TRACER.span(f"github.{endpoint}", repo=self.github_repo, lane=lane)
+        try:
+            with span:
+                if self.scheduler:
+                    async with self.scheduler.slot(lane):
+                        response = await self.http_client.get(url, **kwargs)
+                else:
+                    response = await self.http_client.get(url, **kwargs)
+                status = str(response.status_code)
+                span.set(status=status, page=kwargs.get("params", {}).get("page"))
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if self.scheduler:
+                self.scheduler.update_rate_limit(
+                    remaining, response.headers.get("X-RateLimit-Reset")
+                )
+            if remaining is not None and remaining.isdigit():
+                GITHUB_RATELIMIT_REMAINING.set(int(remaining))
+            if RECORDER.enabled:
+                self._record_response(endpoint, url, kwargs, response, start, remaining)
+            return response
+        finally:
+            GITHUB_REQUESTS.inc(endpoint=endpoint, status=status)
+            GITHUB_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, endpoint=endpoint, status=status
+            )
+
+    def _record_response(self, endpoint, url, kwargs, response, start, remaining):
+        """将请求结果摘要写入流量录制"""
+        try:
+            body = response.json() if response.status_code == 200 else None
+        except ValueError:
+            body = None
+        # URL 形如 /repos/{owner}/{repo}/stargazers、/users/{login}/starred 或 /repos/{owner}/{repo}
+        path = httpx.URL(url).path.strip("/").split("/")
+        subject = "/".join(path[1:] if endpoint == "repo" else path[1:-1])
+        RECORDER.record_github(
+            endpoint,
+            subject,
+            self.github_repo,
+            page=kwargs.get("params", {}).get("page"),
+            status=response.status_code,
+            elapsed=time.perf_counter() - start,
+            body=body,
+            has_next='rel="next"' in response.headers.get("Link", ""),
+            remaining=remaining,
+        )
+
+    async def fetch_stargazers(
+        self,
+        on_page: Optional[Callable[[int, List[str], Dict[str, float]], Awaitable[bool]]] = None,
+    ) -> List[str]:
+        """获取仓库的所有Star用户
 
-    async def fetch_stargazers(self) -> List[str]:
-        """获取仓库的所有Star用户"""
+        提供 on_page 时每获取一页调用 on_page(页码, 本页用户, 用户 -> Star时间戳)，
+        返回 False 则在该页之后停止；on_page 抛出的异常不会被捕获。
+        此时不在内存中累积用户，返回空列表，获取的用户数见 last_fetch_count。
+        """
         stargazers = []
+        self.last_fetch_count = 0
+        self.last_fetch_pages = 0
+        self.last_fetch_complete = False
         page = 1
         per_page = 100
         max_retries = 3
@@ -65,7 +138,7 @@ class GitHubStarManager:
 
         headers = {
             "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json",
+            "Accept": "application/vnd.github.star+json",  # 包含Star时间，用于按日统计
             "User-Agent": "AstrBot-GitHub-Verification",
         }
 
@@ -77,18 +150,21 @@ class GitHubStarManager:
 
             for attempt in range(1, max_retries + 1):
                 try:
-                    response = await self.http_client.get(
-                        url, headers=headers, params=params
+                    # 同步翻页走批量通道，让位于等待中成员的验证请求
+                    response = await self._get(
+                        "stargazers", url, lane=LANE_BULK, headers=headers, params=params
                     )
 
                     if response.status_code == 200:
                         try:
-                            data = response.json()
+                            # 只提取 login 与 starred_at，不构造完整的用户对象
+                            data, times = parse_stargazers(response.content)
                         except Exception as e:
+                            # 无法确定后面是否还有数据，本次获取不作为完整结果
                             logger.error(
-                                f"[GitHub Star Verify] 解析JSON失败（页 {page}）: {e}"
+                                f"[GitHub Star Verify] 解析JSON失败（页 {page}），停止获取: {e}"
                             )
-                            data = None
+                            return stargazers
 
                         if not data:  # 没有更多数据
                             if page == 1:
@@ -96,19 +172,11 @@ class GitHubStarManager:
                                     f"[GitHub Star Verify] 仓库 {self.github_repo} 暂时没有Star用户"
                                 )
                             logger.info(
-                                f"[GitHub Star Verify] 已获取完所有页面，共 {len(stargazers)} 个Star用户"
+                                f"[GitHub Star Verify] 已获取完所有页面，共 {self.last_fetch_count} 个Star用户"
                             )
+                            self.last_fetch_complete = True
                             return stargazers
 
-                        for user in data:
-                            if user and user.get("login"):
-                                stargazers.append(user.get("login"))
-
-                        logger.info(
-                            f"[GitHub Star Verify] 获取第 {page} 页，{len(data)} 个用户，累计: {len(stargazers)}"
-                        )
-                        page += 1
-                        await asyncio.sleep(0.1)
                         break  # 当前页成功，跳出重试循环
 
                     elif response.status_code == 401:
@@ -125,7 +193,7 @@ class GitHubStarManager:
                         # 检查是否是API限制还是权限问题
                         if remaining == "0" or "rate limit" in response.text.lower():
                             logger.warning(
-                                f"[GitHub Star Verify] API限制，已收集到 {len(stargazers)} 个Star用户"
+                                f"[GitHub Star Verify] API限制，已收集到 {self.last_fetch_count} 个Star用户"
                             )
                         else:
                             logger.error(
@@ -140,9 +208,9 @@ class GitHubStarManager:
                         return stargazers
 
                     elif response.status_code == 422:
-                        # 页码超出范围，正常结束
-                        logger.info(
-                            f"[GitHub Star Verify] 获取完成，共 {len(stargazers)} 个Star用户"
+                        # 页码超出 GitHub 的分页上限，之后的用户无法获取
+                        logger.warning(
+                            f"[GitHub Star Verify] 第 {page} 页超出分页上限，已获取 {self.last_fetch_count} 个Star用户，列表不完整"
                         )
                         return stargazers
 
@@ -179,6 +247,23 @@ class GitHubStarManager:
                 logger.error("[GitHub Star Verify] 重试失败，停止获取")
                 return stargazers
 
+            # 在请求的异常处理之外调用 on_page，回调中的异常（如写入数据库失败）直接抛给调用方
+            self.last_fetch_count += len(data)
+            if on_page is None:
+                stargazers.extend(data)
+            logger.info(
+                f"[GitHub Star Verify] 获取第 {page} 页，{len(data)} 个用户，累计: {self.last_fetch_count}"
+            )
+            self.last_fetch_pages = page
+            starred_at = {login: ts for login, ts in zip(data, times) if ts is not None}
+            if on_page and not await on_page(page, data, starred_at):
+                logger.info(
+                    f"[GitHub Star Verify] 获取在第 {page} 页后停止，共 {self.last_fetch_count} 个Star用户"
+                )
+                return stargazers
+            page += 1
+            await asyncio.sleep(self.page_delay)
+
     async def check_user_starred_directly(self, github_username: str) -> bool:
         """直接通过GitHub API检查用户是否Star了仓库"""
         headers = {
@@ -202,38 +287,77 @@ class GitHubStarManager:
             # 通过 Link 响应头判断是否还有下一页，直到没有下一页为止
             while True:
                 params["page"] = page
-                response = await self.http_client.get(
-                    url, headers=headers, params=params
+                cache_key = cached = None
+                request_headers = headers
+                if self.etag_cache and self.etag_cache.enabled:
+                    # 带上缓存的 ETag / Last-Modified 发送条件请求
+                    cache_key = StarredPageCache.make_key(
+                        self.github_token, f"{url}?per_page=100&page={page}"
+                    )
+                    cached = await self.etag_cache.get(cache_key)
+                    if cached:
+                        request_headers = dict(headers)
+                        if cached[0]:
+                            request_headers["If-None-Match"] = cached[0]
+                        if cached[1]:
+                            request_headers["If-Modified-Since"] = cached[1]
+                response = await self._get(
+                    "starred", url, headers=request_headers, params=params
                 )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    if not data:  # 没有更多数据
+                if response.status_code == 304 and cached:
+                    # 页面未变化，使用缓存的摘要（不消耗API配额）
+                    await self.etag_cache.touch(cache_key)
+                    full_names, has_next = cached[2], cached[3]
+                    if not full_names:
                         break
+                    checked_count += len(full_names)
+                    if self.github_repo in full_names:
+                        logger.info(
+                            f"[GitHub Star Verify] 用户 {github_username} 已Star仓库 {self.github_repo} (ETag缓存)"
+                        )
+                        user_starred = True
+                        break
+                    if has_next:
+                        page += 1
+                        await asyncio.sleep(self.page_delay)
+                        continue
+                    break
 
-                    # 检查当前页是否包含目标仓库
-                    for starred_repo_data in data:
-                        starred_repo = starred_repo_data.get("repo", {})
-                        repo_full_name = starred_repo.get("full_name", "")
-                        checked_count += 1
+                if response.status_code == 200:
+                    link_header = response.headers.get("Link", "")
+                    if cache_key:
+                        await self.etag_cache.put(
+                            cache_key,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                            starred_full_names(response.content),
+                            'rel="next"' in link_header,
+                        )
 
-                        if repo_full_name == self.github_repo:
-                            # 获取Star时间戳
-                            star_time = starred_repo_data.get("starred_at", "未知时间")
-                            logger.info(
-                                f"[GitHub Star Verify] 用户 {github_username} 已Star仓库 {self.github_repo} (时间: {star_time})"
-                            )
-                            user_starred = True
-                            break  # 找到仓库后立即跳出当前页的循环
+                    # 检查当前页是否包含目标仓库（未包含时不解析完整JSON）
+                    count, user_starred, star_time = find_starred_repo(
+                        response.content, self.github_repo
+                    )
+                    if not count:  # 没有更多数据
+                        break
+                    checked_count += count
 
                     if user_starred:
+                        logger.info(
+                            f"[GitHub Star Verify] 用户 {github_username} 已Star仓库 {self.github_repo} (时间: {star_time or '未知时间'})"
+                        )
+                        starred_at = parse_timestamp(star_time)
+                        if starred_at is not None:
+                            if len(self._star_times) >= 1000:
+                                self._star_times.clear()
+                            self._star_times[github_username] = starred_at
                         break  # 找到仓库后跳出分页循环
 
                     # 若 Link 头存在 next 则继续翻页，否则结束
-                    link_header = response.headers.get("Link", "")
                     if 'rel="next"' in link_header:
                         page += 1
-                        await asyncio.sleep(0.1)  # 避免API限制
+                        await asyncio.sleep(self.page_delay)  # 避免API限制
                         continue
                     else:
                         break
@@ -270,220 +394,337 @@ class GitHubStarManager:
             logger.error(f"[GitHub Star Verify] 检查Star状态异常: {e}")
             return False
 
+    @observe_db
     async def record_stargazer(self, github_username: str) -> bool:
         """将找到的Star用户保存到数据库"""
         try:
-            current_time = int(time.time())
-            async with aiosqlite.connect(DB_PATH) as conn:
-                # 使用 UPSERT：若(github_id, repo)已存在，仅更新updated_at，保留既有的qq_id与created_at
-                await conn.execute(
-                    """
-                    INSERT INTO github_stars (github_id, repo, created_at, updated_at)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(github_id, repo) DO UPDATE SET
-                        updated_at = excluded.updated_at
-                    """,
-                    (github_username, self.github_repo, current_time, current_time),
-                )
-                await conn.commit()
-                logger.info(f"[GitHub Star Verify] 已将用户 {github_username} 保存到数据库")
-                return True
+            await self.storage.record_stargazer(
+                self.github_repo, github_username, self._star_times.pop(github_username, None)
+            )
+            logger.info(f"[GitHub Star Verify] 已将用户 {github_username} 保存到数据库")
+            return True
         except Exception as e:
             logger.warning(f"[GitHub Star Verify] 保存用户到数据库失败: {e}")
             return False
 
-    async def sync_stargazers(self, stargazers: List[str]):
-        """同步Star用户到数据库"""
-        current_time = int(time.time())
+    @observe_db
+    async def remove_stargazer(self, github_username: str) -> Optional[str]:
+        """取消Star时删除未绑定的记录；已绑定的记录保留，返回其绑定的QQ号"""
+        if self.snapshot:
+            self.snapshot.discard(github_username)
+        try:
+            removed, qq_id = await self.storage.remove_unbound_stargazer(
+                self.github_repo, github_username
+            )
+            if removed:
+                logger.info(f"[GitHub Star Verify] 用户 {github_username} 已取消Star，已从数据库移除")
+            return qq_id
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 移除Star用户失败: {e}")
+            return None
 
+    @observe_db
+    async def sync_stargazers(
+        self,
+        stargazers: List[str],
+        seen_at: Optional[float] = None,
+        starred_at: Optional[Dict[str, float]] = None,
+    ) -> int:
+        """同步Star用户到数据库，返回新增的用户数
+
+        可以分批调用：已存在的用户只刷新 seen_at 与 starred_at（用户 -> Star时间戳），
+        每批在单个事务中写入。写入失败时记录日志并抛出异常，未写入的用户不能视为已确认。
+        """
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                # 获取数据库中现有的GitHub用户（针对当前仓库）
-                async with conn.execute(
-                    "SELECT github_id FROM github_stars WHERE repo = ?",
-                    (self.github_repo,),
-                ) as cursor:
-                    rows = await cursor.fetchall()
-                    existing_users = {row[0] for row in rows}
-
-                # 添加新的Star用户
-                new_users = set(stargazers) - existing_users
-                for github_id in new_users:
-                    await conn.execute(
-                        """
-                        INSERT OR IGNORE INTO github_stars (github_id, repo, created_at, updated_at)
-                        VALUES (?, ?, ?, ?)
-                    """,
-                        (github_id, self.github_repo, current_time, current_time),
-                    )
+            added = await self.storage.upsert_stargazers(
+                self.github_repo, stargazers, seen_at or time.time(), starred_at
+            )
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 同步数据失败: {e}")
+            raise
+        logger.info(
+            f"[GitHub Star Verify] 同步完成: 新增 {added} 个Star用户到仓库 {self.github_repo}"
+        )
+        return added
+
+    async def write_snapshot(self, seen_since: float) -> int:
+        """将 seen_since 之后确认的Star用户写入快照，返回条目数"""
+        if not self.snapshot:
+            return 0
+        logins = await self.storage.starred_since(self.github_repo, seen_since)
+        # 先释放映射，部分平台不允许替换已映射的文件
+        self.snapshot.close()
+        count = await asyncio.to_thread(write_snapshot, self.snapshot.path, logins)
+        self.snapshot.invalidate()
+        logger.info(
+            f"[GitHub Star Verify] 已写入仓库 {self.github_repo} 的Star用户快照，共 {count} 个用户"
+        )
+        return count
+
+    @observe_db
+    async def get_stale_bindings(self, seen_before: float) -> List[tuple]:
+        """已绑定、但在 seen_before 之后的同步中未出现的用户，返回 (GitHub用户名, QQ号) 列表"""
+        try:
+            return await self.storage.stale_bindings(self.github_repo, seen_before)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 查询已取消Star的绑定失败: {e}")
+            return []
+
+    async def remove_stale_bindings(self, seen_before: float) -> int:
+        """删除已取消Star的绑定记录（连同Star记录），返回删除数"""
+        try:
+            return await self.storage.remove_stale_bindings(self.github_repo, seen_before)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 删除已取消Star的绑定失败: {e}")
+            return 0
 
-                await conn.commit()
+    @observe_db
+    async def remove_unstarred(self, seen_before: float) -> int:
+        """完整同步后删除未出现在列表中的未绑定用户（已取消Star），计入取消Star统计，返回删除数"""
+        try:
+            removed = await self.storage.remove_unstarred(self.github_repo, seen_before)
+            if removed:
                 logger.info(
-                    f"[GitHub Star Verify] 同步完成: 新增 {len(new_users)} 个Star用户到仓库 {self.github_repo}"
+                    f"[GitHub Star Verify] 仓库 {self.github_repo} 有 {removed} 个未绑定用户已取消Star，已从数据库移除"
                 )
+            return removed
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 删除已取消Star的用户失败: {e}")
+            return 0
 
+    async def fetch_stargazers_count(self) -> Optional[int]:
+        """读取仓库信息中的Star总数，用于估算同步进度"""
+        headers = {
+            "Authorization": f"token {self.github_token}",
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "AstrBot-GitHub-Verification",
+        }
+        try:
+            response = await self._get(
+                "repo",
+                f"https://api.github.com/repos/{self.github_repo}",
+                lane=LANE_BULK,
+                headers=headers,
+            )
+            if response.status_code == 200:
+                return response.json().get("stargazers_count")
         except Exception as e:
-            logger.error(f"[GitHub Star Verify] 同步数据失败: {e}")
+            logger.debug(f"[GitHub Star Verify] 获取仓库 {self.github_repo} 的Star总数失败: {e}")
+        return None
 
+    @observe_db
     async def is_stargazer_for_repo(self, github_id: str, repo: str) -> bool:
         """检查用户是否为指定仓库的Star用户"""
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                async with conn.execute(
-                    "SELECT 1 FROM github_stars WHERE github_id = ? AND repo = ?",
-                    (github_id, repo),
-                ) as cursor:
-                    result = await cursor.fetchone()
-                    return result is not None
+            return await self.storage.is_stargazer(repo, github_id)
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 检查Star状态失败: {e}")
             return False
 
+    @observe_db
     async def is_github_id_bound_to_repo(
         self, github_id: str, repo: str
     ) -> Optional[str]:
         """检查GitHub ID是否已被绑定到指定仓库，返回绑定的QQ号"""
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                async with conn.execute(
-                    "SELECT qq_id FROM github_stars WHERE github_id = ? AND repo = ? AND qq_id IS NOT NULL",
-                    (github_id, repo),
-                ) as cursor:
-                    result = await cursor.fetchone()
-                    return result[0] if result else None
+            bindings = await self.storage.get_bindings("github_id", github_id, (repo,))
+            return bindings.get(repo)
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 检查绑定状态失败: {e}")
             return None
 
+    @observe_db
     async def is_qq_bound_to_repo(self, qq_id: str, repo: str) -> Optional[str]:
         """检查QQ号是否已绑定到指定仓库的GitHub ID，返回绑定的GitHub ID"""
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                async with conn.execute(
-                    "SELECT github_id FROM github_stars WHERE qq_id = ? AND repo = ?",
-                    (qq_id, repo),
-                ) as cursor:
-                    result = await cursor.fetchone()
-                    return result[0] if result else None
+            bindings = await self.storage.get_bindings("qq_id", qq_id, (repo,))
+            return bindings.get(repo)
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 检查QQ绑定状态失败: {e}")
             return None
 
+    @observe_db
+    async def find_cross_repo_binding(self, qq_id: str, repo: str) -> Optional[str]:
+        """查找QQ号在其他仓库绑定的、且为指定仓库未绑定Star用户的GitHub ID"""
+        try:
+            return await self.storage.cross_repo_binding(qq_id, repo)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 查询跨仓库绑定失败: {e}")
+            return None
+
+    @observe_db
     async def bind_github_qq_to_repo(
         self, github_id: str, qq_id: str, repo: str
     ) -> bool:
         """绑定GitHub ID和QQ号到指定仓库"""
-        current_time = int(time.time())
-
         try:
             # 先检查QQ号是否已经绑定了其他GitHub ID（在同一个仓库）
             existing_github = await self.is_qq_bound_to_repo(qq_id, repo)
-            if existing_github and existing_github != github_id:
+            if existing_github and existing_github.lower() != github_id.lower():
                 logger.warning(
                     f"[GitHub Star Verify] QQ号 {qq_id} 已绑定GitHub用户 {existing_github} 在仓库 {repo}"
                 )
                 return False
 
-            async with aiosqlite.connect(DB_PATH) as conn:
-                # 更新绑定关系
-                cursor = await conn.execute(
-                    """
-                    UPDATE github_stars
-                    SET qq_id = ?, updated_at = ?
-                    WHERE github_id = ? AND repo = ?
-                """,
-                    (qq_id, current_time, github_id, repo),
+            # 更新绑定关系
+            success = await self.storage.bind(repo, github_id, qq_id)
+            if success:
+                logger.info(
+                    f"[GitHub Star Verify] 成功绑定: GitHub用户 {github_id} <-> QQ号 {qq_id} 在仓库 {repo}"
                 )
-
-                await conn.commit()
-                success = cursor.rowcount > 0
-
-                if success:
-                    logger.info(
-                        f"[GitHub Star Verify] 成功绑定: GitHub用户 {github_id} <-> QQ号 {qq_id} 在仓库 {repo}"
-                    )
-                else:
-                    logger.warning(
-                        f"[GitHub Star Verify] 绑定失败: GitHub用户 {github_id} 不存在于仓库 {repo}"
-                    )
-
-                return success
+            else:
+                logger.warning(
+                    f"[GitHub Star Verify] 绑定失败: GitHub用户 {github_id} 不存在于仓库 {repo}"
+                )
+            return success
 
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 绑定失败: {e}")
             return False
 
+    @observe_db
     async def unbind_qq_from_repo(self, qq_id: str, repo: str) -> bool:
         """从指定仓库解绑QQ号"""
-        current_time = int(time.time())
-
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                cursor = await conn.execute(
-                    """
-                    UPDATE github_stars
-                    SET qq_id = NULL, updated_at = ?
-                    WHERE qq_id = ? AND repo = ?
-                """,
-                    (current_time, qq_id, repo),
-                )
-
-                await conn.commit()
-                success = cursor.rowcount > 0
-
-                if success:
-                    logger.info(f"[GitHub Star Verify] 成功解绑QQ号: {qq_id} 从仓库 {repo}")
-
-                return success
-
+            success = await self.storage.unbind(qq_id, (repo,)) > 0
+            if success:
+                logger.info(f"[GitHub Star Verify] 成功解绑QQ号: {qq_id} 从仓库 {repo}")
+            return success
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 解绑失败: {e}")
             return False
 
+    @observe_db
     async def get_stars_count_for_repo(self, repo: str) -> int:
         """获取指定仓库的Star用户总数"""
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                async with conn.execute(
-                    "SELECT COUNT(*) FROM github_stars WHERE repo = ?", (repo,)
-                ) as cursor:
-                    result = await cursor.fetchone()
-                    return result[0] if result else 0
+            return await self.storage.count_stars(repo)
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 获取Star用户数量失败: {e}")
             return 0
 
+    @observe_db
     async def get_bound_count_for_repo(self, repo: str) -> int:
         """获取指定仓库已绑定QQ号的用户数量"""
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                async with conn.execute(
-                    "SELECT COUNT(*) FROM github_stars WHERE qq_id IS NOT NULL AND repo = ?",
-                    (repo,),
-                ) as cursor:
-                    result = await cursor.fetchone()
-                    return result[0] if result else 0
+            return await self.storage.count_bound(repo)
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 获取绑定用户数量失败: {e}")
             return 0
 
     def __str__(self):
-        return f"GitHubStarManager(repo={self.github_repo}, db={DB_PATH})"
+        return f"GitHubStarManager(repo={self.github_repo}, storage={self.storage})"
+
+
+class SyncLease:
+    """存储中的同步租约
+
+    持有者在同步期间按 ttl/3 的间隔续约；进程异常退出后租约在 ttl 秒后过期，
+    其他实例即可接管。每个租约对象使用独立的持有者令牌，同一进程内对同一仓库的
+    两次同步也互相排斥。续约发现租约已被接管时置 lost 并调用 on_lost。
+    """
+
+    def __init__(
+        self, storage: StarStorage, repo: str, holder: Optional[str] = None, ttl: float = 120.0
+    ):
+        self.storage = storage
+        self.repo = repo
+        self.holder = holder or f"{INSTANCE_ID}:{uuid.uuid4().hex[:8]}"
+        self.ttl = ttl
+        self.lost = False
+        self._on_lost: Optional[Callable[[], None]] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def acquire(self) -> bool:
+        """租约空闲、已过期或本就由自己持有时获取成功"""
+        return await self.storage.acquire_lease(self.repo, self.holder, self.ttl)
+
+    async def current_holder(self) -> Optional[str]:
+        """返回当前未过期租约的持有者"""
+        return await self.storage.lease_holder(self.repo)
+
+    async def renew(self) -> bool:
+        return await self.storage.renew_lease(self.repo, self.holder, self.ttl)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                if not await self.renew():
+                    logger.warning(
+                        f"[GitHub Star Verify] 仓库 {self.repo} 的同步租约已被其他实例接管，停止本次同步"
+                    )
+                    self.lost = True
+                    if self._on_lost:
+                        self._on_lost()
+                    return
+            except Exception as e:
+                logger.warning(f"[GitHub Star Verify] 续约同步租约失败: {e}")
+
+    def start_heartbeat(self, on_lost: Optional[Callable[[], None]] = None):
+        self._on_lost = on_lost
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def release(self):
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+        if self.lost:
+            return
+        try:
+            await self.storage.release_lease(self.repo, self.holder)
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 释放同步租约失败: {e}")
+
+    async def wait_released(self, poll_interval: float = 2.0) -> bool:
+        """等待其他实例完成同步；租约被正常释放返回 True，超时过期返回 False"""
+        deadline = time.monotonic() + self.ttl * 10
+        while time.monotonic() < deadline:
+            expires_at = await self.storage.lease_expires_at(self.repo)
+            if expires_at is None:
+                return True
+            if expires_at < time.time():
+                return False
+            await asyncio.sleep(poll_interval)
+        return False
 
 
 class MultiRepoGitHubStarManager:
     """多仓库GitHub Star管理器"""
 
-    def __init__(self, github_token: str, default_repo: str, group_repo_map: Dict[str, str]):
+    def __init__(
+        self,
+        github_token: str,
+        default_repo: str,
+        group_repo_map: Dict[str, str],
+        http_client: Optional[httpx.AsyncClient] = None,
+        sync_lease_ttl: float = 120.0,
+        etag_cache: Optional[StarredPageCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        sync_batch_size: int = 1000,
+        use_snapshot: bool = True,
+        storage: Optional[StarStorage] = None,
+    ):
         self.github_token = github_token
+        self.sync_lease_ttl = sync_lease_ttl
+        # 同步时每累计多少个用户写入一次数据库
+        self.sync_batch_size = max(sync_batch_size, 1)
+        self.use_snapshot = use_snapshot
+        # 所有仓库共用的存储后端，默认使用插件数据目录下的 SQLite 数据库
+        self.storage = storage or SQLiteStarStorage()
+        self.etag_cache = etag_cache
+        # 所有仓库共用一个调度器，同步翻页让位于交互验证请求
+        self.scheduler = scheduler or RequestScheduler()
         self.default_repo = default_repo
         self.group_repo_map = group_repo_map or {}
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # 所有仓库共用同一个客户端以复用连接池
+        self.http_client = http_client or httpx.AsyncClient(timeout=30.0)
         self._managers_cache: Dict[str, GitHubStarManager] = {}
 
     async def init_database(self):
-        """初始化数据库 - 桥接方法"""
-        await init_database()
+        """初始化存储"""
+        await self.storage.init()
 
     def get_manager_for_repo(self, repo: str) -> GitHubStarManager:
         """获取指定仓库的管理器实例"""
@@ -492,6 +733,10 @@ class MultiRepoGitHubStarManager:
                 github_token=self.github_token,
                 github_repo=repo,
                 http_client=self.http_client,
+                etag_cache=self.etag_cache,
+                scheduler=self.scheduler,
+                use_snapshot=self.use_snapshot,
+                storage=self.storage,
             )
         return self._managers_cache[repo]
 
@@ -505,75 +750,229 @@ class MultiRepoGitHubStarManager:
         else:
             return None
 
-    async def sync_stargazers_for_repo(self, repo: str) -> bool:
-        """同步指定仓库的Star用户"""
-        try:
-            manager = self.get_manager_for_repo(repo)
-            stargazers = await manager.fetch_stargazers()
+    async def sync_stargazers_for_repo(self, repo: str, job: Optional[SyncJob] = None) -> bool:
+        """同步指定仓库的Star用户，进度写入 job
 
-            if stargazers:
-                logger.info(
-                    f"[GitHub Star Verify] 成功获取 {len(stargazers)} 个Star用户，开始同步到数据库..."
-                )
-                await manager.sync_stargazers(stargazers)
-                return True
-            else:
+        共享数据库的多个实例中只有持有同步租约的实例访问GitHub，其他实例等待其完成后直接读取结果。
+        """
+        lease = SyncLease(self.storage, repo, ttl=self.sync_lease_ttl)
+        try:
+            if not await lease.acquire():
+                holder = await lease.current_holder()
                 logger.info(
-                    f"[GitHub Star Verify] 仓库 {repo} 当前没有Star用户，数据库已初始化"
+                    f"[GitHub Star Verify] 实例 {holder} 正在同步仓库 {repo}，等待其完成后使用同步结果"
                 )
-                return True
+                if await lease.wait_released():
+                    return True
+                logger.warning(f"[GitHub Star Verify] 仓库 {repo} 的同步租约已过期，由本实例重新同步")
+                if not await lease.acquire():
+                    return False
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 获取仓库 {repo} 的同步租约失败: {e}")
+            return False
+
+        job = job or SyncJob(repo)
+        # 租约被接管后不再写入：当前页结束后停止翻页，未写入的批次直接丢弃
+        lease.start_heartbeat(on_lost=lambda: setattr(job, "cancel_requested", True))
+        try:
+            manager = self.get_manager_for_repo(repo)
+            start = time.perf_counter()
+            with TRACER.root_span("sync", repo=repo):
+                job.start(await manager.fetch_stargazers_count())
+                job.synced_at = time.time()
+                batch: List[str] = []
+                batch_starred_at: Dict[str, float] = {}
+
+                async def flush_batch():
+                    if lease.lost:
+                        raise RuntimeError("同步租约已丢失")
+                    if batch:
+                        await manager.sync_stargazers(batch, job.synced_at, batch_starred_at)
+                        job.rows_written += len(batch)
+                        batch.clear()
+                        batch_starred_at.clear()
+
+                async def on_page(page: int, logins: List[str], starred_at: Dict[str, float]) -> bool:
+                    # 每累计 sync_batch_size 行写入一次，取消时已获取的页面不会丢失
+                    if lease.lost:
+                        return False
+                    job.page_done(len(logins))
+                    batch.extend(logins)
+                    batch_starred_at.update(starred_at)
+                    if len(batch) >= self.sync_batch_size:
+                        await flush_batch()
+                    return not job.cancel_requested
+
+                with TRACER.span("github.fetch_stargazers") as span:
+                    # 逐页写入数据库，不在内存中保留完整列表；快照由数据库中的记录生成
+                    await manager.fetch_stargazers(on_page)
+                    span.set(pages=manager.last_fetch_pages, users=manager.last_fetch_count)
+                await flush_batch()
+                job.complete = manager.last_fetch_complete and not job.cancel_requested
+                # 完整同步之后会删除未出现的用户并复核绑定，只有与仓库Star总数核对一致时才算完整
+                if job.complete and job.total is None:
+                    logger.warning(
+                        f"[GitHub Star Verify] 无法获取仓库 {repo} 的Star总数，本次同步不作为完整结果"
+                    )
+                    job.complete = False
+                elif job.complete and job.rows_written < job.total * 0.99:
+                    # GitHub 对 stargazers 列表的可翻页数有上限，超大仓库无法获取完整列表
+                    logger.warning(
+                        f"[GitHub Star Verify] 仓库 {repo} 写入了 {job.rows_written} 个Star用户，"
+                        f"少于Star总数 {job.total}，本次同步不作为完整结果"
+                    )
+                    job.complete = False
+                if job.complete and job.reconcile:
+                    # job.complete 表示翻到了最后一页、所有批次都已写入且与Star总数一致；
+                    # 已绑定的用户由复核（audit_action）处理，这里只删除未绑定的
+                    await manager.remove_unstarred(job.synced_at)
+                if job.complete:
+                    try:
+                        await manager.write_snapshot(job.synced_at)
+                    except Exception as e:
+                        logger.warning(f"[GitHub Star Verify] 写入仓库 {repo} 的Star用户快照失败: {e}")
+                fetch_elapsed = time.perf_counter() - start
+                if fetch_elapsed > 0:
+                    SYNC_PAGES_PER_SECOND.set(
+                        manager.last_fetch_pages / fetch_elapsed, repo=repo
+                    )
+
+                if job.cancel_requested:
+                    logger.info(
+                        f"[GitHub Star Verify] 仓库 {repo} 的同步已取消，已写入 {job.rows_written} 个Star用户"
+                    )
+                elif manager.last_fetch_count:
+                    logger.info(
+                        f"[GitHub Star Verify] 仓库 {repo} 同步完成，共 {manager.last_fetch_count} 个Star用户"
+                    )
+                else:
+                    logger.info(
+                        f"[GitHub Star Verify] 仓库 {repo} 当前没有Star用户，数据库已初始化"
+                    )
+            SYNC_SECONDS.observe(time.perf_counter() - start, repo=repo)
+            return True
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 同步仓库 {repo} 的Star用户失败: {e}")
             return False
+        finally:
+            await lease.release()
+
+    def configured_repos(self) -> List[str]:
+        """默认仓库与群组映射（含规则）中的所有仓库（去重）"""
+        repos: List[str] = []
+        for value in [self.default_repo, *self.group_repo_map.values()]:
+            for repo in parse_repo_rule(value).repos:
+                if repo not in repos:
+                    repos.append(repo)
+        return repos
+
+    async def warm_up(self) -> int:
+        """解析规则、映射各仓库的快照并预读记录数，返回快照中的用户总数"""
+        snapshot_users = 0
+        for repo in self.configured_repos():
+            manager = self.get_manager_for_repo(repo)
+            if manager.snapshot:
+                snapshot_users += manager.snapshot.load()
+            await manager.get_stars_count_for_repo(repo)
+        return snapshot_users
 
     async def sync_all_repos(self) -> Dict[str, bool]:
         """同步所有配置的仓库"""
         results = {}
-
-        # 同步默认仓库（如果配置了）
-        if self.default_repo:
-            results[self.default_repo] = await self.sync_stargazers_for_repo(self.default_repo)
-
-        # 同步所有群组配置的仓库
-        unique_repos = set(self.group_repo_map.values())
-        for repo in unique_repos:
-            if repo and repo != self.default_repo:  # 避免重复同步
-                results[repo] = await self.sync_stargazers_for_repo(repo)
-
+        for repo in self.configured_repos():
+            results[repo] = await self.sync_stargazers_for_repo(repo)
         return results
 
     async def check_user_starred_directly(self, github_username: str, repo: str) -> bool:
-        """直接通过GitHub API检查用户是否Star了指定仓库"""
+        """直接通过GitHub API检查用户是否Star了指定仓库（或满足规则）"""
+        rule = parse_repo_rule(repo)
+        if rule.is_compound:
+            return await self._check_rule_directly(github_username, rule)
         manager = self.get_manager_for_repo(repo)
         return await manager.check_user_starred_directly(github_username)
 
     async def record_stargazer(self, github_username: str, repo: str) -> bool:
         """记录Star用户到数据库"""
+        if parse_repo_rule(repo).is_compound:
+            # 规则检查时已逐个记录确认Star的仓库
+            return True
         manager = self.get_manager_for_repo(repo)
         return await manager.record_stargazer(github_username)
 
+    async def get_stale_bindings(self, repo: str, seen_before: float) -> List[tuple]:
+        """获取指定仓库中已取消Star的绑定"""
+        return await self.get_manager_for_repo(repo).get_stale_bindings(seen_before)
+
+    async def remove_stale_bindings(self, repo: str, seen_before: float) -> int:
+        """删除指定仓库中已取消Star的绑定"""
+        return await self.get_manager_for_repo(repo).remove_stale_bindings(seen_before)
+
+    async def remove_stargazer(self, github_username: str, repo: str) -> Optional[str]:
+        """从指定仓库移除取消Star的用户"""
+        manager = self.get_manager_for_repo(repo)
+        return await manager.remove_stargazer(github_username)
+
     async def is_stargazer(self, github_id: str, repo: str) -> bool:
-        """检查用户是否为指定仓库的Star用户"""
+        """检查用户是否为指定仓库的Star用户（或满足规则）"""
+        rule = parse_repo_rule(repo)
+        if rule.is_compound:
+            if rule.satisfied(r for r in rule.repos if self._snapshot_contains(github_id, r)):
+                return True
+            return rule.satisfied(await self._starred_repos_in_db(github_id, rule))
+        if self._snapshot_contains(github_id, repo):
+            return True
         manager = self.get_manager_for_repo(repo)
         return await manager.is_stargazer_for_repo(github_id, repo)
 
+    def _snapshot_contains(self, github_id: str, repo: str) -> bool:
+        """快照命中即为Star用户；未命中（或无快照）时需要查询数据库"""
+        snapshot = self.get_manager_for_repo(repo).snapshot
+        return bool(snapshot and snapshot.contains(github_id))
+
     async def is_github_id_bound_to_repo(self, github_id: str, repo: str) -> Optional[str]:
-        """检查GitHub ID是否已被绑定到指定仓库，返回绑定的QQ号"""
+        """检查GitHub ID是否已被绑定到指定仓库（规则中的任一仓库），返回绑定的QQ号"""
+        rule = parse_repo_rule(repo)
+        if rule.is_compound:
+            bindings = await self._rule_bindings("github_id", github_id, rule)
+            return next(iter(bindings.values()), None)
         manager = self.get_manager_for_repo(repo)
         return await manager.is_github_id_bound_to_repo(github_id, repo)
 
     async def is_qq_bound_to_repo(self, qq_id: str, repo: str) -> Optional[str]:
-        """检查QQ号是否已绑定到指定仓库的GitHub ID，返回绑定的GitHub ID"""
+        """检查QQ号是否已绑定到指定仓库的GitHub ID，返回绑定的GitHub ID
+
+        规则按已绑定的仓库判断是否满足，满足时返回规则中第一个已绑定仓库的GitHub ID。
+        """
+        rule = parse_repo_rule(repo)
+        if rule.is_compound:
+            bindings = await self._rule_bindings("qq_id", qq_id, rule)
+            if not rule.satisfied(bindings):
+                return None
+            return next(bindings[r] for r in rule.repos if r in bindings)
         manager = self.get_manager_for_repo(repo)
         return await manager.is_qq_bound_to_repo(qq_id, repo)
 
+    async def find_cross_repo_binding(self, qq_id: str, repo: str) -> Optional[str]:
+        """查找QQ号在其他仓库绑定的、且为指定仓库未绑定Star用户的GitHub ID"""
+        rule = parse_repo_rule(repo)
+        if rule.is_compound:
+            return await self._find_cross_rule_binding(qq_id, rule)
+        manager = self.get_manager_for_repo(repo)
+        return await manager.find_cross_repo_binding(qq_id, repo)
+
     async def bind_github_qq_to_repo(self, github_id: str, qq_id: str, repo: str) -> bool:
-        """绑定GitHub ID和QQ号到指定仓库"""
+        """绑定GitHub ID和QQ号到指定仓库（规则中所有已Star的仓库）"""
+        rule = parse_repo_rule(repo)
+        if rule.is_compound:
+            return await self._bind_rule(github_id, qq_id, rule)
         manager = self.get_manager_for_repo(repo)
         return await manager.bind_github_qq_to_repo(github_id, qq_id, repo)
 
     async def unbind_qq_from_repo(self, qq_id: str, repo: str) -> bool:
-        """从指定仓库解绑QQ号"""
+        """从指定仓库（规则中的所有仓库）解绑QQ号"""
+        rule = parse_repo_rule(repo)
+        if rule.is_compound:
+            return await self._unbind_rule(qq_id, rule)
         manager = self.get_manager_for_repo(repo)
         return await manager.unbind_qq_from_repo(qq_id, repo)
 
@@ -587,6 +986,35 @@ class MultiRepoGitHubStarManager:
         manager = self.get_manager_for_repo(repo)
         return await manager.get_bound_count_for_repo(repo)
 
+    async def record_daily(self, repo: str, metric: str, count: int = 1):
+        """累加今天的统计指标（踢出等不对应记录写入的事件），规则按其中的仓库分别计入"""
+        for member in parse_repo_rule(repo).repos:
+            try:
+                await self.storage.add_daily(member, metric, count)
+            except Exception as e:
+                logger.warning(f"[GitHub Star Verify] 记录仓库 {member} 的每日统计失败: {e}")
+
+    @observe_db
+    async def get_daily_stats(self, repo: str, days: int) -> List[tuple]:
+        """最近 days 天（含今天）的每日汇总，按日期升序返回 (日期, {指标: 数量})
+
+        只读取汇总表中的 days * 指标数 行，耗时与Star用户数无关。
+        """
+        today = date.today()
+        day_list = [
+            (today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)
+        ]
+        try:
+            stats = await self.storage.daily_stats(repo, day_list[0], day_list[-1])
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 查询仓库 {repo} 的每日统计失败: {e}")
+            return []
+        return [
+            (day, {metric: stats.get((day, metric), 0) for metric in METRICS})
+            for day in day_list
+        ]
+
+    @observe_db
     async def get_qq_bound_repos(self, qq_id: str) -> List[str]:
         """
         使用单次查询获取该 QQ 绑定的所有 repo，然后按照以下顺序返回：
@@ -596,14 +1024,8 @@ class MultiRepoGitHubStarManager:
         """
 
         try:
-            # 一次性查询数据库，获取该 qq_id 绑定的所有 repo
-            async with aiosqlite.connect(DB_PATH) as conn:
-                async with conn.execute(
-                    "SELECT DISTINCT repo FROM github_stars WHERE qq_id = ?",
-                    (qq_id,)
-                ) as cursor:
-                    rows = await cursor.fetchall()
-                    found = {row[0] for row in rows}
+            # 一次性查询，获取该 qq_id 绑定的所有 repo
+            found = await self.storage.bound_repos(qq_id)
         except Exception as e:
             logger.error(f"[GitHub Star Verify] 查询绑定仓库失败: {e}")
             return []
@@ -617,9 +1039,11 @@ class MultiRepoGitHubStarManager:
         if self.default_repo and self.default_repo in found:
             bound_repos.append(self.default_repo)
 
-        # 按 group_repo_map 的顺序加入已绑定且未加入的仓库
+        # 按 group_repo_map 的顺序加入已绑定且未加入的仓库（规则按其中的仓库展开）
         added = set(bound_repos)
-        for r in self.group_repo_map.values():
+        for r in (
+            repo for value in self.group_repo_map.values() for repo in parse_repo_rule(value).repos
+        ):
             if not r:
                 continue
             if r in added:
@@ -634,8 +1058,100 @@ class MultiRepoGitHubStarManager:
 
         return bound_repos
 
+    # 多仓库规则：存储判断在单次查询中完成，API 兜底并发检查各仓库
+
+    @observe_db
+    async def _starred_repos_in_db(self, github_id: str, rule: RepoRule) -> set:
+        """规则中该用户在数据库里已是Star用户的仓库"""
+        try:
+            return await self.storage.starred_repos(github_id, rule.repos)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 检查Star状态失败: {e}")
+            return set()
+
+    @observe_db
+    async def _rule_bindings(self, column: str, value: str, rule: RepoRule) -> Dict[str, str]:
+        """按 github_id 或 qq_id 查询规则中各仓库的绑定，返回 仓库 -> 对方（QQ号或GitHub ID）"""
+        try:
+            return await self.storage.get_bindings(column, value, rule.repos)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 检查绑定状态失败: {e}")
+            return {}
+
+    async def _check_rule_directly(self, github_username: str, rule: RepoRule) -> bool:
+        """并发检查数据库中尚未确认的仓库；any 在首个成功时、all 在首个失败时取消其余检查"""
+        matched = await self._starred_repos_in_db(github_username, rule)
+        if rule.satisfied(matched):
+            return True
+        tasks = {
+            asyncio.create_task(
+                self.get_manager_for_repo(repo).check_user_starred_directly(github_username)
+            ): repo
+            for repo in rule.repos
+            if repo not in matched
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    repo = tasks[task]
+                    if task.exception() is None and task.result():
+                        matched.add(repo)
+                        await self.get_manager_for_repo(repo).record_stargazer(github_username)
+                    elif rule.mode == RULE_ALL:
+                        return False
+                if rule.satisfied(matched):
+                    return True
+            return False
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _bind_rule(self, github_id: str, qq_id: str, rule: RepoRule) -> bool:
+        """在规则中所有已Star、未被绑定、且该QQ号未绑定其他用户的仓库上绑定"""
+        try:
+            success = await self.storage.bind_rule(github_id, qq_id, rule)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 绑定失败: {e}")
+            return False
+        if success:
+            logger.info(
+                f"[GitHub Star Verify] 成功绑定: GitHub用户 {github_id} <-> QQ号 {qq_id}，规则 {rule}"
+            )
+        else:
+            logger.warning(
+                f"[GitHub Star Verify] 绑定失败: GitHub用户 {github_id} 不满足规则 {rule}"
+            )
+        return success
+
+    async def _unbind_rule(self, qq_id: str, rule: RepoRule) -> bool:
+        try:
+            return await self.storage.unbind(qq_id, rule.repos) > 0
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 解绑失败: {e}")
+            return False
+
+    async def _find_cross_rule_binding(self, qq_id: str, rule: RepoRule) -> Optional[str]:
+        """QQ号在规则外仓库绑定的GitHub ID中，满足规则且未被他人绑定的一个"""
+        try:
+            candidates = await self.storage.bound_github_ids_outside(qq_id, rule.repos)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 查询跨仓库绑定失败: {e}")
+            return None
+        for github_id in candidates:
+            if rule.satisfied(
+                await self._starred_repos_in_db(github_id, rule)
+            ) and not await self._rule_bindings("github_id", github_id, rule):
+                return github_id
+        return None
+
     async def close(self):
-        """关闭HTTP客户端"""
+        """关闭HTTP客户端、快照映射与存储"""
+        for manager in self._managers_cache.values():
+            if manager.snapshot:
+                manager.snapshot.close()
+        await self.storage.close()
         if self.http_client:
             await self.http_client.aclose()
             logger.debug("[GitHub Star Verify] HTTP客户端已关闭")
@@ -0,0 +1,85 @@
+import importlib.util
+from typing import Any, Dict
+import httpx
+from astrbot.api import logger
+
+
+def _module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+class ConnectionStats:
+    """通过 httpcore 的 trace 扩展统计新建连接与连接复用"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.http2_responses = 0
+
+    async def trace(self, event_name: str, info: Dict[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    async def on_request(self, request: httpx.Request):
+        request.extensions["trace"] = self.trace
+
+    async def on_response(self, response: httpx.Response):
+        self.requests += 1
+        if response.http_version == "HTTP/2":
+            self.http2_responses += 1
+
+    def reuse_ratio(self) -> float:
+        """复用已有连接的请求占比"""
+        if not self.requests:
+            return 0.0
+        return max(self.requests - self.connections_opened, 0) / self.requests
+
+    def summary(self) -> str:
+        return (
+            f"请求 {self.requests}，新建连接 {self.connections_opened}"
+            f"（TLS握手 {self.tls_handshakes}），复用率 {self.reuse_ratio():.0%}，"
+            f"HTTP/2 响应 {self.http2_responses}"
+        )
+
+
+def create_http_client(
+    stats: ConnectionStats,
+    http2: bool = False,
+    max_connections: int = 20,
+    max_keepalive: int = 10,
+    keepalive_expiry: float = 30.0,
+    connect_timeout: float = 10.0,
+    read_timeout: float = 30.0,
+    pool_timeout: float = 10.0,
+) -> httpx.AsyncClient:
+    """创建所有仓库共享的 GitHub HTTP 客户端
+
+    HTTP/2 需要安装 h2，brotli 解码需要安装 brotli 或 brotlicffi；未安装时自动回退。
+    """
+    if http2 and not _module_available("h2"):
+        logger.warning("[GitHub Star Verify] 未安装 h2，HTTP/2 已回退为 HTTP/1.1")
+        http2 = False
+
+    encodings = ["gzip", "deflate"]
+    if _module_available("brotli") or _module_available("brotlicffi"):
+        encodings.append("br")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            pool=pool_timeout,
+        ),
+        headers={"Accept-Encoding": ", ".join(encodings)},
+        event_hooks={"request": [stats.on_request], "response": [stats.on_response]},
+    )
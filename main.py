@@ -1,10 +1,80 @@
 from astrbot.api.event import filter, AstrMessageEvent
-from astrbot.api.star import Context, Star
+from astrbot.api.star import Context, Star, StarTools
 from astrbot.api import logger
 import asyncio
+import functools
+import os
 import re
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from .github_manager import MultiRepoGitHubStarManager
+from .outbound_queue import OutboundMessageQueue
+from .verification_queue import VerificationWorkerPool, JOB_REJECTED, JOB_REPLACED
+from .tracing import TRACER, SlowPathProfiler
+from .trace_recorder import RECORDER
+from .webhook import GitHubWebhookServer
+from .etag_cache import MemoryStarredPageCache, StarredPageCache
+from .request_scheduler import RequestScheduler
+from .sync_jobs import SyncJob, SyncJobManager
+from .bindings_io import export_bindings, import_bindings
+from .storage import (
+    METRIC_BINDS,
+    METRIC_KICKS,
+    METRIC_STARS,
+    METRIC_UNSTARS,
+    METRICS,
+    STORAGE_MEMORY,
+    STORAGE_SQLITE,
+    create_storage,
+)
+from .repo_rules import RULE_ALL, parse_repo_rule
+from .http_client import ConnectionStats, create_http_client
+from .metrics import (
+    REGISTRY,
+    MetricsExporter,
+    GITHUB_REQUESTS,
+    GITHUB_REQUEST_SECONDS,
+    GITHUB_RATELIMIT_REMAINING,
+    DB_QUERY_SECONDS,
+    VERIFICATION_SECONDS,
+    VERIFICATIONS,
+    SYNC_SECONDS,
+    SYNC_PAGES_PER_SECOND,
+)
+
+# 绑定复核的处理方式 -> 提醒消息中的 {action}
+AUDIT_ACTIONS = {
+    "notify": "请重新Star以保留群成员资格",
+    "unbind": "绑定已解除，请重新Star后再次绑定",
+    "kick": "你将被移出群聊",
+}
+
+# 预热阶段 -> 日志与状态中的名称
+WARMUP_PHASES = {
+    "storage": "存储与客户端",
+    "caches": "查询缓存",
+    "bot_roles": "机器人角色",
+    "sync": "启动同步",
+}
+
+# /github stats 的默认与最大天数；超过 STATS_TABLE_DAYS 天时只列出最近几天的明细
+STATS_DEFAULT_DAYS = 7
+STATS_MAX_DAYS = 90
+STATS_TABLE_DAYS = 14
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# 消息中的 @ 片段；GitHub用户名（字母数字与横线，不能以横线开头结尾）
+AT_PATTERN = re.compile(r"\[CQ:at,qq=\d+\]")
+GITHUB_USERNAME_PATTERN = re.compile(r"^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$")
+
+
+def sparkline(values: List[int]) -> str:
+    """用方块字符绘制趋势，最大值对应最高的方块"""
+    peak = max(values, default=0)
+    if peak <= 0:
+        return SPARK_CHARS[0] * len(values)
+    top = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round(max(value, 0) * top / peak)] for value in values)
 
 
 class GitHubStarVerifyPlugin(Star):
@@ -30,6 +100,9 @@ class GitHubStarVerifyPlugin(Star):
 
         self.verification_timeout = config.get("verification_timeout", 300)
         self.kick_delay = config.get("kick_delay", 60)
+        self.auto_verify_cross_repo = config.get("auto_verify_cross_repo", True)
+        self.hedged_verification = config.get("hedged_verification", False)
+        self.verification_deadline = config.get("verification_deadline", 10)
 
         # 消息模板
         self.join_prompt = config.get(
@@ -58,10 +131,155 @@ class GitHubStarVerifyPlugin(Star):
             "invalid_github_message",
             "{at_user} 验证失败：请提供有效的GitHub用户名。格式：@机器人 GitHub用户名",
         )
+        self.checking_message = config.get(
+            "checking_message", "{at_user} 已收到，正在检查Star状态，请稍候…"
+        )
+        self.busy_message = config.get(
+            "busy_message", "{at_user} 当前验证请求过多，请稍后再试。"
+        )
+        self.slow_check_message = config.get(
+            "slow_check_message", "{at_user} GitHub响应较慢，验证结果将稍后通知。"
+        )
+
+        # 加群申请验证：在用户入群前完成验证并同意或拒绝申请
+        self.join_request_gating = config.get("join_request_gating", False)
+        self.join_request_reject_message = config.get(
+            "join_request_reject_message",
+            "GitHub Star验证未通过：{reason}。请在验证信息中填写已Star {repo} 的GitHub用户名",
+        )
 
         # 状态管理
         self.pending: Dict[str, str] = {}  # user_id -> group_id
+        self.join_times: Dict[str, float] = {}  # user_id -> 入群时间（用于统计验证耗时）
         self.timeout_tasks: Dict[str, asyncio.Task] = {}
+        # user_id -> 验证未通过时回复的GitHub用户名（收到该用户的 Star 事件时自动重新验证）
+        self.claimed_usernames: Dict[str, str] = {}
+
+        # 群成员昵称缓存：group_id -> (拉取时间, {user_id: 昵称})
+        self.member_cache_ttl = config.get("member_cache_ttl", 30)
+        self._member_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._member_list_tasks: Dict[str, asyncio.Task] = {}
+        # 机器人在各群的角色缓存：group_id -> (查询时间, 角色)，收到管理员变动通知时失效
+        self.bot_role_cache_ttl = config.get("bot_role_cache_ttl", 300)
+        self._bot_roles: Dict[str, Tuple[float, str]] = {}
+
+        # 插件加载后在后台预热，首个入群事件无需等待初始化
+        self.warmup_on_load = config.get("warmup_on_load", True)
+        self.warmup_sync = config.get("warmup_sync", False)
+        self.warmup_timings: Dict[str, float] = {}
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._init_lock = asyncio.Lock()
+
+        # 多实例共享数据库时的同步租约时长（秒）
+        self.sync_lease_ttl = config.get("sync_lease_ttl", 120)
+        # 后台同步任务（/github sync 立即返回任务编号，/github jobs 查看进度）
+        self.sync_batch_size = config.get("sync_batch_size", 1000)
+        self.sync_jobs = SyncJobManager(self._run_sync_job)
+        # 完整同步后写入 mmap 用户名快照，重启后无需预热即可直接命中
+        self.stargazer_snapshot = config.get("stargazer_snapshot", True)
+        # 存储后端：sqlite（数据目录下的数据库文件）或 memory（仅保存在内存中）
+        self.storage_backend = config.get("storage_backend", STORAGE_SQLITE)
+        # 完整同步后复核已绑定成员：none / notify / unbind / kick
+        self.audit_action = config.get("audit_action", "none")
+        self.audit_message = config.get(
+            "audit_message",
+            "{at_user} 检测到你绑定的GitHub用户 {github_user} 已取消Star {repo}，{action}。",
+        )
+
+        # GitHub HTTP 连接设置
+        self.http_settings = {
+            "http2": config.get("http2", False),
+            "max_connections": config.get("http_max_connections", 20),
+            "max_keepalive": config.get("http_max_keepalive", 10),
+            "keepalive_expiry": config.get("http_keepalive_expiry", 30.0),
+            "connect_timeout": config.get("http_connect_timeout", 10.0),
+            "read_timeout": config.get("http_read_timeout", 30.0),
+            "pool_timeout": config.get("http_pool_timeout", 10.0),
+        }
+        self.http_stats = ConnectionStats()
+        # GitHub 请求调度：交互验证优先，同步翻页限速并在配额不足时暂停
+        self.request_scheduler = RequestScheduler(
+            max_concurrency=config.get("github_max_concurrency", 8),
+            bulk_concurrency=config.get("sync_concurrency", 1),
+            bulk_interval=config.get("sync_request_interval", 0.0),
+            reserve=config.get("sync_reserve_quota", 500),
+        )
+        # Star 列表页面的 ETag 缓存（条件请求命中时不消耗API配额），内存存储时不写磁盘
+        etag_cache_size = config.get("etag_cache_size", 10000)
+        if self.storage_backend == STORAGE_MEMORY:
+            self.etag_cache = MemoryStarredPageCache(max_entries=etag_cache_size)
+        else:
+            self.etag_cache = StarredPageCache(
+                str(StarTools.get_data_dir("github_star_verify") / "http_cache.db"),
+                max_entries=etag_cache_size,
+            )
+
+        # 验证任务队列（固定数量工作协程、按 (uid, group) 去重、队列有上限）
+        self.verification_pool = VerificationWorkerPool(
+            workers=config.get("verification_workers", 4),
+            max_queue=config.get("verification_queue_size", 200),
+        )
+        self.verification_ack_threshold = config.get("verification_ack_threshold", 5)
+
+        # 出站消息队列（按群限速、合并入群提示、限制踢人并发）
+        self.outbound = OutboundMessageQueue(
+            rate=config.get("send_rate", 1.0),
+            burst=config.get("send_burst", 5),
+            kick_concurrency=config.get("kick_concurrency", 3),
+            max_retries=config.get("send_max_retries", 3),
+            merge_limit=config.get("prompt_merge_limit", 10),
+        )
+
+        # 指标：队列深度在导出时实时计算
+        REGISTRY.gauge(
+            "github_star_verify_pending_members",
+            "Members waiting for verification",
+            func=lambda: len(self.pending),
+        )
+        REGISTRY.gauge(
+            "github_star_verify_verification_queue_depth",
+            "Verification jobs queued or running",
+            func=lambda: self.verification_pool.in_flight(),
+        )
+        REGISTRY.gauge(
+            "github_star_verify_outbound_queue_depth",
+            "Outbound OneBot messages waiting to be sent",
+            func=lambda: self.outbound.pending_count(),
+        )
+        # 追踪与慢路径分析
+        data_dir = StarTools.get_data_dir("github_star_verify")
+        TRACER.configure(
+            enabled=config.get("trace_enabled", False),
+            path=config.get("trace_file", "") or str(data_dir / "traces.jsonl"),
+        )
+        # 流量录制（用于离线回放）
+        RECORDER.configure(
+            enabled=config.get("record_enabled", False),
+            path=config.get("record_file", "") or str(data_dir / "recording.jsonl.gz"),
+            salt=config.get("record_salt", ""),
+        )
+        self.slow_verification_threshold = config.get("slow_verification_threshold", 0)
+        self.profiler = SlowPathProfiler(
+            threshold=self.slow_verification_threshold,
+            enabled=config.get("profile_slow_verifications", False),
+            sample_rate=config.get("profile_sample_rate", 0.1),
+            output_dir=str(data_dir / "profiles"),
+        )
+
+        self.metrics_exporter = MetricsExporter(
+            textfile=config.get("metrics_textfile", ""),
+            http_host=config.get("metrics_http_host", "127.0.0.1"),
+            http_port=config.get("metrics_http_port", 0),
+        )
+
+        # GitHub Webhook 接收端（实时接收 Star / 取消Star 事件）
+        self.webhook_server = GitHubWebhookServer(
+            secret=config.get("webhook_secret", ""),
+            handler=self._handle_star_webhook,
+            host=config.get("webhook_host", "127.0.0.1"),
+            port=config.get("webhook_port", 0),
+            path=config.get("webhook_path", "/github/webhook"),
+        )
 
         # GitHub管理器
         self.github_manager = None
@@ -93,54 +311,69 @@ class GitHubStarVerifyPlugin(Star):
         return int(str(gid))
 
     async def _ensure_github_manager(self):
-        """确保GitHub管理器已初始化"""
-        if self.github_manager is None:
-            # 验证配置：至少需要有 default_repo 或 group_repo_map 中的一个
-            has_default = bool(self.default_repo)
-            has_group_mapping = bool(self.group_repo_map)
-
-            if not self.github_token:
-                logger.error(
-                    "[GitHub Star Verify] 缺少GitHub token配置"
-                )
-                return False
+        """确保GitHub管理器已初始化；预热与首个事件同时调用时只初始化一次"""
+        if self.github_manager is not None:
+            return True
+        async with self._init_lock:
+            if self.github_manager is None:
+                # 验证配置：至少需要有 default_repo 或 group_repo_map 中的一个
+                has_default = bool(self.default_repo)
+                has_group_mapping = bool(self.group_repo_map)
+
+                if not self.github_token:
+                    logger.error(
+                        "[GitHub Star Verify] 缺少GitHub token配置"
+                    )
+                    return False
 
-            if not has_default and not has_group_mapping:
-                logger.error(
-                    "[GitHub Star Verify] 需要配置 default_repo 或 group_repo_map 中的至少一个"
+                if not has_default and not has_group_mapping:
+                    logger.error(
+                        "[GitHub Star Verify] 需要配置 default_repo 或 group_repo_map 中的至少一个"
+                    )
+                    return False
+
+                manager = MultiRepoGitHubStarManager(
+                    github_token=self.github_token,
+                    default_repo=self.default_repo,
+                    group_repo_map=self.group_repo_map,
+                    http_client=create_http_client(self.http_stats, **self.http_settings),
+                    sync_lease_ttl=self.sync_lease_ttl,
+                    etag_cache=self.etag_cache,
+                    scheduler=self.request_scheduler,
+                    sync_batch_size=self.sync_batch_size,
+                    use_snapshot=self.stargazer_snapshot,
+                    storage=create_storage(
+                        self.storage_backend, str(StarTools.get_data_dir("github_star_verify"))
+                    ),
                 )
-                return False
-
-            self.github_manager = MultiRepoGitHubStarManager(
-                github_token=self.github_token,
-                default_repo=self.default_repo,
-                group_repo_map=self.group_repo_map,
-            )
 
-            # 初始化数据库
-            await self.github_manager.init_database()
+                # 初始化数据库，完成后才对其他调用者可见
+                await manager.init_database()
+                self.github_manager = manager
+                await self.metrics_exporter.start()
+                await self.webhook_server.start()
 
-            # 检查默认仓库的数据库状态（如果配置了默认仓库）
-            if has_default:
-                stars_count = await self.github_manager.get_stars_count_for_repo(
-                    self.default_repo
-                )
-                if stars_count == 0:
-                    logger.info(
-                        f"[GitHub Star Verify] 检测到默认仓库 {self.default_repo} 数据库为空，请使用 /github sync 命令同步Star用户"
+                # 检查默认仓库的数据库状态（如果配置了默认仓库）
+                if has_default:
+                    stars_count = await manager.get_stars_count_for_repo(
+                        self.default_repo
                     )
+                    if stars_count == 0:
+                        logger.info(
+                            f"[GitHub Star Verify] 检测到默认仓库 {self.default_repo} 数据库为空，请使用 /github sync 命令同步Star用户"
+                        )
+                    else:
+                        logger.info(
+                            f"[GitHub Star Verify] GitHub管理器已初始化，默认仓库: {self.default_repo}，数据库中有 {stars_count} 个Star用户"
+                        )
                 else:
                     logger.info(
-                        f"[GitHub Star Verify] GitHub管理器已初始化，默认仓库: {self.default_repo}，数据库中有 {stars_count} 个Star用户"
+                        "[GitHub Star Verify] GitHub管理器已初始化，未配置默认仓库，仅使用群组仓库映射"
                     )
-            else:
-                logger.info(
-                    "[GitHub Star Verify] GitHub管理器已初始化，未配置默认仓库，仅使用群组仓库映射"
-                )
 
-            # 显示群组配置信息
-            if self.group_repo_map:
-                logger.info(f"[GitHub Star Verify] 群组仓库映射: {self.group_repo_map}")
+                # 显示群组配置信息
+                if self.group_repo_map:
+                    logger.info(f"[GitHub Star Verify] 群组仓库映射: {self.group_repo_map}")
 
         return True
 
@@ -164,6 +397,88 @@ class GitHubStarVerifyPlugin(Star):
 
         return await self.github_manager.sync_all_repos()
 
+    async def _run_sync_job(self, job: SyncJob) -> bool:
+        """后台同步任务的执行体"""
+        if not await self._ensure_github_manager():
+            return False
+        success = await self.github_manager.sync_stargazers_for_repo(job.repo, job)
+        if success and job.complete and job.reconcile and self.audit_action in AUDIT_ACTIONS:
+            await self._audit_bindings(job)
+        return success
+
+    async def _groups_for_repo(self, bot, repo: str) -> List[int]:
+        """使用指定仓库验证的群：映射到该仓库的群，默认仓库还包括未配置映射的群
+
+        any 规则的群不计入：成员可能仍满足规则中的其他仓库。
+        """
+        groups = []
+        for gid, mapped in self.group_repo_map.items():
+            rule = parse_repo_rule(mapped)
+            if repo in rule.repos and (rule.mode == RULE_ALL or not rule.is_compound):
+                groups.append(int(gid))
+        if repo == self.default_repo:
+            try:
+                group_list = await bot.api.call_action("get_group_list")
+            except Exception as e:
+                logger.warning(f"[GitHub Star Verify] 获取群列表失败: {e}")
+                group_list = []
+            for group in group_list or []:
+                gid = str(group.get("group_id"))
+                if gid not in self.group_repo_map:
+                    groups.append(int(gid))
+        return groups
+
+    async def _audit_bindings(self, job: SyncJob):
+        """完整同步后找出已取消Star的绑定，按 audit_action 提醒、解绑或踢出
+
+        一次查询得到全部未出现在本次同步中的已绑定用户，不逐个请求GitHub；
+        提醒与踢人经出站队列限速执行。
+        """
+        repo = job.repo
+        stale = await self.github_manager.get_stale_bindings(repo, job.synced_at)
+        job.audit_stale = len(stale)
+        if not stale:
+            logger.info(f"[GitHub Star Verify] 仓库 {repo} 的绑定复核完成，没有已取消Star的绑定")
+            return
+        logger.info(
+            f"[GitHub Star Verify] 仓库 {repo} 有 {len(stale)} 个已绑定用户取消了Star，执行: {self.audit_action}"
+        )
+
+        github_by_qq = {qq_id: github_id for github_id, qq_id in stale}
+        bot = self.context.get_platform("aiocqhttp").get_client()
+        kicks = []
+        for gid in await self._groups_for_repo(bot, repo):
+            try:
+                members = await self._fetch_group_member_names(bot, gid)
+            except Exception as e:
+                logger.warning(f"[GitHub Star Verify] 获取群 {gid} 成员列表失败: {e}")
+                continue
+            for uid in github_by_qq.keys() & members.keys():
+                self.outbound.send(
+                    bot,
+                    gid,
+                    self.audit_message.format(
+                        at_user=f"[CQ:at,qq={uid}]",
+                        github_user=github_by_qq[uid],
+                        repo=repo,
+                        action=AUDIT_ACTIONS[self.audit_action],
+                    ),
+                )
+                if self.audit_action == "kick":
+                    kicks.append(self.outbound.kick(bot, gid, int(uid)))
+
+        if kicks:
+            results = await asyncio.gather(*kicks, return_exceptions=True)
+            failed = sum(isinstance(result, Exception) for result in results)
+            logger.info(
+                f"[GitHub Star Verify] 仓库 {repo} 复核踢出 {len(kicks) - failed} 人，失败 {failed} 人"
+            )
+            if len(kicks) > failed:
+                await self.github_manager.record_daily(repo, METRIC_KICKS, len(kicks) - failed)
+        if self.audit_action in ("unbind", "kick"):
+            removed = await self.github_manager.remove_stale_bindings(repo, job.synced_at)
+            logger.info(f"[GitHub Star Verify] 仓库 {repo} 已解除 {removed} 个已取消Star的绑定")
+
     @filter.event_message_type(filter.EventMessageType.GROUP_MESSAGE)
     async def handle_event(self, event: AstrMessageEvent):
         if event.get_platform_name() != "aiocqhttp":
@@ -171,16 +486,56 @@ class GitHubStarVerifyPlugin(Star):
 
         raw = event.message_obj.raw_message
         post_type = raw.get("post_type")
+        if RECORDER.enabled:
+            self._record_event(event, raw)
 
         if post_type == "notice":
             notice_type = raw.get("notice_type")
             if notice_type == "group_increase":
-                await self._process_new_member(event)
+                with TRACER.root_span(
+                    "join", user_id=str(raw.get("user_id")), group_id=str(raw.get("group_id"))
+                ):
+                    await self._process_new_member(event)
             elif notice_type == "group_decrease":
                 await self._process_member_decrease(event)
+            elif notice_type == "group_admin" and str(raw.get("user_id")) == str(
+                event.get_self_id()
+            ):
+                # 机器人被设置或取消管理员，下次入群时重新查询
+                self._bot_roles.pop(self._group_key(raw.get("group_id")), None)
+
+        elif (
+            post_type == "request"
+            and raw.get("request_type") == "group"
+            and raw.get("sub_type") == "add"
+            and self.join_request_gating
+        ):
+            with TRACER.root_span(
+                "join_request", user_id=str(raw.get("user_id")), group_id=str(raw.get("group_id"))
+            ):
+                await self._process_join_request(event)
 
         elif post_type == "message" and raw.get("message_type") == "group":
-            await self._process_verification_message(event)
+            with TRACER.root_span(
+                "message", user_id=str(raw.get("user_id")), group_id=str(raw.get("group_id"))
+            ):
+                await self._process_verification_message(event)
+
+    def _record_event(self, event: AstrMessageEvent, raw: Dict):
+        """录制与验证相关的事件：群成员变动通知与待验证成员的群消息"""
+        post_type = raw.get("post_type")
+        if post_type == "message":
+            if raw.get("message_type") != "group":
+                return
+            uid = str(raw.get("user_id"))
+            if self.pending.get(uid) != self._group_key(raw.get("group_id")):
+                return
+        elif post_type not in ("notice", "request"):
+            return
+        repo = None
+        if self.github_manager and raw.get("group_id") is not None:
+            repo = self.github_manager.get_repo_for_group(str(raw.get("group_id")))
+        RECORDER.record_event(raw, event.message_str, repo)
 
     async def _process_new_member(self, event: AstrMessageEvent):
         """处理新成员入群的逻辑"""
@@ -194,10 +549,7 @@ class GitHubStarVerifyPlugin(Star):
         # 检查机器人是否为群管理员
         bot_id = str(event.get_self_id())
         try:
-            bot_info = await event.bot.api.call_action(
-                "get_group_member_info", group_id=int(gid), user_id=int(bot_id)
-            )
-            bot_role = bot_info.get("role", "member")
+            bot_role = await self._get_bot_role(event.bot, gid, bot_id)
             if bot_role not in ["admin", "owner"]:
                 logger.warning(
                     f"[GitHub Star Verify] 机器人在群 {gid} 不是管理员，无法发送验证消息和执行踢人操作"
@@ -221,6 +573,12 @@ class GitHubStarVerifyPlugin(Star):
             )
             return
 
+        # 已在其他仓库绑定且为本仓库Star用户的，直接自动绑定
+        if self.auto_verify_cross_repo and await self._auto_verify_from_bindings(
+            event, uid, gid, repo
+        ):
+            return
+
         # 清理旧的验证任务
         if uid in self.timeout_tasks:
             old_task = self.timeout_tasks.pop(uid, None)
@@ -228,34 +586,160 @@ class GitHubStarVerifyPlugin(Star):
                 old_task.cancel()
 
         self.pending[uid] = self._group_key(gid)
+        self.join_times[uid] = time.monotonic()
         logger.info(
             f"[GitHub Star Verify] 用户 {uid} 加入群 {gid}，启动GitHub验证流程，目标仓库: {repo}"
         )
 
-        # 获取用户昵称
-        nickname = uid
-        try:
-            user_info = await event.bot.api.call_action(
-                "get_group_member_info", group_id=int(gid), user_id=int(uid)
+        # 发送验证提示（同群同仓库的待发送提示会被合并为一条消息）
+        self.outbound.send_merged(
+            event.bot,
+            int(gid),
+            merge_key=f"join_prompt:{repo}",
+            user_id=uid,
+            render=functools.partial(self._render_join_prompt, repo),
+        )
+
+        # 创建超时任务
+        task = asyncio.create_task(self._timeout_kick(uid, int(gid), repo))
+        self.timeout_tasks[uid] = task
+
+    async def _auto_verify_from_bindings(
+        self, event: AstrMessageEvent, uid: str, gid: str, repo: str
+    ) -> bool:
+        """使用用户在其他仓库的绑定自动完成验证，无需调用GitHub API"""
+        github_id = await self.github_manager.find_cross_repo_binding(uid, repo)
+        if not github_id:
+            return False
+
+        if not await self.github_manager.bind_github_qq_to_repo(github_id, uid, repo):
+            return False
+
+        VERIFICATIONS.inc(result="auto")
+        logger.info(
+            f"[GitHub Star Verify] 用户 {uid} 已通过其他仓库的绑定 {github_id} 自动验证，仓库: {repo}"
+        )
+        self.outbound.send(
+            event.bot,
+            int(gid),
+            self.welcome_message.format(at_user=f"[CQ:at,qq={uid}]", repo=repo),
+        )
+        return True
+
+    async def _process_join_request(self, event: AstrMessageEvent):
+        """处理加群申请：从验证信息中提取GitHub用户名，验证通过后同意申请，否则拒绝"""
+        if not await self._ensure_github_manager():
+            return
+
+        raw = event.message_obj.raw_message
+        uid = str(raw.get("user_id"))
+        gid = str(raw.get("group_id"))
+        flag = raw.get("flag", "")
+
+        repo = self.get_repo_for_group(gid)
+        if not repo:
+            logger.warning(f"[GitHub Star Verify] 群组 {gid} 没有配置仓库，加群申请交由管理员处理")
+            return
+
+        # 已绑定本仓库（重新入群）或可用其他仓库的绑定自动验证时，无需填写GitHub用户名
+        github_id = await self._binding_for_join_request(uid, repo)
+        if github_id:
+            await self._answer_join_request(event.bot, uid, gid, repo, flag, approve=True)
+            logger.info(
+                f"[GitHub Star Verify] 用户 {uid} 已绑定GitHub用户 {github_id}，同意加群申请，仓库: {repo}"
             )
-            nickname = user_info.get("card", "") or user_info.get("nickname", uid)
-        except Exception as e:
-            logger.warning(f"[GitHub Star Verify] 获取用户 {uid} 昵称失败: {e}")
+            event.stop_event()
+            return
 
-        # 发送验证提示
-        prompt_message = self.join_prompt.format(
-            member_name=f"[CQ:at,qq={uid}]",
-            timeout=self.verification_timeout // 60,
-            repo=repo,
+        github_username = self._extract_request_username(raw.get("comment", ""))
+        if not github_username:
+            await self._answer_join_request(
+                event.bot, uid, gid, repo, flag, approve=False, reason="未填写有效的GitHub用户名"
+            )
+            event.stop_event()
+            return
+
+        status = self.verification_pool.submit(
+            (uid, gid),
+            functools.partial(
+                self._run_join_request, event.bot, uid, gid, repo, github_username, flag
+            ),
         )
+        if status == JOB_REJECTED:
+            # 队列已满时不自动拒绝，保留申请由管理员或下次重试处理
+            logger.warning(f"[GitHub Star Verify] 验证队列已满，用户 {uid} 的加群申请交由管理员处理")
+            return
+        event.stop_event()
 
-        await event.bot.api.call_action(
-            "send_group_msg", group_id=int(gid), message=prompt_message
+    async def _binding_for_join_request(self, uid: str, repo: str) -> Optional[str]:
+        """申请人已绑定仓库时返回其GitHub用户名；可用其他仓库的绑定自动绑定时完成绑定并返回"""
+        existing_github = await self.github_manager.is_qq_bound_to_repo(uid, repo)
+        if existing_github:
+            return existing_github
+        if not self.auto_verify_cross_repo:
+            return None
+        github_id = await self.github_manager.find_cross_repo_binding(uid, repo)
+        if github_id and await self.github_manager.bind_github_qq_to_repo(github_id, uid, repo):
+            VERIFICATIONS.inc(result="auto")
+            return github_id
+        return None
+
+    async def _run_join_request(
+        self, bot, uid: str, gid: str, repo: str, github_username: str, flag: str
+    ):
+        """验证队列中的加群申请任务"""
+        is_star = await self.github_manager.is_stargazer(github_username, repo)
+        if not is_star:
+            is_star = await self.github_manager.check_user_starred_directly(
+                github_username, repo
+            )
+            if is_star:
+                await self.github_manager.record_stargazer(github_username, repo)
+        if not is_star:
+            await self._answer_join_request(
+                bot, uid, gid, repo, flag, approve=False, reason=f"{github_username} 未Star该仓库"
+            )
+            return
+
+        bound_qq = await self.github_manager.is_github_id_bound_to_repo(github_username, repo)
+        if bound_qq and str(bound_qq) != uid:
+            await self._answer_join_request(
+                bot, uid, gid, repo, flag, approve=False, reason=f"{github_username} 已被其他QQ绑定"
+            )
+            return
+        if not bound_qq and not await self.github_manager.bind_github_qq_to_repo(
+            github_username, uid, repo
+        ):
+            # 绑定失败时不做决定，交由管理员处理
+            return
+
+        # 同意后用户入群时已绑定，不会再收到验证提示
+        await self._answer_join_request(bot, uid, gid, repo, flag, approve=True)
+        logger.info(
+            f"[GitHub Star Verify] 用户 {uid} 使用GitHub用户名 {github_username} 通过加群申请验证，仓库: {repo}"
         )
 
-        # 创建超时任务
-        task = asyncio.create_task(self._timeout_kick(uid, int(gid), nickname, repo))
-        self.timeout_tasks[uid] = task
+    async def _answer_join_request(
+        self, bot, uid: str, gid: str, repo: str, flag: str, approve: bool, reason: str = ""
+    ):
+        """同意或拒绝加群申请"""
+        params = {"flag": flag, "sub_type": "add", "approve": approve}
+        if not approve:
+            params["reason"] = self.join_request_reject_message.format(repo=repo, reason=reason)
+        try:
+            with TRACER.span("onebot.set_group_add_request", approve=approve):
+                await bot.api.call_action("set_group_add_request", **params)
+            VERIFICATIONS.inc(result="request_approved" if approve else "request_rejected")
+            if not approve:
+                logger.info(f"[GitHub Star Verify] 已拒绝用户 {uid} 加入群 {gid}: {reason}")
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 处理用户 {uid} 的加群申请失败: {e}")
+
+    def _extract_request_username(self, comment: str) -> str:
+        """从加群申请的验证信息中提取GitHub用户名（群设置了问题时取“答案：”之后的内容）"""
+        if "答案：" in comment:
+            comment = comment.rsplit("答案：", 1)[1]
+        return self._extract_github_username(comment.strip())
 
     async def _process_verification_message(self, event: AstrMessageEvent):
         """处理群聊消息中的GitHub验证"""
@@ -289,41 +773,109 @@ class GitHubStarVerifyPlugin(Star):
         # 提取GitHub用户名
         github_username = self._extract_github_username(text)
         if not github_username:
-            await event.bot.api.call_action(
-                "send_group_msg",
-                group_id=int(gid),
-                message=self.invalid_github_message.format(at_user=f"[CQ:at,qq={uid}]"),
+            self.outbound.send(
+                event.bot,
+                int(gid),
+                self.invalid_github_message.format(at_user=f"[CQ:at,qq={uid}]"),
             )
             return
 
-        # 先用数据库快速判定，再调用GitHub API兜底验证
-        is_star = await self.github_manager.is_stargazer(github_username, repo)
-        if not is_star:
-            is_star = await self.github_manager.check_user_starred_directly(
-                github_username, repo
+        # 提交到验证队列，由工作协程执行数据库与GitHub API检查
+        status = self.verification_pool.submit(
+            (uid, gid),
+            functools.partial(
+                self._run_verification,
+                event.bot,
+                uid,
+                gid,
+                repo,
+                github_username,
+                TRACER.current_context(),
+            ),
+        )
+        if status == JOB_REJECTED:
+            logger.warning(f"[GitHub Star Verify] 验证队列已满，拒绝用户 {uid} 的验证请求")
+            self.outbound.send(
+                event.bot,
+                int(gid),
+                self.busy_message.format(at_user=f"[CQ:at,qq={uid}]"),
             )
-            # 记录到数据库
-            if is_star:
-                await self.github_manager.record_stargazer(github_username, repo)
+            return
+        if status == JOB_REPLACED:
+            # 上一次的检查尚未开始时改为检查新用户名，已在检查时结束后再检查新用户名
+            logger.info(f"[GitHub Star Verify] 用户 {uid} 在验证期间再次回复，将检查 {github_username}")
+        if status == JOB_REPLACED or self.verification_pool.depth() >= self.verification_ack_threshold:
+            # 队列较深或重复回复时先回复确认，避免用户以为消息未被处理
+            self.outbound.send(
+                event.bot,
+                int(gid),
+                self.checking_message.format(at_user=f"[CQ:at,qq={uid}]"),
+            )
+        event.stop_event()
+
+    async def _run_verification(
+        self, bot, uid: str, gid: str, repo: str, github_username: str, trace_parent=None
+    ):
+        """验证队列中的任务：记录追踪 span，超过阈值时输出各阶段耗时与分析结果"""
+        profiler = self.profiler.start()
+        start = time.perf_counter()
+        with TRACER.root_span(
+            "verification", parent=trace_parent, user_id=uid, repo=repo
+        ) as span:
+            try:
+                await self._verify_and_bind(bot, uid, gid, repo, github_username)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.profiler.stop(profiler, elapsed, uid)
+
+        if self.slow_verification_threshold and elapsed >= self.slow_verification_threshold:
+            if TRACER.enabled:
+                logger.warning(
+                    f"[GitHub Star Verify] 用户 {uid} 验证耗时 {elapsed:.2f}s，各阶段耗时:\n{TRACER.summarize(span)}"
+                )
+            else:
+                logger.warning(f"[GitHub Star Verify] 用户 {uid} 验证耗时 {elapsed:.2f}s")
+
+    async def _verify_and_bind(
+        self, bot, uid: str, gid: str, repo: str, github_username: str
+    ):
+        """检查Star状态并完成绑定"""
+        if uid not in self.pending:
+            # 排队期间用户已离开、已验证或已被踢出
+            return
+
+        if self.hedged_verification:
+            is_star = await self._check_star_hedged(bot, uid, gid, repo, github_username)
+        else:
+            # 先用数据库快速判定，再调用GitHub API兜底验证
+            is_star = await self.github_manager.is_stargazer(github_username, repo)
+            if not is_star:
+                is_star = await self.github_manager.check_user_starred_directly(
+                    github_username, repo
+                )
+                # 记录到数据库
+                if is_star:
+                    await self.github_manager.record_stargazer(github_username, repo)
         if not is_star:
-            await event.bot.api.call_action(
-                "send_group_msg",
-                group_id=int(gid),
-                message=self.not_star_message.format(
-                    at_user=f"[CQ:at,qq={uid}]", repo=repo
-                ),
+            VERIFICATIONS.inc(result="not_star")
+            self.claimed_usernames[uid] = github_username
+            self.outbound.send(
+                bot,
+                int(gid),
+                self.not_star_message.format(at_user=f"[CQ:at,qq={uid}]", repo=repo),
             )
             return
 
-        # 检查GitHub用户名是否已被绑定到该仓库
-        is_bound = await self.github_manager.is_github_id_bound_to_repo(
+        # 检查GitHub用户名是否已被其他QQ绑定到该仓库（规则中已由本人绑定的仓库不算，继续补绑其余仓库）
+        bound_qq = await self.github_manager.is_github_id_bound_to_repo(
             github_username, repo
         )
-        if is_bound:
-            await event.bot.api.call_action(
-                "send_group_msg",
-                group_id=int(gid),
-                message=self.already_bound_message.format(at_user=f"[CQ:at,qq={uid}]"),
+        if bound_qq and str(bound_qq) != uid:
+            VERIFICATIONS.inc(result="already_bound")
+            self.outbound.send(
+                bot,
+                int(gid),
+                self.already_bound_message.format(at_user=f"[CQ:at,qq={uid}]"),
             )
             return
 
@@ -332,9 +884,7 @@ class GitHubStarVerifyPlugin(Star):
             github_username, uid, repo
         )
         if not bind_success:
-            await event.bot.api.call_action(
-                "send_group_msg", group_id=int(gid), message="绑定失败，请稍后重试。"
-            )
+            self.outbound.send(bot, int(gid), "绑定失败，请稍后重试。")
             return
 
         # 验证成功，清理任务
@@ -343,30 +893,89 @@ class GitHubStarVerifyPlugin(Star):
             task.cancel()
 
         self.pending.pop(uid, None)
+        self.claimed_usernames.pop(uid, None)
+        joined_at = self.join_times.pop(uid, None)
+        if joined_at is not None:
+            VERIFICATION_SECONDS.observe(time.monotonic() - joined_at, repo=repo)
+        VERIFICATIONS.inc(result="success")
 
         # 发送欢迎消息
         welcome_msg = self.welcome_message.format(
             at_user=f"[CQ:at,qq={uid}]", repo=repo
         )
 
-        await event.bot.api.call_action(
-            "send_group_msg", group_id=int(gid), message=welcome_msg
-        )
+        self.outbound.send(bot, int(gid), welcome_msg)
 
         logger.info(
             f"[GitHub Star Verify] 用户 {uid} 使用GitHub用户名 {github_username} 验证成功，仓库: {repo}"
         )
-        event.stop_event()
+
+    async def _check_star_hedged(
+        self, bot, uid: str, gid: str, repo: str, github_username: str
+    ) -> bool:
+        """同时发起数据库查询与GitHub API检查，任一方确认Star即返回并取消另一方
+
+        超过 verification_deadline 仍未得出结果时先发送 slow_check_message，
+        检查完成后再由调用方发送最终结果。
+        """
+        db_task = asyncio.create_task(
+            self.github_manager.is_stargazer(github_username, repo)
+        )
+        # 用户的Star列表按时间倒序返回，新Star的仓库通常在第一页即可命中
+        api_task = asyncio.create_task(
+            self.github_manager.check_user_starred_directly(github_username, repo)
+        )
+        pending = {db_task, api_task}
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.verification_deadline
+        deadline_passed = False
+
+        try:
+            while pending:
+                timeout = None if deadline_passed else max(deadline - loop.time(), 0)
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    deadline_passed = True
+                    logger.warning(
+                        f"[GitHub Star Verify] 用户 {uid} 的验证超过 {self.verification_deadline} 秒仍未完成"
+                    )
+                    self.outbound.send(
+                        bot,
+                        int(gid),
+                        self.slow_check_message.format(at_user=f"[CQ:at,qq={uid}]"),
+                    )
+                    continue
+
+                for task in done:
+                    if task.exception() is None and task.result():
+                        if task is api_task:
+                            await self.github_manager.record_stargazer(
+                                github_username, repo
+                            )
+                        return True
+            return False
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _render_join_prompt(self, repo: str, user_ids: List[str]) -> str:
+        """渲染入群提示，合并发送时同时 @ 多个新成员"""
+        return self.join_prompt.format(
+            member_name=" ".join(f"[CQ:at,qq={u}]" for u in user_ids),
+            timeout=self.verification_timeout // 60,
+            repo=repo,
+        )
 
     def _extract_github_username(self, text: str) -> str:
         """从消息中提取GitHub用户名"""
         # 移除@机器人的部分
-        text = re.sub(r"\[CQ:at,qq=\d+\]", "", text).strip()
+        text = AT_PATTERN.sub("", text).strip()
 
-        # 简单的GitHub用户名验证（字母数字下划线横线，不能以横线开头结尾）
-        pattern = r"^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$"
-
-        if re.match(pattern, text) and len(text) <= 39:  # GitHub用户名最长39字符
+        # 简单的GitHub用户名验证（字母数字横线，不能以横线开头结尾）
+        if GITHUB_USERNAME_PATTERN.match(text) and len(text) <= 39:  # GitHub用户名最长39字符
             return text
 
         return ""
@@ -378,12 +987,108 @@ class GitHubStarVerifyPlugin(Star):
 
         if uid in self.pending:
             self.pending.pop(uid, None)
+            self.join_times.pop(uid, None)
+            self.claimed_usernames.pop(uid, None)
+            VERIFICATIONS.inc(result="left")
             task = self.timeout_tasks.pop(uid, None)
             if task and not task.done():
                 task.cancel()
             logger.info(f"[GitHub Star Verify] 待验证用户 {uid} 已离开群聊，清理验证状态")
 
-    async def _timeout_kick(self, uid: str, gid: int, nickname: str, repo: str):
+    async def _handle_star_webhook(self, action: str, repo: str, login: str):
+        """处理 Webhook 投递的 Star / 取消Star 事件"""
+        if not await self._ensure_github_manager():
+            return
+        if repo not in self.github_manager.configured_repos():
+            logger.debug(f"[GitHub Star Verify] 忽略未配置仓库 {repo} 的 Webhook 事件")
+            return
+
+        if action == "unstar":
+            bound_qq = await self.github_manager.remove_stargazer(login, repo)
+            if bound_qq:
+                logger.info(
+                    f"[GitHub Star Verify] 已绑定QQ {bound_qq} 的用户 {login} 取消了 {repo} 的Star，保留绑定记录"
+                )
+            return
+
+        await self.github_manager.record_stargazer(login, repo)
+
+        # 之前验证未通过、现在Star了仓库的待验证成员自动重新验证
+        bot = None
+        for uid, username in list(self.claimed_usernames.items()):
+            # GitHub 用户名不区分大小写，以事件中的规范写法重新验证
+            if username.lower() != login.lower():
+                continue
+            gid = self.pending.get(uid)
+            group_repo = self.get_repo_for_group(gid) if gid is not None else None
+            if not group_repo or repo not in parse_repo_rule(group_repo).repos:
+                continue
+            if bot is None:
+                bot = self.context.get_platform("aiocqhttp").get_client()
+            logger.info(f"[GitHub Star Verify] 收到 {login} 的Star事件，自动验证用户 {uid}")
+            # 按群组的规则重新验证（规则可能还要求其他仓库）
+            self.verification_pool.submit(
+                (uid, gid),
+                functools.partial(self._run_verification, bot, uid, gid, group_repo, login),
+            )
+
+    async def _fetch_group_member_names(self, bot, gid: int) -> Dict[str, str]:
+        """通过一次 get_group_member_list 调用拉取整个群的成员昵称"""
+        members = await bot.api.call_action("get_group_member_list", group_id=gid)
+        names = {}
+        for member in members or []:
+            member_id = str(member.get("user_id"))
+            names[member_id] = (
+                member.get("card", "") or member.get("nickname", "") or member_id
+            )
+        now = time.monotonic()
+        # 写入时清除已过期的群，缓存只保留最近 member_cache_ttl 秒内拉取过的群
+        for key in [
+            key for key, (fetched_at, _) in self._member_cache.items()
+            if now - fetched_at >= self.member_cache_ttl
+        ]:
+            del self._member_cache[key]
+        self._member_cache[self._group_key(gid)] = (now, names)
+        return names
+
+    async def _get_bot_role(self, bot, gid: str, bot_id: str) -> str:
+        """机器人在群内的角色，缓存 bot_role_cache_ttl 秒"""
+        key = self._group_key(gid)
+        cached = self._bot_roles.get(key)
+        if cached and time.monotonic() - cached[0] < self.bot_role_cache_ttl:
+            return cached[1]
+        with TRACER.span("onebot.get_group_member_info"):
+            bot_info = await bot.api.call_action(
+                "get_group_member_info", group_id=int(gid), user_id=int(bot_id)
+            )
+        role = bot_info.get("role", "member")
+        self._bot_roles[key] = (time.monotonic(), role)
+        return role
+
+    async def _get_member_nickname(self, bot, uid: str, gid: int) -> str:
+        """获取成员昵称，同一群的并发查询合并为一次成员列表拉取并短时缓存"""
+        key = self._group_key(gid)
+        cached = self._member_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.member_cache_ttl:
+            names = cached[1]
+        else:
+            # 同一群同时只存在一个拉取任务，其余调用者等待其结果
+            task = self._member_list_tasks.get(key)
+            if task is None or task.done():
+                task = asyncio.create_task(self._fetch_group_member_names(bot, gid))
+                self._member_list_tasks[key] = task
+            try:
+                names = await asyncio.shield(task)
+            except Exception as e:
+                logger.warning(f"[GitHub Star Verify] 获取群 {gid} 成员列表失败: {e}")
+                return uid
+            finally:
+                if self._member_list_tasks.get(key) is task and task.done():
+                    self._member_list_tasks.pop(key, None)
+
+        return names.get(uid, uid)
+
+    async def _timeout_kick(self, uid: str, gid: int, repo: str):
         """超时后执行踢人操作"""
         try:
             await asyncio.sleep(self.verification_timeout)
@@ -398,31 +1103,28 @@ class GitHubStarVerifyPlugin(Star):
                 failure_msg = self.failure_message.format(
                     at_user=f"[CQ:at,qq={uid}]", countdown=self.kick_delay
                 )
-                await bot.api.call_action(
-                    "send_group_msg", group_id=gid, message=failure_msg
-                )
+                self.outbound.send(bot, gid, failure_msg)
 
                 await asyncio.sleep(self.kick_delay)
 
                 if uid not in self.pending:
                     return
 
+                # 踢出前获取昵称（踢出后成员列表中将不再包含该用户）
+                nickname = await self._get_member_nickname(bot, uid, gid)
+
                 # 踢出用户
-                await bot.api.call_action(
-                    "set_group_kick",
-                    group_id=gid,
-                    user_id=int(uid),
-                    reject_add_request=False,
-                )
+                await self.outbound.kick(bot, gid, int(uid))
+                VERIFICATIONS.inc(result="kicked")
+                if self.github_manager:
+                    await self.github_manager.record_daily(repo, METRIC_KICKS)
                 logger.info(
                     f"[GitHub Star Verify] 用户 {uid} ({nickname}) GitHub验证超时，已从群 {gid} 踢出"
                 )
 
                 # 发送踢出消息
                 kick_msg = self.kick_message.format(member_name=nickname)
-                await bot.api.call_action(
-                    "send_group_msg", group_id=gid, message=kick_msg
-                )
+                self.outbound.send(bot, gid, kick_msg)
 
             except Exception as e:
                 logger.error(f"[GitHub Star Verify] 踢出用户 {uid} 时发生错误: {e}")
@@ -431,7 +1133,9 @@ class GitHubStarVerifyPlugin(Star):
             logger.info(f"[GitHub Star Verify] 用户 {uid} 验证成功，踢出任务已取消")
         finally:
             self.pending.pop(uid, None)
+            self.join_times.pop(uid, None)
             self.timeout_tasks.pop(uid, None)
+            self.claimed_usernames.pop(uid, None)
 
     # GitHub 指令组
     @filter.command_group("github", alias={"gh"})
@@ -440,50 +1144,111 @@ class GitHubStarVerifyPlugin(Star):
 
     @filter.permission_type(filter.PermissionType.ADMIN)
     @github_commands.command("sync")
-    async def sync_command(self, event: AstrMessageEvent, repo: str = ""):
-        """同步GitHub Star用户数据"""
-        # 如果提供了 repo，则同步指定仓库
-        if repo:
-            yield event.plain_result(f"开始同步仓库 {repo} 的Star用户数据...")
-            success = await self.sync_stargazers(repo)
-            if success:
-                stars_count = await self.github_manager.get_stars_count_for_repo(repo)
-                bound_count = await self.github_manager.get_bound_count_for_repo(repo)
+    async def sync_command(self, event: AstrMessageEvent, repo: str = "", job_id: str = ""):
+        """在后台同步GitHub Star用户数据，/github sync cancel <任务编号> 取消同步"""
+        if repo == "cancel":
+            job = self.sync_jobs.cancel(job_id) if job_id else None
+            if job is None:
+                yield event.plain_result(f"未找到同步任务 {job_id or '（未指定编号）'}。")
+            elif job.cancel_requested:
                 yield event.plain_result(
-                    f"同步完成！仓库 {repo} 数据库中共有 {stars_count} 个Star用户，其中 {bound_count} 个已绑定QQ号。"
+                    f"已请求取消同步任务 #{job.id}，将在当前页完成后停止，已获取的数据会保留。"
                 )
             else:
-                yield event.plain_result(f"同步仓库 {repo} 失败，请检查日志。")
+                yield event.plain_result(f"同步任务 #{job.id} 已结束，无需取消。")
             return
 
-        # 未提供 repo，则同步所有仓库
-        yield event.plain_result("开始同步所有仓库的Star用户数据...")
-        success = await self.sync_stargazers()
-        if success:
-            # 显示所有仓库的统计
-            result_msg = "同步完成！各仓库统计：\n"
+        if not await self._ensure_github_manager():
+            yield event.plain_result("GitHub管理器未初始化。")
+            return
 
-            # 默认仓库（如果配置了）
-            if self.default_repo:
-                default_stars = await self.github_manager.get_stars_count_for_repo(
-                    self.default_repo
-                )
-                default_bound = await self.github_manager.get_bound_count_for_repo(
-                    self.default_repo
-                )
-                result_msg += f"📦 {self.default_repo}: {default_stars} Star用户，{default_bound} 已绑定\n"
+        # 未提供 repo，则同步所有仓库；规则表达式同步其中的每个仓库
+        repos = list(parse_repo_rule(repo).repos) if repo else self.github_manager.configured_repos()
+        result_msg = "已创建后台同步任务：\n"
+        for target in repos:
+            job = self.sync_jobs.start(target)
+            result_msg += f"🔄 #{job.id} {target}\n"
+        result_msg += "使用 /github jobs 查看进度，/github sync cancel <编号> 取消。"
+        yield event.plain_result(result_msg)
 
-            # 群组配置的仓库
-            unique_repos = set(self.group_repo_map.values())
-            for repo in unique_repos:
-                if repo and repo != self.default_repo:
-                    stars = await self.github_manager.get_stars_count_for_repo(repo)
-                    bound = await self.github_manager.get_bound_count_for_repo(repo)
-                    result_msg += f"📦 {repo}: {stars} Star用户，{bound} 已绑定\n"
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @github_commands.command("jobs")
+    async def jobs_command(self, event: AstrMessageEvent):
+        """查看同步任务进度"""
+        jobs = self.sync_jobs.jobs()
+        if not jobs:
+            yield event.plain_result("暂无同步任务。")
+            return
+        yield event.plain_result("同步任务：\n" + "\n".join(job.describe() for job in jobs))
 
-            yield event.plain_result(result_msg.strip())
-        else:
-            yield event.plain_result("同步失败，请检查日志。")
+    def _data_file(self, name: str) -> Optional[str]:
+        """将文件名解析到插件数据目录内；绝对路径或经 .. 跳出数据目录时返回 None"""
+        data_dir = os.path.realpath(StarTools.get_data_dir("github_star_verify"))
+        if os.path.isabs(name):
+            return None
+        path = os.path.realpath(os.path.join(data_dir, name))
+        if os.path.commonpath([data_dir, path]) != data_dir or path == data_dir:
+            return None
+        return path
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @github_commands.command("export")
+    async def export_command(self, event: AstrMessageEvent, filename: str = "", repo: str = ""):
+        """导出绑定数据为 JSONL 或 CSV（扩展名决定格式，.gz 结尾时压缩）"""
+        if not filename:
+            yield event.plain_result("格式：/github export <文件名.jsonl|.csv[.gz]> [仓库]")
+            return
+        if not await self._ensure_github_manager():
+            yield event.plain_result("GitHub管理器未初始化。")
+            return
+        path = self._data_file(filename)
+        if path is None:
+            yield event.plain_result("文件名必须是插件数据目录内的相对路径。")
+            return
+        try:
+            total, elapsed = await export_bindings(
+                self.github_manager.storage, path, repo=repo or None
+            )
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 导出绑定数据失败: {e}")
+            yield event.plain_result(f"导出失败：{e}")
+            return
+        rate = total / elapsed if elapsed > 0 else 0
+        yield event.plain_result(
+            f"已导出 {total} 行到 {path}，用时 {elapsed:.2f} 秒（{rate:.0f} 行/秒）。"
+        )
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @github_commands.command("import")
+    async def import_command(self, event: AstrMessageEvent, filename: str = ""):
+        """从 JSONL 或 CSV 导入绑定数据，已存在的记录以导入内容为准"""
+        if not filename:
+            yield event.plain_result("格式：/github import <文件名.jsonl|.csv[.gz]>")
+            return
+        if not await self._ensure_github_manager():
+            yield event.plain_result("GitHub管理器未初始化。")
+            return
+        path = self._data_file(filename)
+        if path is None:
+            yield event.plain_result("文件名必须是插件数据目录内的相对路径。")
+            return
+        if not os.path.exists(path):
+            yield event.plain_result(f"文件不存在：{path}")
+            return
+        try:
+            imported, skipped, rejected, elapsed = await import_bindings(
+                self.github_manager.storage, path
+            )
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 导入绑定数据失败: {e}")
+            yield event.plain_result(f"导入失败：{e}")
+            return
+        rate = imported / elapsed if elapsed > 0 else 0
+        yield event.plain_result(
+            f"已从 {path} 导入 {imported} 行，跳过 {skipped} 行无效数据，"
+            f"{rejected} 行因QQ号已在该仓库绑定其他GitHub用户被拒绝（详见日志），"
+            f"用时 {elapsed:.2f} 秒（{rate:.0f} 行/秒）。"
+        )
 
     @filter.permission_type(filter.PermissionType.ADMIN)
     @github_commands.command("status")
@@ -506,30 +1271,117 @@ class GitHubStarVerifyPlugin(Star):
 📦 默认仓库: {self.default_repo or "未配置"}
 🔗 群组仓库映射: {len(self.group_repo_map)} 个群组
 ⏳ 等待验证: {pending_count}
+🔍 验证队列: {self.verification_pool.in_flight()}
+📤 待发送消息: {self.outbound.pending_count()}
+🌐 GitHub连接: {self.http_stats.summary()}
+🚦 GitHub请求: {self.request_scheduler.summary()}
+🗂️ ETag缓存: 命中 {self.etag_cache.hits}，未命中 {self.etag_cache.misses}
 🎯 当前群组仓库: {current_repo}
+🔥 启动预热: {self._describe_warmup() or "未执行"}
 
 仓库统计:"""
 
-        # 默认仓库统计（如果配置了）
-        if self.default_repo:
-            default_stars = await self.github_manager.get_stars_count_for_repo(
-                self.default_repo
-            )
-            default_bound = await self.github_manager.get_bound_count_for_repo(
-                self.default_repo
-            )
-            status_msg += f"\n📊 {self.default_repo}: {default_stars} Star用户，{default_bound} 已绑定"
-
-        # 群组配置的仓库统计
-        unique_repos = set(self.group_repo_map.values())
-        for repo in unique_repos:
-            if repo and repo != self.default_repo:
-                stars = await self.github_manager.get_stars_count_for_repo(repo)
-                bound = await self.github_manager.get_bound_count_for_repo(repo)
-                status_msg += f"\n📊 {repo}: {stars} Star用户，{bound} 已绑定"
+        # 默认仓库与群组配置（含规则）中各仓库的统计
+        for repo in self.github_manager.configured_repos():
+            stars = await self.github_manager.get_stars_count_for_repo(repo)
+            bound = await self.github_manager.get_bound_count_for_repo(repo)
+            status_msg += f"\n📊 {repo}: {stars} Star用户，{bound} 已绑定"
 
         yield event.plain_result(status_msg)
 
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @github_commands.command("metrics")
+    async def metrics_command(self, event: AstrMessageEvent):
+        """查看性能指标"""
+        msg = "GitHub Star验证插件指标：\n"
+
+        remaining = GITHUB_RATELIMIT_REMAINING.get()
+        msg += f"🔑 API剩余配额: {int(remaining) if remaining is not None else '未知'}\n"
+        msg += (
+            f"⏳ 等待验证: {len(self.pending)}，验证队列: {self.verification_pool.in_flight()}，"
+            f"待发送消息: {self.outbound.pending_count()}\n"
+        )
+
+        msg += "\n🌐 GitHub请求:"
+        for (endpoint, status), count in sorted(GITHUB_REQUESTS.values.items()):
+            p95 = GITHUB_REQUEST_SECONDS.quantile(0.95, endpoint=endpoint, status=status)
+            msg += f"\n  {endpoint} [{status}]: {int(count)} 次，p95≤{p95}s"
+
+        msg += "\n\n💾 数据库查询:"
+        for (method,), state in sorted(DB_QUERY_SECONDS.values.items()):
+            avg_ms = state[-2] / state[-1] * 1000 if state[-1] else 0
+            msg += f"\n  {method}: {int(state[-1])} 次，平均 {avg_ms:.1f}ms"
+
+        msg += "\n\n✅ 验证结果:"
+        for (result,), count in sorted(VERIFICATIONS.values.items()):
+            msg += f"\n  {result}: {int(count)}"
+        for (repo,) in sorted(VERIFICATION_SECONDS.values):
+            p50 = VERIFICATION_SECONDS.quantile(0.5, repo=repo)
+            p95 = VERIFICATION_SECONDS.quantile(0.95, repo=repo)
+            msg += f"\n  {repo} 入群到绑定: p50≤{p50}s，p95≤{p95}s"
+
+        if SYNC_SECONDS.values:
+            msg += "\n\n🔄 同步:"
+            for (repo,), state in sorted(SYNC_SECONDS.values.items()):
+                pages_per_second = SYNC_PAGES_PER_SECOND.get(repo=repo) or 0
+                msg += (
+                    f"\n  {repo}: {int(state[-1])} 次，总耗时 {state[-2]:.1f}s，"
+                    f"最近 {pages_per_second:.2f} 页/秒"
+                )
+
+        yield event.plain_result(msg.strip())
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @github_commands.command("stats")
+    async def stats_command(self, event: AstrMessageEvent, repo: str = "", days: str = ""):
+        """查看仓库最近几天的新增Star、取消Star、绑定与踢出趋势"""
+        if repo.isdigit() and not days:
+            repo, days = "", repo
+        if days and not days.isdigit():
+            yield event.plain_result(f"格式：/github stats [仓库] [天数(1-{STATS_MAX_DAYS})]")
+            return
+        days_count = min(max(int(days or STATS_DEFAULT_DAYS), 1), STATS_MAX_DAYS)
+        if not await self._ensure_github_manager():
+            yield event.plain_result("GitHub管理器未初始化。")
+            return
+
+        if not repo:
+            group_id = event.get_group_id()
+            repo = self.get_repo_for_group(group_id) if group_id else self.default_repo
+        if not repo:
+            yield event.plain_result("当前群组未配置仓库，请指定仓库：/github stats <仓库> [天数]")
+            return
+
+        # 规则按其中的仓库分别统计
+        sections = []
+        for member in parse_repo_rule(repo).repos:
+            rows = await self.github_manager.get_daily_stats(member, days_count)
+            if not rows:
+                sections.append(f"📊 {member}: 查询统计失败")
+                continue
+            totals = {
+                metric: sum(counts[metric] for _, counts in rows)
+                for metric in METRICS
+            }
+            net = totals[METRIC_STARS] - totals[METRIC_UNSTARS]
+            lines = [
+                f"📊 {member}（最近 {days_count} 天）",
+                f"新Star {totals[METRIC_STARS]}，取消 {totals[METRIC_UNSTARS]}，"
+                f"净增 {net:+d}，绑定 {totals[METRIC_BINDS]}，踢出 {totals[METRIC_KICKS]}",
+                f"新Star趋势: {sparkline([counts[METRIC_STARS] for _, counts in rows])}",
+                "日期        新Star 取消 绑定 踢出",
+            ]
+            if len(rows) > STATS_TABLE_DAYS:
+                lines.append(f"（仅列出最近 {STATS_TABLE_DAYS} 天）")
+            for day, counts in rows[-STATS_TABLE_DAYS:]:
+                lines.append(
+                    f"{day} {counts[METRIC_STARS]:>6} {counts[METRIC_UNSTARS]:>4} "
+                    f"{counts[METRIC_BINDS]:>4} {counts[METRIC_KICKS]:>4}"
+                )
+            sections.append("\n".join(lines))
+
+        yield event.plain_result("\n\n".join(sections))
+
     @github_commands.command("bind", alias={"绑定"})
     async def bind_github_command(self, event: AstrMessageEvent, github_username: str):
         """绑定GitHub ID"""
@@ -579,11 +1431,11 @@ class GitHubStarVerifyPlugin(Star):
             )
             return
 
-        # 检查GitHub用户名是否已被其他人在该仓库绑定
-        is_bound = await self.github_manager.is_github_id_bound_to_repo(
+        # 检查GitHub用户名是否已被其他人在该仓库绑定（规则中已由本人绑定的仓库不算）
+        bound_qq = await self.github_manager.is_github_id_bound_to_repo(
             github_username, repo
         )
-        if is_bound:
+        if bound_qq and str(bound_qq) != uid:
             yield event.plain_result(
                 f"GitHub用户 {github_username} 已被其他QQ号在仓库 {repo} 绑定。"
             )
@@ -698,8 +1550,14 @@ class GitHubStarVerifyPlugin(Star):
 /github [help|帮助] - 显示帮助信息
 
 管理员命令：
-/github sync [仓库] - 同步GitHub Star用户数据
+/github sync [仓库] - 在后台同步GitHub Star用户数据
+/github sync cancel <编号> - 取消同步任务
+/github jobs - 查看同步任务进度
+/github export <文件> [仓库] - 导出绑定数据（JSONL/CSV）
+/github import <文件> - 导入绑定数据
 /github status - 查看插件状态
+/github metrics - 查看性能指标
+/github stats [仓库] [天数] - 查看每日新增Star、取消、绑定与踢出趋势
 
 注意：
 - 只能绑定已经Star过对应仓库的GitHub用户
@@ -709,10 +1567,108 @@ class GitHubStarVerifyPlugin(Star):
 
         yield event.plain_result(help_msg)
 
+    async def initialize(self):
+        """插件加载后由 AstrBot 调用：在后台预热，不阻塞加载"""
+        if self.warmup_on_load and self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self):
+        """依次初始化存储与客户端、预热查询缓存与机器人角色，可选启动同步，记录各阶段耗时"""
+        start = phase_start = time.perf_counter()
+
+        def finish_phase(name: str):
+            nonlocal phase_start
+            now = time.perf_counter()
+            self.warmup_timings[name] = now - phase_start
+            phase_start = now
+
+        try:
+            if not await self._ensure_github_manager():
+                return
+            finish_phase("storage")
+            snapshot_users = await self.github_manager.warm_up()
+            finish_phase("caches")
+            groups = await self._prime_bot_roles()
+            finish_phase("bot_roles")
+            jobs = []
+            if self.warmup_sync:
+                # 每次启动都会执行，只刷新记录与快照，不删除取消Star的用户、不复核绑定
+                jobs = [
+                    self.sync_jobs.start(repo, reconcile=False)
+                    for repo in self.github_manager.configured_repos()
+                ]
+            finish_phase("sync")
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 预热失败: {e}")
+            return
+
+        logger.info(
+            f"[GitHub Star Verify] 预热完成，用时 {(time.perf_counter() - start) * 1000:.0f}ms"
+            f"（{self._describe_warmup()}）：快照 {snapshot_users} 个用户，"
+            f"缓存 {groups} 个群的机器人角色，启动 {len(jobs)} 个同步任务"
+        )
+
+    def _describe_warmup(self) -> str:
+        return "，".join(
+            f"{WARMUP_PHASES[name]} {seconds * 1000:.0f}ms"
+            for name, seconds in self.warmup_timings.items()
+        )
+
+    async def _prime_bot_roles(self) -> int:
+        """查询机器人在相关群组中的角色，返回已缓存的群数"""
+        try:
+            bot = self.context.get_platform("aiocqhttp").get_client()
+            login_info = await bot.api.call_action("get_login_info")
+            bot_id = str(login_info.get("user_id"))
+            groups = set(self.group_repo_map)
+            if self.default_repo:
+                # 默认仓库适用于所有未单独配置的群
+                group_list = await bot.api.call_action("get_group_list")
+                groups.update(str(group.get("group_id")) for group in group_list or [])
+        except Exception as e:
+            logger.info(f"[GitHub Star Verify] 机器人尚未就绪，跳过角色预热: {e}")
+            return 0
+
+        primed = 0
+        for gid in groups:
+            try:
+                await self._get_bot_role(bot, gid, bot_id)
+                primed += 1
+            except Exception as e:
+                logger.debug(f"[GitHub Star Verify] 获取机器人在群 {gid} 的角色失败: {e}")
+        return primed
+
     async def __aenter__(self):
         await self._ensure_github_manager()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.terminate()
+
+    async def terminate(self):
+        """插件停用或重载时由 AstrBot 调用：关闭监听端口，停止后台任务，释放连接与缓存"""
+        TRACER.flush()
+        RECORDER.flush()
+        # 先停止接收 Webhook 与指标请求，避免关闭过程中产生新任务
+        await self.webhook_server.close()
+        await self.metrics_exporter.close()
+
+        tasks = [self._warmup_task, *self.timeout_tasks.values(), *self._member_list_tasks.values()]
+        tasks = [task for task in tasks if task and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._warmup_task = None
+        self.timeout_tasks.clear()
+        self._member_list_tasks.clear()
+
+        await self.sync_jobs.close()
+        await self.verification_pool.close()
+        await self.outbound.close()
+        await self.etag_cache.close()
+        self._member_cache.clear()
+        self._bot_roles.clear()
         if self.github_manager:
-            await self.github_manager.close()
+            manager, self.github_manager = self.github_manager, None
+            await manager.close()
+        logger.info("[GitHub Star Verify] 插件已停止")
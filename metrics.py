@@ -0,0 +1,415 @@
+import asyncio
+import bisect
+import functools
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from astrbot.api import logger
+from .tracing import TRACER
+
+# 默认延迟直方图分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._render_samples())
+        return lines
+
+    @abstractmethod
+    def _render_samples(self) -> List[str]:
+        """指标的样本行（不含 HELP 与 TYPE）"""
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def _render_samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in sorted(self.values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """可增可减的瞬时值，也可由回调函数在导出时计算"""
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        func: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+        self.func = func
+
+    def set(self, value: float, **labels):
+        self.values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> Optional[float]:
+        if self.func is not None:
+            return float(self.func())
+        return self.values.get(self._key(labels))
+
+    def _render_samples(self) -> List[str]:
+        if self.func is not None:
+            try:
+                return [f"{self.name} {_format_value(self.func())}"]
+            except Exception as e:
+                logger.debug(f"[GitHub Star Verify] 指标 {self.name} 计算失败: {e}")
+                return []
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in sorted(self.values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """累积分桶直方图"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [各分桶计数..., 总和, 总数]
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            state[index] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """用作上下文管理器记录代码块耗时"""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        state = self.values.get(self._key(labels))
+        return int(state[-1]) if state else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """根据分桶估算分位数（取所在分桶的上界）"""
+        state = self.values.get(self._key(labels))
+        if not state or not state[-1]:
+            return None
+        target = q * state[-1]
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, state):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    def _render_samples(self) -> List[str]:
+        lines = []
+        for key, state in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            le = 'le="+Inf"'
+            lines.append(
+                f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {int(state[-1])}"
+            )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {int(state[-1])}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """指标注册表，按注册顺序导出为 Prometheus 文本格式"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        func: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        gauge = self._register(Gauge(name, documentation, labelnames))
+        if func is not None:
+            # 插件重载时以新的回调覆盖旧实例的回调
+            gauge.func = func
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 全局指标注册表
+REGISTRY = MetricsRegistry()
+
+GITHUB_REQUESTS = REGISTRY.counter(
+    "github_star_verify_github_requests_total",
+    "GitHub API requests by endpoint and status",
+    ("endpoint", "status"),
+)
+GITHUB_REQUEST_SECONDS = REGISTRY.histogram(
+    "github_star_verify_github_request_seconds",
+    "GitHub API request latency by endpoint and status",
+    ("endpoint", "status"),
+)
+GITHUB_QUEUE_SECONDS = REGISTRY.histogram(
+    "github_star_verify_github_queue_seconds",
+    "Time GitHub API requests waited for a scheduler slot by lane",
+    ("lane",),
+)
+GITHUB_RATELIMIT_REMAINING = REGISTRY.gauge(
+    "github_star_verify_github_ratelimit_remaining",
+    "Remaining GitHub API rate-limit budget from the latest response",
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "github_star_verify_db_query_seconds",
+    "Database query latency by method",
+    ("method",),
+)
+VERIFICATION_SECONDS = REGISTRY.histogram(
+    "github_star_verify_verification_seconds",
+    "Time from member join to successful bind",
+    ("repo",),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+VERIFICATIONS = REGISTRY.counter(
+    "github_star_verify_verifications_total",
+    "Verification outcomes",
+    ("result",),
+)
+SYNC_SECONDS = REGISTRY.histogram(
+    "github_star_verify_sync_seconds",
+    "Stargazer sync duration by repo",
+    ("repo",),
+    buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0),
+)
+SYNC_PAGES_PER_SECOND = REGISTRY.gauge(
+    "github_star_verify_sync_pages_per_second",
+    "Stargazer pages fetched per second during the latest sync",
+    ("repo",),
+)
+
+
+def observe_db(func):
+    """装饰数据库方法，按方法名记录查询耗时并创建追踪 span"""
+    method = func.__name__
+    span_name = f"db.{method}"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with TRACER.span(span_name):
+                return await func(*args, **kwargs)
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - start, method=method)
+
+    return wrapper
+
+
+class MetricsExporter:
+    """可选的指标导出：定期写入 Prometheus 文本文件，或在本地 HTTP 端口提供 /metrics"""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        textfile: str = "",
+        http_host: str = "127.0.0.1",
+        http_port: int = 0,
+        interval: float = 15.0,
+    ):
+        self.registry = registry
+        self.textfile = textfile
+        self.http_host = http_host
+        self.http_port = http_port
+        self.interval = max(interval, 1.0)
+        self._textfile_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        if self.textfile and self._textfile_task is None:
+            self._textfile_task = asyncio.create_task(self._write_textfile_loop())
+            logger.info(f"[GitHub Star Verify] 指标将定期写入文件: {self.textfile}")
+
+        if self.http_port and self._server is None:
+            try:
+                self._server = await asyncio.start_server(
+                    self._handle_http, self.http_host, self.http_port
+                )
+                logger.info(
+                    f"[GitHub Star Verify] 指标HTTP导出已启动: http://{self.http_host}:{self.http_port}/metrics"
+                )
+            except OSError as e:
+                logger.error(f"[GitHub Star Verify] 启动指标HTTP导出失败: {e}")
+
+    def write_textfile(self):
+        """原子写入文本文件，避免采集端读到不完整内容"""
+        directory = os.path.dirname(self.textfile)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.textfile}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.registry.render_prometheus())
+        os.replace(tmp_path, self.textfile)
+
+    async def _write_textfile_loop(self):
+        while True:
+            try:
+                self.write_textfile()
+            except Exception as e:
+                logger.warning(f"[GitHub Star Verify] 写入指标文件失败: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # 读完请求头
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if not line or line in (b"\r\n", b"\n"):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            if path.split("?", 1)[0] in ("/", "/metrics"):
+                status = "200 OK"
+                body = self.registry.render_prometheus().encode("utf-8")
+            else:
+                status = "404 Not Found"
+                body = b"not found\n"
+
+            writer.write(
+                (
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"[GitHub Star Verify] 指标HTTP请求处理失败: {e}")
+        finally:
+            writer.close()
+
+    async def close(self):
+        if self._textfile_task:
+            self._textfile_task.cancel()
+            await asyncio.gather(self._textfile_task, return_exceptions=True)
+            self._textfile_task = None
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
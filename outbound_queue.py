@@ -0,0 +1,247 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+from astrbot.api import logger
+from .tracing import TRACER
+
+
+class TokenBucket:
+    """令牌桶限速器"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = max(rate, 0.01)
+        self.capacity = max(capacity, 1)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def is_full(self) -> bool:
+        """令牌是否已回满，回满的桶与新建的桶等价"""
+        self._refill()
+        return self.tokens >= self.capacity
+
+    async def acquire(self):
+        """获取一个令牌，令牌不足时等待"""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _OutboundItem:
+    """待发送的群消息"""
+
+    __slots__ = ("bot", "message", "merge_key", "user_id", "render", "future", "trace")
+
+    def __init__(
+        self,
+        bot,
+        message: str = "",
+        merge_key: Optional[str] = None,
+        user_id: Optional[str] = None,
+        render: Optional[Callable[[List[str]], str]] = None,
+    ):
+        self.bot = bot
+        self.message = message
+        self.merge_key = merge_key
+        self.user_id = user_id
+        self.render = render
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # 入队时所在的追踪上下文，发送时据此记录 span
+        self.trace = TRACER.current_context()
+
+
+class OutboundMessageQueue:
+    """按群组限速的 OneBot 出站消息队列
+
+    - 每个群一个发送队列和令牌桶，避免触发QQ风控导致消息被吞或机器人被禁言
+    - 同一群内等待发送的可合并消息（如入群提示）会合并为一条 @多人 的消息
+    - 踢人操作并发执行，并发数受限
+    - 发送失败时按指数退避重试
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 5,
+        kick_concurrency: int = 3,
+        max_retries: int = 3,
+        merge_limit: int = 10,
+        retry_backoff: float = 1.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max(max_retries, 1)
+        self.merge_limit = max(merge_limit, 1)
+        self.retry_backoff = retry_backoff
+        self._kick_semaphore = asyncio.Semaphore(max(kick_concurrency, 1))
+        self._queues: Dict[int, Deque[_OutboundItem]] = {}
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        # 令牌回满所需时间，同时作为清理空闲令牌桶的最小间隔
+        self._refill_period = self.burst / max(self.rate, 0.01)
+        self._buckets_swept_at = time.monotonic()
+
+    def send(self, bot, group_id: int, message: str) -> asyncio.Future:
+        """将群消息加入发送队列，返回可选等待的 Future"""
+        return self._enqueue(group_id, _OutboundItem(bot, message=message))
+
+    def send_merged(
+        self,
+        bot,
+        group_id: int,
+        merge_key: str,
+        user_id: str,
+        render: Callable[[List[str]], str],
+    ) -> asyncio.Future:
+        """加入可合并的群消息，发送时同一 merge_key 的等待项合并为一条消息
+
+        render 接收被合并的用户ID列表，返回最终消息文本。
+        """
+        item = _OutboundItem(bot, merge_key=merge_key, user_id=user_id, render=render)
+        return self._enqueue(group_id, item)
+
+    async def kick(self, bot, group_id: int, user_id: int, reject_add_request: bool = False):
+        """踢出群成员，受并发数限制并在失败时重试"""
+        async with self._kick_semaphore, TRACER.span("onebot.set_group_kick"):
+            await self._call_with_retry(
+                bot,
+                "set_group_kick",
+                group_id=group_id,
+                user_id=user_id,
+                reject_add_request=reject_add_request,
+            )
+
+    def pending_count(self, group_id: Optional[int] = None) -> int:
+        """获取等待发送的消息数量"""
+        if group_id is not None:
+            return len(self._queues.get(group_id, ()))
+        return sum(len(q) for q in self._queues.values())
+
+    def _enqueue(self, group_id: int, item: _OutboundItem) -> asyncio.Future:
+        queue = self._queues.setdefault(group_id, deque())
+        queue.append(item)
+
+        worker = self._workers.get(group_id)
+        if worker is None or worker.done():
+            self._evict_idle_buckets()
+            self._workers[group_id] = asyncio.create_task(self._worker(group_id))
+        return item.future
+
+    def _evict_idle_buckets(self):
+        """清理已无待发消息且令牌回满的群令牌桶
+
+        回满的令牌桶不再携带限速状态，下次发送时重新创建即可，
+        避免机器人所在群较多时令牌桶只增不减。
+        """
+        now = time.monotonic()
+        if now - self._buckets_swept_at < self._refill_period:
+            return
+        self._buckets_swept_at = now
+        for group_id in [
+            gid
+            for gid, bucket in self._buckets.items()
+            if gid not in self._queues and bucket.is_full()
+        ]:
+            del self._buckets[group_id]
+
+    def _take_batch(self, queue: Deque[_OutboundItem]) -> List[_OutboundItem]:
+        """取出队首消息，若可合并则一并取出队列中同 merge_key 的等待项"""
+        head = queue.popleft()
+        if head.merge_key is None:
+            return [head]
+
+        batch = [head]
+        rest: Deque[_OutboundItem] = deque()
+        while queue:
+            item = queue.popleft()
+            if item.merge_key == head.merge_key and len(batch) < self.merge_limit:
+                batch.append(item)
+            else:
+                rest.append(item)
+        queue.extend(rest)
+        return batch
+
+    async def _worker(self, group_id: int):
+        """单群发送协程，队列清空后退出"""
+        queue = self._queues[group_id]
+        bucket = self._buckets.setdefault(group_id, TokenBucket(self.rate, self.burst))
+
+        try:
+            while queue:
+                # 先等待令牌再取出消息，等待期间到达的同类消息可被合并
+                await bucket.acquire()
+                if not queue:
+                    break
+                batch = self._take_batch(queue)
+                head = batch[0]
+
+                if head.render is not None:
+                    message = head.render([item.user_id for item in batch])
+                    if len(batch) > 1:
+                        logger.info(
+                            f"[GitHub Star Verify] 群 {group_id} 合并发送 {len(batch)} 条入群提示"
+                        )
+                else:
+                    message = head.message
+
+                try:
+                    with TRACER.root_span(
+                        "onebot.send_group_msg",
+                        parent=head.trace,
+                        group_id=group_id,
+                        batch=len(batch),
+                    ):
+                        result = await self._call_with_retry(
+                            head.bot, "send_group_msg", group_id=group_id, message=message
+                        )
+                except Exception as e:
+                    logger.error(f"[GitHub Star Verify] 群 {group_id} 消息发送失败: {e}")
+                    for item in batch:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                            # 发送方可能不等待结果，避免未取回异常的警告
+                            item.future.exception()
+                    continue
+
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_result(result)
+        finally:
+            if self._workers.get(group_id) is asyncio.current_task():
+                self._workers.pop(group_id, None)
+            if not queue:
+                self._queues.pop(group_id, None)
+
+    async def _call_with_retry(self, bot, action: str, **params) -> Any:
+        """调用 OneBot 接口，失败时按指数退避重试"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return await bot.api.call_action(action, **params)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                logger.warning(
+                    f"[GitHub Star Verify] 调用 {action} 失败（第 {attempt} 次）: {e}，{delay:.1f} 秒后重试"
+                )
+                await asyncio.sleep(delay)
+
+    async def close(self):
+        """取消所有发送协程"""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
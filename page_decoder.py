@@ -0,0 +1,106 @@
+import json
+import re
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+try:
+    import orjson
+
+    def loads(content: bytes) -> Any:
+        return orjson.loads(content)
+
+except ImportError:  # 未安装 orjson 时使用标准库
+
+    def loads(content: bytes) -> Any:
+        return json.loads(content)
+
+
+# GitHub 用户名只包含字母、数字与连字符，不会出现需要转义的字符；
+# 字符串值中的 "login" 会被转义为 \"login\"，因此不会被误匹配
+_LOGIN_RE = re.compile(rb'"login"\s*:\s*"([^"\\]+)"')
+# 仓库全名只包含字母、数字、"."、"_"、"-" 与一个 "/"
+_FULL_NAME_RE = re.compile(rb'"full_name"\s*:\s*"([^"\\]+)"')
+_STARRED_AT_RE = re.compile(rb'"starred_at"\s*:\s*"([^"\\]+)"')
+
+
+def _is_empty_list(content: bytes) -> bool:
+    return content.strip() == b"[]"
+
+
+def _is_closed_list(content: bytes) -> bool:
+    """快速路径只用于首尾完整的列表；被截断的响应交给完整解析（会抛出异常）"""
+    content = content.strip()
+    return content[:1] == b"[" and content[-1:] == b"]"
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """将 GitHub 的 ISO 8601 时间（如 2024-01-01T00:00:00Z）转换为时间戳"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_stargazers(content: bytes) -> Tuple[List[str], List[Optional[float]]]:
+    """从 stargazers 页面的原始字节中只提取 login 与 Star 时间，不构造完整的用户对象
+
+    star+json 格式中每个条目恰好一个 starred_at 与一个 login，两者按顺序对应；
+    普通格式（simple-user 列表）没有 starred_at，时间记为 None。
+    """
+    if _is_empty_list(content):
+        return [], []
+    logins = []
+    if _is_closed_list(content):
+        logins = [m.decode("ascii") for m in _LOGIN_RE.findall(content)]
+    if logins:
+        times = _STARRED_AT_RE.findall(content)
+        if not times:
+            return logins, [None] * len(logins)
+        if len(times) == len(logins):
+            return logins, [parse_timestamp(t.decode("ascii")) for t in times]
+    # 格式不符合预期时回退为完整解析
+    logins, starred_at = [], []
+    for item in loads(content):
+        if not item:
+            continue
+        user = (item.get("user") or {}) if "starred_at" in item else item
+        if user and user.get("login"):
+            logins.append(user["login"])
+            starred_at.append(parse_timestamp(item.get("starred_at")))
+    return logins, starred_at
+
+
+def find_starred_repo(content: bytes, full_name: str) -> Tuple[int, bool, Optional[str]]:
+    """在 starred 页面（star+json 格式）中查找目标仓库
+
+    返回 (条目数, 是否找到, starred_at)。目标仓库名未出现在原始字节中时
+    不解析 JSON，只统计条目数。
+    """
+    if _is_empty_list(content):
+        return 0, False, None
+
+    name = full_name.split("/", 1)[-1].encode("utf-8")
+    if name not in content and _is_closed_list(content):
+        count = content.count(b'"starred_at"')
+        if count:
+            return count, False, None
+
+    data = loads(content)
+    for item in data:
+        if (item.get("repo") or {}).get("full_name") == full_name:
+            return len(data), True, item.get("starred_at")
+    return len(data), False, None
+
+
+def starred_full_names(content: bytes) -> List[str]:
+    """提取 starred 页面中所有仓库的全名，用于缓存页面摘要"""
+    if _is_empty_list(content):
+        return []
+    names = []
+    if _is_closed_list(content):
+        names = [m.decode("utf-8") for m in _FULL_NAME_RE.findall(content)]
+    if names:
+        return names
+    return [(item.get("repo") or {}).get("full_name", "") for item in loads(content)]
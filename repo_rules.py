@@ -0,0 +1,45 @@
+import functools
+import re
+from typing import Iterable, NamedTuple, Tuple
+
+# any：Star 其中任一仓库即可；all：需要 Star 全部仓库
+RULE_ANY = "any"
+RULE_ALL = "all"
+
+_RULE_RE = re.compile(r"^\s*(any|all)\s*\((.*)\)\s*$", re.IGNORECASE)
+
+
+class RepoRule(NamedTuple):
+    """群组的验证规则，由 group_repo_map 中的仓库或规则表达式解析而来"""
+
+    mode: str
+    repos: Tuple[str, ...]
+
+    @property
+    def is_compound(self) -> bool:
+        """是否涉及多个仓库（单个仓库按原有方式处理）"""
+        return len(self.repos) > 1
+
+    def __str__(self) -> str:
+        if not self.is_compound:
+            return self.repos[0] if self.repos else ""
+        return f"{self.mode}({', '.join(self.repos)})"
+
+    def satisfied(self, matched: Iterable[str]) -> bool:
+        """matched 为已确认 Star（或已绑定）的仓库"""
+        matched = set(matched)
+        if self.mode == RULE_ALL:
+            return all(repo in matched for repo in self.repos)
+        return any(repo in matched for repo in self.repos)
+
+
+@functools.lru_cache(maxsize=256)
+def parse_repo_rule(text: str) -> RepoRule:
+    """解析 owner/repo、any(owner/a, owner/b) 或 all(owner/a, owner/b)"""
+    match = _RULE_RE.match(text or "")
+    if not match:
+        text = (text or "").strip()
+        return RepoRule(RULE_ANY, (text,) if text else ())
+    # 保持书写顺序并去重
+    repos = tuple(dict.fromkeys(r.strip() for r in match.group(2).split(",") if r.strip()))
+    return RepoRule(match.group(1).lower(), repos)
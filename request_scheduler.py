@@ -0,0 +1,135 @@
+import asyncio
+import contextlib
+import time
+from typing import Optional
+from astrbot.api import logger
+from .metrics import GITHUB_QUEUE_SECONDS
+
+# 交互通道：等待中成员的Star检查；批量通道：同步时的 stargazers 翻页
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+
+
+class RequestScheduler:
+    """GitHub 请求的优先级调度
+
+    所有请求共享 max_concurrency 个并发名额。交互请求只要有空闲名额即可发出；
+    批量请求还需满足：没有交互请求在排队、批量并发未达 bulk_concurrency、
+    距上次批量请求已过 bulk_interval 秒，且剩余配额不低于 reserve（低于时等待配额重置，
+    把剩余配额留给交互请求）。
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        bulk_concurrency: int = 1,
+        bulk_interval: float = 0.0,
+        reserve: int = 500,
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.bulk_concurrency = max(min(bulk_concurrency, self.max_concurrency), 1)
+        self.bulk_interval = bulk_interval
+        self.reserve = reserve
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self._cond: Optional[asyncio.Condition] = None
+        self._in_flight = 0
+        self._bulk_in_flight = 0
+        self._interactive_waiting = 0
+        self._bulk_waiting = 0
+        self._next_bulk_at = 0.0
+        self._budget_paused = False
+
+    def _condition(self) -> asyncio.Condition:
+        # 延迟创建，确保绑定到运行中的事件循环
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def update_rate_limit(self, remaining: Optional[str], reset: Optional[str]):
+        """根据响应头更新剩余配额与重置时间"""
+        if remaining is not None and remaining.isdigit():
+            self.remaining = int(remaining)
+        if reset is not None and reset.isdigit():
+            self.reset_at = float(reset)
+
+    def _bulk_delay(self) -> float:
+        """批量请求还需等待的秒数"""
+        now = time.time()
+        if (
+            self.remaining is not None
+            and self.remaining < self.reserve
+            and self.reset_at is not None
+            and self.reset_at > now
+        ):
+            if not self._budget_paused:
+                self._budget_paused = True
+                logger.warning(
+                    f"[GitHub Star Verify] API剩余配额 {self.remaining} 低于保留值 {self.reserve}，"
+                    f"同步请求暂停至配额重置（约 {self.reset_at - now:.0f} 秒）"
+                )
+            # 定期重新检查，交互请求的响应可能已带来新的配额信息
+            return min(self.reset_at - now, 30.0)
+        self._budget_paused = False
+        return max(self._next_bulk_at - time.monotonic(), 0.0)
+
+    def _bulk_ready(self) -> bool:
+        return (
+            self._interactive_waiting == 0
+            and self._in_flight < self.max_concurrency
+            and self._bulk_in_flight < self.bulk_concurrency
+        )
+
+    async def _acquire(self, lane: str):
+        cond = self._condition()
+        async with cond:
+            if lane == LANE_BULK:
+                self._bulk_waiting += 1
+                try:
+                    while True:
+                        delay = self._bulk_delay()
+                        if delay <= 0 and self._bulk_ready():
+                            break
+                        try:
+                            await asyncio.wait_for(cond.wait(), timeout=delay or None)
+                        except asyncio.TimeoutError:
+                            pass
+                finally:
+                    self._bulk_waiting -= 1
+                self._bulk_in_flight += 1
+                if self.bulk_interval:
+                    self._next_bulk_at = time.monotonic() + self.bulk_interval
+            else:
+                self._interactive_waiting += 1
+                try:
+                    await cond.wait_for(lambda: self._in_flight < self.max_concurrency)
+                finally:
+                    self._interactive_waiting -= 1
+                    # 交互排队数变化后唤醒等待中的批量请求重新判断
+                    cond.notify_all()
+            self._in_flight += 1
+
+    async def _release(self, lane: str):
+        cond = self._condition()
+        async with cond:
+            self._in_flight -= 1
+            if lane == LANE_BULK:
+                self._bulk_in_flight -= 1
+            cond.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, lane: str = LANE_INTERACTIVE):
+        """占用一个请求名额，记录排队耗时"""
+        start = time.perf_counter()
+        await self._acquire(lane)
+        GITHUB_QUEUE_SECONDS.observe(time.perf_counter() - start, lane=lane)
+        try:
+            yield
+        finally:
+            await self._release(lane)
+
+    def summary(self) -> str:
+        return (
+            f"进行中 {self._in_flight}（同步 {self._bulk_in_flight}），"
+            f"排队 交互 {self._interactive_waiting} / 同步 {self._bulk_waiting}"
+        )
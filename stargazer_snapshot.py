@@ -0,0 +1,145 @@
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Iterable, Optional, Set
+from astrbot.api import logger
+
+# 文件格式：魔数 | 条目数 n (uint32) | n+1 个偏移量 (uint32) | 按字节序排列的小写用户名
+MAGIC = b"GSS1"
+_HEADER = struct.Struct("<4sI")
+_OFFSET = struct.Struct("<I")
+
+
+def snapshot_path(directory: str, repo: str) -> str:
+    return os.path.join(directory, "snapshots", repo.replace("/", "__") + ".idx")
+
+
+def write_snapshot(path: str, logins: Iterable[str]) -> int:
+    """写入排序后的用户名快照（先写临时文件再替换），返回条目数
+
+    logins 无需预先排序或去重。
+    """
+    names = sorted({login.lower().encode("utf-8") for login in logins if login})
+    offsets = array("I", [0])
+    data = bytearray()
+    for name in names:
+        data += name
+        offsets.append(len(data))
+    if offsets.itemsize != _OFFSET.size or len(data) >= 2**32:
+        raise ValueError("快照过大或平台不支持")
+    if sys.byteorder == "big":
+        offsets.byteswap()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(names)))
+        f.write(offsets.tobytes())
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(names)
+
+
+class StargazerSnapshot:
+    """以 mmap 打开的只读用户名快照，二分查找判断是否为Star用户
+
+    加载只需打开文件，不读取内容；多个进程映射同一文件时共享页缓存。
+    文件被替换（其他实例完成同步）后在 recheck_interval 秒内重新映射。
+    快照只用于确认命中，未命中时调用方仍需查询数据库。
+    """
+
+    recheck_interval = 1.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.hits = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._identity = None
+        self._checked_at = 0.0
+        # 本进程在快照生成后收到的取消Star，重新加载快照时清空
+        self._removed: Set[str] = set()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.recheck_interval:
+            return
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._unmap()
+            return
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity == self._identity:
+            return
+        self._unmap()
+        mm = None
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                raise ValueError("文件格式不正确")
+        except (OSError, ValueError, struct.error) as e:
+            if mm is not None:
+                mm.close()
+            logger.warning(f"[GitHub Star Verify] 加载Star用户快照 {self.path} 失败: {e}")
+            self._identity = identity
+            return
+        self._mm, self.count, self._identity = mm, count, identity
+        self._removed.clear()
+        logger.debug(f"[GitHub Star Verify] 已映射Star用户快照 {self.path}，共 {count} 个用户")
+
+    def load(self) -> int:
+        """映射快照（如有），返回条目数"""
+        self._refresh()
+        return self.count
+
+    def contains(self, login: str) -> bool:
+        self._refresh()
+        mm = self._mm
+        if mm is None:
+            return False
+        key = login.lower()
+        if key in self._removed:
+            return False
+        key_bytes = key.encode("utf-8")
+        offsets_at = _HEADER.size
+        data_at = offsets_at + (self.count + 1) * _OFFSET.size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = struct.unpack_from("<II", mm, offsets_at + mid * _OFFSET.size)
+            value = mm[data_at + start:data_at + end]
+            if value < key_bytes:
+                lo = mid + 1
+            elif value > key_bytes:
+                hi = mid
+            else:
+                self.hits += 1
+                return True
+        return False
+
+    def discard(self, login: str):
+        """用户取消Star后不再从快照命中"""
+        self._removed.add(login.lower())
+
+    def invalidate(self):
+        """下次访问时立即重新检查文件（本进程刚写入新快照时调用）"""
+        self._identity = None
+        self._checked_at = 0.0
+
+    def _unmap(self):
+        # 不重置检查时间：文件缺失或损坏时仍每 recheck_interval 秒最多检查一次
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._identity = None
+        self.count = 0
+
+    def close(self):
+        self._unmap()
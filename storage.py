@@ -0,0 +1,1197 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import aiosqlite
+from astrbot.api import logger
+from astrbot.api.star import StarTools
+from .repo_rules import RepoRule
+
+# 数据库被其他连接（或共享数据库的其他实例）锁定时的等待时间（秒）
+DB_BUSY_TIMEOUT = 30.0
+
+# 导出与导入的列，顺序即 CSV 表头
+COLUMNS = ("github_id", "repo", "qq_id", "created_at", "updated_at", "seen_at", "starred_at")
+
+# 每日汇总的指标：新增Star（按用户实际Star的日期）、取消Star、绑定、踢出
+METRIC_STARS = "stars"
+METRIC_UNSTARS = "unstars"
+METRIC_BINDS = "binds"
+METRIC_KICKS = "kicks"
+METRICS = (METRIC_STARS, METRIC_UNSTARS, METRIC_BINDS, METRIC_KICKS)
+
+# github_stars 的表结构；GitHub 用户名不区分大小写，"bob" 与 "Bob" 是同一条记录
+GITHUB_STARS_COLUMNS = """
+    github_id TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL,
+    qq_id TEXT,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    seen_at REAL,
+    starred_at REAL,
+    PRIMARY KEY (github_id, repo)
+"""
+
+STORAGE_SQLITE = "sqlite"
+STORAGE_MEMORY = "memory"
+
+
+def default_db_path() -> str:
+    """插件数据目录下的数据库文件路径"""
+    return str(StarTools.get_data_dir("github_star_verify") / "github_stars.db")
+
+
+def day_of(timestamp: float) -> str:
+    """时间戳所在的本地日期（YYYY-MM-DD），与 SQLite 的 date(..., 'localtime') 一致"""
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def _is_locked_error(e: Exception) -> bool:
+    message = str(e).lower()
+    return isinstance(e, sqlite3.OperationalError) and (
+        "locked" in message or "busy" in message
+    )
+
+
+async def run_write_with_retry(operation, attempts: int = 5, backoff_base: float = 0.5):
+    """执行写操作，超过 busy_timeout 仍被锁定时按指数退避重试"""
+    for attempt in range(1, attempts + 1):
+        try:
+            return await operation()
+        except sqlite3.OperationalError as e:
+            if not _is_locked_error(e) or attempt == attempts:
+                raise
+            delay = backoff_base * 2 ** (attempt - 1)
+            logger.warning(
+                f"[GitHub Star Verify] 数据库被锁定，{delay:.1f}s 后重试写入（第 {attempt} 次）"
+            )
+            await asyncio.sleep(delay)
+
+
+class StarStorage(ABC):
+    """Star记录、绑定关系与同步租约的存储接口
+
+    每条记录以 (github_id, repo) 为键，包含绑定的 qq_id、created_at、updated_at，
+    最近一次同步或API检查确认仍为Star用户的 seen_at，以及GitHub返回的 starred_at。
+    写入时同步维护按 (仓库, 日期, 指标) 汇总的每日计数，统计查询只读取汇总。
+    异常直接抛出，由调用方记录日志并决定返回值。
+    """
+
+    # 可写入Star用户快照的目录；为 None 时不使用快照
+    snapshot_dir: Optional[str] = None
+
+    @abstractmethod
+    async def init(self):
+        ...
+
+    # Star 记录
+
+    @abstractmethod
+    async def record_stargazer(self, repo: str, github_id: str, starred_at: Optional[float] = None):
+        """新增Star用户；已存在时只刷新 updated_at、seen_at 与已知的 starred_at"""
+
+    @abstractmethod
+    async def upsert_stargazers(
+        self,
+        repo: str,
+        github_ids: Iterable[str],
+        seen_at: float,
+        starred_at: Optional[Dict[str, float]] = None,
+    ) -> int:
+        """批量写入Star用户，已存在的只刷新 seen_at 与已知的 starred_at，返回新增数"""
+
+    @abstractmethod
+    async def remove_unbound_stargazer(self, repo: str, github_id: str) -> Tuple[bool, Optional[str]]:
+        """删除未绑定的记录，返回 (是否删除, 已绑定时的QQ号)"""
+
+    @abstractmethod
+    async def starred_since(self, repo: str, seen_since: float) -> List[str]:
+        ...
+
+    @abstractmethod
+    async def stale_bindings(self, repo: str, seen_before: float) -> List[Tuple[str, str]]:
+        """已绑定但 seen_at 早于 seen_before（或为空）的 (github_id, qq_id)"""
+
+    @abstractmethod
+    async def remove_stale_bindings(self, repo: str, seen_before: float) -> int:
+        ...
+
+    @abstractmethod
+    async def remove_unstarred(self, repo: str, seen_before: float) -> int:
+        """删除未绑定且 seen_at 早于 seen_before（或为空）的记录，返回删除数"""
+
+    @abstractmethod
+    async def is_stargazer(self, repo: str, github_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def starred_repos(self, github_id: str, repos: Sequence[str]) -> Set[str]:
+        """repos 中该用户已有Star记录的仓库"""
+
+    @abstractmethod
+    async def count_stars(self, repo: str) -> int:
+        ...
+
+    @abstractmethod
+    async def count_bound(self, repo: str) -> int:
+        ...
+
+    # 绑定关系
+
+    @abstractmethod
+    async def get_bindings(self, by: str, value: str, repos: Sequence[str]) -> Dict[str, str]:
+        """按 github_id 或 qq_id 查询 repos 中的绑定，返回 仓库 -> 对方（QQ号或GitHub ID）"""
+
+    @abstractmethod
+    async def bound_repos(self, qq_id: str) -> Set[str]:
+        ...
+
+    @abstractmethod
+    async def bind(self, repo: str, github_id: str, qq_id: str) -> bool:
+        """为已有的Star记录设置QQ号，记录不存在时返回 False"""
+
+    @abstractmethod
+    async def bind_rule(self, github_id: str, qq_id: str, rule: RepoRule) -> bool:
+        """在规则中所有已Star、未被绑定、且该QQ号未绑定其他用户的仓库上绑定
+
+        绑定后的仓库不满足规则时不做任何修改并返回 False。
+        """
+
+    @abstractmethod
+    async def unbind(self, qq_id: str, repos: Sequence[str]) -> int:
+        ...
+
+    @abstractmethod
+    async def cross_repo_binding(self, qq_id: str, repo: str) -> Optional[str]:
+        """QQ号在其他仓库绑定的、且为 repo 未绑定Star用户的GitHub ID（最近更新的优先）"""
+
+    @abstractmethod
+    async def bound_github_ids_outside(self, qq_id: str, repos: Sequence[str]) -> List[str]:
+        """QQ号在 repos 之外绑定的GitHub ID，按最近更新排序并去重"""
+
+    # 每日汇总
+
+    @abstractmethod
+    async def add_daily(self, repo: str, metric: str, count: int = 1):
+        """累加不对应记录写入的指标（如踢出），计入今天"""
+
+    @abstractmethod
+    async def daily_stats(self, repo: str, first_day: str, last_day: str) -> Dict[Tuple[str, str], int]:
+        """读取 [first_day, last_day] 内的每日汇总，返回 (日期, 指标) -> 数量"""
+
+    # 同步租约
+
+    @abstractmethod
+    async def acquire_lease(self, repo: str, holder: str, ttl: float) -> bool:
+        """租约空闲、已过期或本就由 holder 持有时获取成功"""
+
+    @abstractmethod
+    async def lease_holder(self, repo: str) -> Optional[str]:
+        """当前未过期租约的持有者"""
+
+    @abstractmethod
+    async def lease_expires_at(self, repo: str) -> Optional[float]:
+        ...
+
+    @abstractmethod
+    async def renew_lease(self, repo: str, holder: str, ttl: float) -> bool:
+        ...
+
+    @abstractmethod
+    async def release_lease(self, repo: str, holder: str):
+        ...
+
+    # 导出与导入
+
+    @abstractmethod
+    def iter_rows(
+        self, repo: Optional[str] = None, bound_only: bool = False, page_size: int = 5000
+    ) -> AsyncIterator[List[tuple]]:
+        """按 (repo, github_id) 顺序分页返回 COLUMNS 各列"""
+
+    @abstractmethod
+    async def import_rows(self, rows: List[tuple]) -> List[tuple]:
+        """UPSERT 以 COLUMNS 排列的行：以导入的绑定与时间为准，created_at 保留较早的值
+
+        QQ号在同一仓库已绑定其他GitHub用户（包括本批中更早的行）时不导入该行，
+        返回这些被拒绝的行。
+        """
+
+    async def close(self):
+        pass
+
+
+class SQLiteStarStorage(StarStorage):
+    """基于 aiosqlite 的存储，每次操作使用独立连接，WAL 模式下可被多个实例共享"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_db_path()
+        self.snapshot_dir = os.path.dirname(self.path)
+
+    def connect(self) -> aiosqlite.Connection:
+        """打开数据库连接，设置 busy_timeout 以等待其他写入者释放锁"""
+        return aiosqlite.connect(self.path, timeout=DB_BUSY_TIMEOUT)
+
+    async def init(self):
+        """初始化数据库表结构"""
+        # 确保数据库目录存在
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        async with self.connect() as conn:
+            # WAL 模式下读不阻塞写，适合多个实例共享同一数据库
+            await conn.execute("PRAGMA journal_mode=WAL")
+
+            # 创建GitHub Star用户表，使用复合主键；GitHub 用户名不区分大小写
+            await conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS github_stars ({GITHUB_STARS_COLUMNS})
+            """)
+            # seen_at：最近一次同步或API检查确认仍为Star用户的时间，用于绑定复核
+            # starred_at：GitHub 返回的用户实际Star时间，用于按日统计
+            async with conn.execute("PRAGMA table_info(github_stars)") as cursor:
+                columns = {row[1] for row in await cursor.fetchall()}
+            for column in ("seen_at", "starred_at"):
+                if column in columns:
+                    continue
+                try:
+                    await conn.execute(f"ALTER TABLE github_stars ADD COLUMN {column} REAL")
+                except sqlite3.OperationalError as e:
+                    # 共享数据库的其他实例可能已经添加
+                    if "duplicate column" not in str(e).lower():
+                        raise
+            await conn.commit()
+            await self._migrate_nocase(conn)
+
+            # 创建索引（主键字段会自动创建索引，这里只需要为其他字段创建）
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_github_stars_qq_id ON github_stars(qq_id)
+            """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_github_stars_repo ON github_stars(repo)
+            """)
+            # 按 (repo, github_id) 键集分页导出
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_github_stars_repo_github ON github_stars(repo, github_id)
+            """)
+
+            # 同步租约：共享数据库的多个实例中同一仓库同时只有一个实例执行同步
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_leases (
+                    repo TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+            await conn.commit()
+
+            await self._init_daily_stats(conn)
+
+        logger.info(f"[GitHub Star Verify] 数据库初始化完成: {self.path}")
+
+    async def _migrate_nocase(self, conn: aiosqlite.Connection):
+        """将旧表的 github_id 改为不区分大小写，并合并仅大小写不同的重复记录
+
+        合并时绑定取最近更新的已绑定记录，用户名取最近一次同步确认的写法，
+        created_at / starred_at 取最早、updated_at / seen_at 取最新。
+        """
+        table_sql = "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'github_stars'"
+        async with conn.execute(table_sql) as cursor:
+            if "COLLATE NOCASE" in (await cursor.fetchone())[0]:
+                return
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 共享数据库的其他实例可能已经完成迁移
+            async with conn.execute(table_sql) as cursor:
+                if "COLLATE NOCASE" in (await cursor.fetchone())[0]:
+                    await conn.rollback()
+                    return
+            await conn.execute("DROP TABLE IF EXISTS github_stars_nocase")
+            await conn.execute(f"CREATE TABLE github_stars_nocase ({GITHUB_STARS_COLUMNS})")
+            await conn.execute(f"""
+                INSERT INTO github_stars_nocase ({", ".join(COLUMNS)})
+                SELECT {", ".join(COLUMNS)} FROM (
+                    SELECT
+                        github_id, repo,
+                        FIRST_VALUE(qq_id) OVER bound AS qq_id,
+                        MIN(created_at) OVER same AS created_at,
+                        MAX(updated_at) OVER same AS updated_at,
+                        MAX(seen_at) OVER same AS seen_at,
+                        MIN(starred_at) OVER same AS starred_at,
+                        ROW_NUMBER() OVER seen AS position
+                    FROM github_stars
+                    WINDOW
+                        same AS (PARTITION BY lower(github_id), repo),
+                        bound AS (PARTITION BY lower(github_id), repo ORDER BY qq_id IS NULL, updated_at DESC),
+                        seen AS (PARTITION BY lower(github_id), repo ORDER BY seen_at IS NULL, seen_at DESC)
+                ) WHERE position = 1
+            """)
+            async with conn.execute("SELECT COUNT(*) FROM github_stars") as cursor:
+                before = (await cursor.fetchone())[0]
+            async with conn.execute("SELECT COUNT(*) FROM github_stars_nocase") as cursor:
+                after = (await cursor.fetchone())[0]
+            # 旧表的索引与触发器随表删除，之后按新表重新创建
+            await conn.execute("DROP TABLE github_stars")
+            await conn.execute("ALTER TABLE github_stars_nocase RENAME TO github_stars")
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        logger.info(
+            f"[GitHub Star Verify] GitHub 用户名已改为不区分大小写，合并了 {before - after} 条重复记录"
+        )
+
+    async def _init_daily_stats(self, conn: aiosqlite.Connection):
+        """创建每日汇总表与维护它的触发器；首次创建时由已有记录回填
+
+        触发器与写入在同一事务中执行，任何写入路径（同步、绑定、导入、删除）都会更新汇总。
+        在同一个 IMMEDIATE 事务中检查并回填，共享数据库的多个实例不会重复回填。
+        """
+        day = "date({}, 'unixepoch', 'localtime')"
+        star_day = day.format("COALESCE({0}.starred_at, {0}.created_at)")
+        bump = """
+            INSERT INTO daily_stats (repo, day, metric, count) VALUES ({repo}, {day}, '{metric}', {delta})
+            ON CONFLICT(repo, day, metric) DO UPDATE SET count = count + {delta};
+        """
+        await conn.execute("BEGIN IMMEDIATE")
+        try:
+            async with conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_stats'"
+            ) as cursor:
+                exists = await cursor.fetchone() is not None
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS daily_stats (
+                    repo TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (repo, day, metric)
+                )
+            """)
+            await conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS github_stars_stats_insert
+                AFTER INSERT ON github_stars
+                BEGIN
+                    {bump.format(repo="NEW.repo", day=star_day.format("NEW"), metric=METRIC_STARS, delta=1)}
+                END
+            """)
+            await conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS github_stars_stats_insert_bound
+                AFTER INSERT ON github_stars WHEN NEW.qq_id IS NOT NULL
+                BEGIN
+                    {bump.format(repo="NEW.repo", day=day.format("NEW.updated_at"), metric=METRIC_BINDS, delta=1)}
+                END
+            """)
+            # 之后获得（或更正）了实际Star时间时，把计数移到对应日期
+            await conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS github_stars_stats_starred_at
+                AFTER UPDATE OF starred_at ON github_stars
+                WHEN NEW.starred_at IS NOT OLD.starred_at
+                BEGIN
+                    {bump.format(repo="OLD.repo", day=star_day.format("OLD"), metric=METRIC_STARS, delta=-1)}
+                    {bump.format(repo="NEW.repo", day=star_day.format("NEW"), metric=METRIC_STARS, delta=1)}
+                END
+            """)
+            await conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS github_stars_stats_bind
+                AFTER UPDATE OF qq_id ON github_stars
+                WHEN NEW.qq_id IS NOT NULL AND NEW.qq_id IS NOT OLD.qq_id
+                BEGIN
+                    {bump.format(repo="NEW.repo", day=day.format("NEW.updated_at"), metric=METRIC_BINDS, delta=1)}
+                END
+            """)
+            await conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS github_stars_stats_delete
+                AFTER DELETE ON github_stars
+                BEGIN
+                    {bump.format(repo="OLD.repo", day="date('now', 'localtime')", metric=METRIC_UNSTARS, delta=1)}
+                END
+            """)
+            if not exists:
+                await conn.execute(f"""
+                    INSERT INTO daily_stats (repo, day, metric, count)
+                    SELECT repo, {star_day.format("github_stars")}, '{METRIC_STARS}', COUNT(*)
+                    FROM github_stars GROUP BY 1, 2
+                """)
+                await conn.execute(f"""
+                    INSERT INTO daily_stats (repo, day, metric, count)
+                    SELECT repo, {day.format("updated_at")}, '{METRIC_BINDS}', COUNT(*)
+                    FROM github_stars WHERE qq_id IS NOT NULL GROUP BY 1, 2
+                """)
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+
+    async def _fetchone(self, sql: str, params: tuple) -> Optional[tuple]:
+        async with self.connect() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+
+    async def _fetchall(self, sql: str, params: tuple) -> List[tuple]:
+        async with self.connect() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return list(await cursor.fetchall())
+
+    async def _write(self, sql: str, params: tuple) -> int:
+        """执行单条写语句，返回影响行数"""
+
+        async def write() -> int:
+            async with self.connect() as conn:
+                cursor = await conn.execute(sql, params)
+                await conn.commit()
+                return cursor.rowcount
+
+        return await run_write_with_retry(write)
+
+    @staticmethod
+    def _in_clause(repos: Sequence[str]) -> str:
+        return ", ".join("?" for _ in repos)
+
+    async def record_stargazer(self, repo: str, github_id: str, starred_at: Optional[float] = None):
+        current_time = int(time.time())
+        # 使用 UPSERT：若(github_id, repo)已存在，仅更新updated_at、seen_at与已知的starred_at，保留既有的qq_id与created_at
+        await self._write(
+            """
+            INSERT INTO github_stars (github_id, repo, created_at, updated_at, seen_at, starred_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(github_id, repo) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                seen_at = excluded.seen_at,
+                starred_at = COALESCE(excluded.starred_at, github_stars.starred_at)
+            """,
+            (github_id, repo, current_time, current_time, time.time(), starred_at),
+        )
+
+    async def upsert_stargazers(
+        self,
+        repo: str,
+        github_ids: Iterable[str],
+        seen_at: float,
+        starred_at: Optional[Dict[str, float]] = None,
+    ) -> int:
+        current_time = int(time.time())
+        starred_at = starred_at or {}
+        rows = [
+            (github_id, repo, current_time, current_time, seen_at, starred_at.get(github_id))
+            for github_id in set(github_ids)
+        ]
+
+        async def write() -> int:
+            async with self.connect() as conn:
+                # 先插入新用户（rowcount 只计直接插入的行，不含触发器的写入），
+                # 再刷新已有记录：seen_at、已知的 starred_at，以及同步返回的用户名写法
+                cursor = await conn.executemany(
+                    """
+                    INSERT INTO github_stars (github_id, repo, created_at, updated_at, seen_at, starred_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(github_id, repo) DO NOTHING
+                    """,
+                    rows,
+                )
+                added = cursor.rowcount
+                if added < len(rows):
+                    await conn.executemany(
+                        """
+                        UPDATE github_stars SET
+                            github_id = ?1,
+                            seen_at = ?3,
+                            starred_at = COALESCE(?4, starred_at)
+                        WHERE github_id = ?1 AND repo = ?2
+                        """,
+                        [(github_id, repo, seen_at, starred) for github_id, _, _, _, _, starred in rows],
+                    )
+                await conn.commit()
+                return added
+
+        return await run_write_with_retry(write)
+
+    async def remove_unbound_stargazer(self, repo: str, github_id: str) -> Tuple[bool, Optional[str]]:
+        async with self.connect() as conn:
+            async with conn.execute(
+                "SELECT qq_id FROM github_stars WHERE github_id = ? AND repo = ?",
+                (github_id, repo),
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                return False, None
+            if row[0]:
+                return False, row[0]
+            await conn.execute(
+                "DELETE FROM github_stars WHERE github_id = ? AND repo = ? AND qq_id IS NULL",
+                (github_id, repo),
+            )
+            await conn.commit()
+            return True, None
+
+    async def starred_since(self, repo: str, seen_since: float) -> List[str]:
+        logins: List[str] = []
+        async with self.connect() as conn:
+            async with conn.execute(
+                "SELECT github_id FROM github_stars WHERE repo = ? AND seen_at >= ?",
+                (repo, seen_since),
+            ) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(10000)
+                    if not rows:
+                        break
+                    logins.extend(row[0] for row in rows)
+        return logins
+
+    async def stale_bindings(self, repo: str, seen_before: float) -> List[Tuple[str, str]]:
+        rows = await self._fetchall(
+            """
+            SELECT github_id, qq_id FROM github_stars
+            WHERE repo = ? AND qq_id IS NOT NULL
+                AND (seen_at IS NULL OR seen_at < ?)
+            """,
+            (repo, seen_before),
+        )
+        return [(row[0], row[1]) for row in rows]
+
+    async def remove_stale_bindings(self, repo: str, seen_before: float) -> int:
+        return await self._write(
+            """
+            DELETE FROM github_stars
+            WHERE repo = ? AND qq_id IS NOT NULL
+                AND (seen_at IS NULL OR seen_at < ?)
+            """,
+            (repo, seen_before),
+        )
+
+    async def remove_unstarred(self, repo: str, seen_before: float) -> int:
+        return await self._write(
+            """
+            DELETE FROM github_stars
+            WHERE repo = ? AND qq_id IS NULL
+                AND (seen_at IS NULL OR seen_at < ?)
+            """,
+            (repo, seen_before),
+        )
+
+    async def is_stargazer(self, repo: str, github_id: str) -> bool:
+        row = await self._fetchone(
+            "SELECT 1 FROM github_stars WHERE github_id = ? AND repo = ?", (github_id, repo)
+        )
+        return row is not None
+
+    async def starred_repos(self, github_id: str, repos: Sequence[str]) -> Set[str]:
+        rows = await self._fetchall(
+            f"SELECT repo FROM github_stars WHERE github_id = ? AND repo IN ({self._in_clause(repos)})",
+            (github_id, *repos),
+        )
+        return {row[0] for row in rows}
+
+    async def count_stars(self, repo: str) -> int:
+        row = await self._fetchone("SELECT COUNT(*) FROM github_stars WHERE repo = ?", (repo,))
+        return row[0] if row else 0
+
+    async def count_bound(self, repo: str) -> int:
+        row = await self._fetchone(
+            "SELECT COUNT(*) FROM github_stars WHERE qq_id IS NOT NULL AND repo = ?", (repo,)
+        )
+        return row[0] if row else 0
+
+    async def get_bindings(self, by: str, value: str, repos: Sequence[str]) -> Dict[str, str]:
+        if by not in ("github_id", "qq_id"):
+            raise ValueError(f"不支持按 {by} 查询绑定")
+        other = "qq_id" if by == "github_id" else "github_id"
+        rows = await self._fetchall(
+            f"""
+            SELECT repo, {other} FROM github_stars
+            WHERE {by} = ? AND qq_id IS NOT NULL AND repo IN ({self._in_clause(repos)})
+            """,
+            (value, *repos),
+        )
+        return {row[0]: row[1] for row in rows}
+
+    async def bound_repos(self, qq_id: str) -> Set[str]:
+        rows = await self._fetchall("SELECT DISTINCT repo FROM github_stars WHERE qq_id = ?", (qq_id,))
+        return {row[0] for row in rows}
+
+    async def bind(self, repo: str, github_id: str, qq_id: str) -> bool:
+        updated = await self._write(
+            "UPDATE github_stars SET qq_id = ?, updated_at = ? WHERE github_id = ? AND repo = ?",
+            (qq_id, int(time.time()), github_id, repo),
+        )
+        return updated > 0
+
+    async def bind_rule(self, github_id: str, qq_id: str, rule: RepoRule) -> bool:
+        in_clause = self._in_clause(rule.repos)
+
+        async def write() -> bool:
+            async with self.connect() as conn:
+                await conn.execute(
+                    f"""
+                    UPDATE github_stars SET qq_id = ?, updated_at = ?
+                    WHERE github_id = ? AND qq_id IS NULL AND repo IN ({in_clause})
+                        AND NOT EXISTS (
+                            SELECT 1 FROM github_stars AS other
+                            WHERE other.repo = github_stars.repo AND other.qq_id = ?
+                        )
+                    """,
+                    (qq_id, int(time.time()), github_id, *rule.repos, qq_id),
+                )
+                async with conn.execute(
+                    f"SELECT repo FROM github_stars WHERE github_id = ? AND qq_id = ? AND repo IN ({in_clause})",
+                    (github_id, qq_id, *rule.repos),
+                ) as cursor:
+                    bound = {row[0] for row in await cursor.fetchall()}
+                if not rule.satisfied(bound):
+                    await conn.rollback()
+                    return False
+                await conn.commit()
+                return True
+
+        return await run_write_with_retry(write)
+
+    async def unbind(self, qq_id: str, repos: Sequence[str]) -> int:
+        return await self._write(
+            f"""
+            UPDATE github_stars SET qq_id = NULL, updated_at = ?
+            WHERE qq_id = ? AND repo IN ({self._in_clause(repos)})
+            """,
+            (int(time.time()), qq_id, *repos),
+        )
+
+    async def cross_repo_binding(self, qq_id: str, repo: str) -> Optional[str]:
+        row = await self._fetchone(
+            """
+            SELECT b.github_id FROM github_stars AS b
+            JOIN github_stars AS s
+                ON s.github_id = b.github_id AND s.repo = ?
+            WHERE b.qq_id = ? AND b.repo != ? AND s.qq_id IS NULL
+            ORDER BY b.updated_at DESC
+            LIMIT 1
+            """,
+            (repo, qq_id, repo),
+        )
+        return row[0] if row else None
+
+    async def bound_github_ids_outside(self, qq_id: str, repos: Sequence[str]) -> List[str]:
+        rows = await self._fetchall(
+            f"""
+            SELECT github_id FROM github_stars
+            WHERE qq_id = ? AND repo NOT IN ({self._in_clause(repos)})
+            ORDER BY updated_at DESC
+            """,
+            (qq_id, *repos),
+        )
+        return list(dict.fromkeys(row[0] for row in rows))
+
+    async def add_daily(self, repo: str, metric: str, count: int = 1):
+        await self._write(
+            """
+            INSERT INTO daily_stats (repo, day, metric, count) VALUES (?, date('now', 'localtime'), ?, ?)
+            ON CONFLICT(repo, day, metric) DO UPDATE SET count = count + excluded.count
+            """,
+            (repo, metric, count),
+        )
+
+    async def daily_stats(self, repo: str, first_day: str, last_day: str) -> Dict[Tuple[str, str], int]:
+        rows = await self._fetchall(
+            "SELECT day, metric, count FROM daily_stats WHERE repo = ? AND day BETWEEN ? AND ?",
+            (repo, first_day, last_day),
+        )
+        return {(day, metric): count for day, metric, count in rows}
+
+    async def acquire_lease(self, repo: str, holder: str, ttl: float) -> bool:
+        async def write() -> bool:
+            now = time.time()
+            async with self.connect() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO sync_leases (repo, holder, expires_at) VALUES (?, ?, ?)
+                    ON CONFLICT(repo) DO UPDATE SET
+                        holder = excluded.holder,
+                        expires_at = excluded.expires_at
+                    WHERE sync_leases.expires_at < ? OR sync_leases.holder = excluded.holder
+                    """,
+                    (repo, holder, now + ttl, now),
+                )
+                await conn.commit()
+                async with conn.execute(
+                    "SELECT holder FROM sync_leases WHERE repo = ?", (repo,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+                    return row is not None and row[0] == holder
+
+        return await run_write_with_retry(write)
+
+    async def lease_holder(self, repo: str) -> Optional[str]:
+        row = await self._fetchone(
+            "SELECT holder FROM sync_leases WHERE repo = ? AND expires_at >= ?", (repo, time.time())
+        )
+        return row[0] if row else None
+
+    async def lease_expires_at(self, repo: str) -> Optional[float]:
+        row = await self._fetchone("SELECT expires_at FROM sync_leases WHERE repo = ?", (repo,))
+        return row[0] if row else None
+
+    async def renew_lease(self, repo: str, holder: str, ttl: float) -> bool:
+        updated = await self._write(
+            "UPDATE sync_leases SET expires_at = ? WHERE repo = ? AND holder = ?",
+            (time.time() + ttl, repo, holder),
+        )
+        return updated > 0
+
+    async def release_lease(self, repo: str, holder: str):
+        await self._write("DELETE FROM sync_leases WHERE repo = ? AND holder = ?", (repo, holder))
+
+    async def iter_rows(
+        self, repo: Optional[str] = None, bound_only: bool = False, page_size: int = 5000
+    ) -> AsyncIterator[List[tuple]]:
+        # 每页从上一页最后一行的键继续查询，不使用 OFFSET，内存占用与表大小无关
+        conditions = ["(repo, github_id) > (?, ?)"]
+        params: list = []
+        if repo:
+            conditions.append("repo = ?")
+            params.append(repo)
+        if bound_only:
+            conditions.append("qq_id IS NOT NULL")
+        sql = f"""
+            SELECT {", ".join(COLUMNS)} FROM github_stars
+            WHERE {" AND ".join(conditions)}
+            ORDER BY repo, github_id
+            LIMIT ?
+        """
+        last_key = ("", "")  # (repo, github_id)
+        async with self.connect() as conn:
+            while True:
+                async with conn.execute(sql, (*last_key, *params, page_size)) as cursor:
+                    rows = await cursor.fetchall()
+                if not rows:
+                    return
+                yield rows
+                last_key = (rows[-1][1], rows[-1][0])
+                if len(rows) < page_size:
+                    return
+
+    async def import_rows(self, rows: List[tuple]) -> List[tuple]:
+        columns = ", ".join(COLUMNS)
+
+        async def write() -> List[tuple]:
+            async with self.connect() as conn:
+                # 先写入临时表（只属于本连接，连接关闭时自动删除），用查询找出绑定冲突的行
+                await conn.execute("""
+                    CREATE TEMP TABLE import_batch (
+                        position INTEGER PRIMARY KEY,
+                        github_id TEXT NOT NULL COLLATE NOCASE,
+                        repo TEXT NOT NULL,
+                        qq_id TEXT,
+                        created_at INTEGER NOT NULL,
+                        updated_at INTEGER NOT NULL,
+                        seen_at REAL,
+                        starred_at REAL
+                    )
+                """)
+                await conn.executemany(
+                    f"INSERT INTO import_batch (position, {columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(position, *row) for position, row in enumerate(rows)],
+                )
+                await conn.execute(
+                    "CREATE INDEX temp.import_batch_qq ON import_batch (repo, qq_id, position)"
+                )
+                # 先拒绝与已有绑定冲突的行；剩余的行中，同一 (仓库, QQ号) 以本批最早的一行为准。
+                # +old.repo 让查询走 qq_id 索引，否则会按仓库扫描全部行
+                conflicts = []
+                for condition in (
+                    """
+                    EXISTS (
+                        SELECT 1 FROM github_stars AS old
+                        WHERE old.qq_id = new.qq_id AND +old.repo = new.repo
+                            AND old.github_id <> new.github_id
+                    )
+                    """,
+                    """
+                    new.github_id <> (
+                        SELECT first.github_id FROM import_batch AS first
+                        WHERE first.repo = new.repo AND first.qq_id = new.qq_id
+                        ORDER BY first.position LIMIT 1
+                    )
+                    """,
+                ):
+                    async with conn.execute(
+                        f"SELECT position, {columns} FROM import_batch AS new "
+                        f"WHERE new.qq_id IS NOT NULL AND {condition}"
+                    ) as cursor:
+                        rejected = await cursor.fetchall()
+                    await conn.executemany(
+                        "DELETE FROM import_batch WHERE position = ?",
+                        [(row[0],) for row in rejected],
+                    )
+                    conflicts.extend(rejected)
+                conflicts.sort()
+                # WHERE true 用于区分 INSERT ... SELECT 与 ON CONFLICT 子句
+                await conn.execute(
+                    f"""
+                    INSERT INTO github_stars ({columns})
+                    SELECT {columns} FROM import_batch WHERE true ORDER BY position
+                    ON CONFLICT(github_id, repo) DO UPDATE SET
+                        qq_id = excluded.qq_id,
+                        created_at = MIN(github_stars.created_at, excluded.created_at),
+                        updated_at = excluded.updated_at,
+                        seen_at = COALESCE(excluded.seen_at, github_stars.seen_at),
+                        starred_at = COALESCE(excluded.starred_at, github_stars.starred_at)
+                    """
+                )
+                await conn.commit()
+                return [tuple(row[1:]) for row in conflicts]
+
+        return await run_write_with_retry(write)
+
+    def __str__(self):
+        return f"sqlite:{self.path}"
+
+
+class _StarRow:
+    __slots__ = ("github_id", "qq_id", "created_at", "updated_at", "seen_at", "starred_at")
+
+    def __init__(
+        self,
+        github_id: str,
+        created_at: int,
+        seen_at: Optional[float] = None,
+        starred_at: Optional[float] = None,
+    ):
+        # 保留用户名的写法；字典键为小写
+        self.github_id = github_id
+        self.qq_id: Optional[str] = None
+        self.created_at = created_at
+        self.updated_at = created_at
+        self.seen_at = seen_at
+        self.starred_at = starred_at
+
+    @property
+    def star_day(self) -> str:
+        return day_of(self.created_at if self.starred_at is None else self.starred_at)
+
+
+class MemoryStarStorage(StarStorage):
+    """纯内存存储：仓库 -> {小写 GitHub ID -> 记录}，另以 QQ号 -> {(仓库, 小写 GitHub ID)} 索引绑定
+
+    与 SQLite 的 COLLATE NOCASE 一致，GitHub 用户名不区分大小写。
+
+    不访问磁盘，进程退出后数据丢失，适合临时部署以及在基准测试中排除数据库 I/O。
+    所有方法都不在中途让出事件循环，因此无需加锁。
+    """
+
+    def __init__(self):
+        self._stars: Dict[str, Dict[str, _StarRow]] = {}
+        self._by_qq: Dict[str, Set[Tuple[str, str]]] = {}
+        self._bound_count: Dict[str, int] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+        self._daily: Dict[Tuple[str, str, str], int] = {}
+
+    async def init(self):
+        logger.info("[GitHub Star Verify] 使用内存存储，重启后数据不会保留")
+
+    def _rows(self, repo: str) -> Dict[str, _StarRow]:
+        return self._stars.setdefault(repo, {})
+
+    def _bump(self, repo: str, day: str, metric: str, delta: int = 1):
+        key = (repo, day, metric)
+        self._daily[key] = self._daily.get(key, 0) + delta
+
+    def _row(self, repo: str, github_id: str) -> Optional[_StarRow]:
+        return self._stars.get(repo, {}).get(github_id.lower())
+
+    def _add_row(self, repo: str, row: _StarRow):
+        self._rows(repo)[row.github_id.lower()] = row
+        self._bump(repo, row.star_day, METRIC_STARS)
+
+    def _set_starred_at(self, repo: str, row: _StarRow, starred_at: Optional[float]):
+        """更新已知的实际Star时间，并把计数移到对应日期"""
+        if starred_at is None or starred_at == row.starred_at:
+            return
+        self._bump(repo, row.star_day, METRIC_STARS, -1)
+        row.starred_at = starred_at
+        self._bump(repo, row.star_day, METRIC_STARS)
+
+    def _set_qq(self, repo: str, row: _StarRow, qq_id: Optional[str]):
+        """修改记录的绑定并维护QQ号索引、绑定计数与每日绑定数（按 row.updated_at 计日）"""
+        key = (repo, row.github_id.lower())
+        if qq_id and qq_id != row.qq_id:
+            self._bump(repo, day_of(row.updated_at), METRIC_BINDS)
+        if row.qq_id:
+            keys = self._by_qq.get(row.qq_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_qq[row.qq_id]
+            self._bound_count[repo] -= 1
+        row.qq_id = qq_id
+        if qq_id:
+            self._by_qq.setdefault(qq_id, set()).add(key)
+            self._bound_count[repo] = self._bound_count.get(repo, 0) + 1
+
+    def _delete(self, repo: str, github_id: str):
+        row = self._stars.get(repo, {}).pop(github_id.lower(), None)
+        if row is None:
+            return
+        self._bump(repo, day_of(time.time()), METRIC_UNSTARS)
+        if row.qq_id:
+            self._set_qq(repo, row, None)
+
+    async def record_stargazer(self, repo: str, github_id: str, starred_at: Optional[float] = None):
+        current_time = int(time.time())
+        row = self._row(repo, github_id)
+        if row is None:
+            self._add_row(repo, _StarRow(github_id, current_time, time.time(), starred_at))
+        else:
+            row.updated_at = current_time
+            row.seen_at = time.time()
+            self._set_starred_at(repo, row, starred_at)
+
+    async def upsert_stargazers(
+        self,
+        repo: str,
+        github_ids: Iterable[str],
+        seen_at: float,
+        starred_at: Optional[Dict[str, float]] = None,
+    ) -> int:
+        current_time = int(time.time())
+        starred_at = starred_at or {}
+        rows = self._rows(repo)
+        before = len(rows)
+        for github_id in github_ids:
+            row = rows.get(github_id.lower())
+            if row is None:
+                self._add_row(repo, _StarRow(github_id, current_time, seen_at, starred_at.get(github_id)))
+            else:
+                # 以同步返回的写法为准
+                row.github_id = github_id
+                row.seen_at = seen_at
+                self._set_starred_at(repo, row, starred_at.get(github_id))
+        return len(rows) - before
+
+    async def remove_unbound_stargazer(self, repo: str, github_id: str) -> Tuple[bool, Optional[str]]:
+        row = self._row(repo, github_id)
+        if row is None:
+            return False, None
+        if row.qq_id:
+            return False, row.qq_id
+        self._delete(repo, github_id)
+        return True, None
+
+    async def starred_since(self, repo: str, seen_since: float) -> List[str]:
+        return [
+            row.github_id
+            for row in self._stars.get(repo, {}).values()
+            if row.seen_at is not None and row.seen_at >= seen_since
+        ]
+
+    def _stale(self, repo: str, seen_before: float) -> List[Tuple[str, str]]:
+        return [
+            (row.github_id, row.qq_id)
+            for row in self._stars.get(repo, {}).values()
+            if row.qq_id and (row.seen_at is None or row.seen_at < seen_before)
+        ]
+
+    async def stale_bindings(self, repo: str, seen_before: float) -> List[Tuple[str, str]]:
+        return self._stale(repo, seen_before)
+
+    async def remove_stale_bindings(self, repo: str, seen_before: float) -> int:
+        stale = self._stale(repo, seen_before)
+        for github_id, _ in stale:
+            self._delete(repo, github_id)
+        return len(stale)
+
+    async def remove_unstarred(self, repo: str, seen_before: float) -> int:
+        unstarred = [
+            row.github_id
+            for row in self._stars.get(repo, {}).values()
+            if not row.qq_id and (row.seen_at is None or row.seen_at < seen_before)
+        ]
+        for github_id in unstarred:
+            self._delete(repo, github_id)
+        return len(unstarred)
+
+    async def is_stargazer(self, repo: str, github_id: str) -> bool:
+        return self._row(repo, github_id) is not None
+
+    async def starred_repos(self, github_id: str, repos: Sequence[str]) -> Set[str]:
+        return {repo for repo in repos if self._row(repo, github_id) is not None}
+
+    async def count_stars(self, repo: str) -> int:
+        return len(self._stars.get(repo, ()))
+
+    async def count_bound(self, repo: str) -> int:
+        return self._bound_count.get(repo, 0)
+
+    async def get_bindings(self, by: str, value: str, repos: Sequence[str]) -> Dict[str, str]:
+        if by == "qq_id":
+            wanted = set(repos)
+            return {
+                repo: self._stars[repo][key].github_id
+                for repo, key in self._by_qq.get(value, ())
+                if repo in wanted
+            }
+        if by != "github_id":
+            raise ValueError(f"不支持按 {by} 查询绑定")
+        bindings = {}
+        for repo in repos:
+            row = self._row(repo, value)
+            if row is not None and row.qq_id:
+                bindings[repo] = row.qq_id
+        return bindings
+
+    async def bound_repos(self, qq_id: str) -> Set[str]:
+        return {repo for repo, _ in self._by_qq.get(qq_id, ())}
+
+    async def bind(self, repo: str, github_id: str, qq_id: str) -> bool:
+        row = self._row(repo, github_id)
+        if row is None:
+            return False
+        row.updated_at = int(time.time())
+        self._set_qq(repo, row, qq_id)
+        return True
+
+    async def bind_rule(self, github_id: str, qq_id: str, rule: RepoRule) -> bool:
+        taken = {repo for repo, _ in self._by_qq.get(qq_id, ())}
+        eligible, bound = [], set()
+        for repo in rule.repos:
+            row = self._row(repo, github_id)
+            if row is None:
+                continue
+            if row.qq_id == qq_id:
+                bound.add(repo)
+            elif row.qq_id is None and repo not in taken:
+                eligible.append((repo, row))
+                bound.add(repo)
+        if not rule.satisfied(bound):
+            return False
+        current_time = int(time.time())
+        for repo, row in eligible:
+            row.updated_at = current_time
+            self._set_qq(repo, row, qq_id)
+        return True
+
+    async def unbind(self, qq_id: str, repos: Sequence[str]) -> int:
+        wanted = set(repos)
+        keys = [(repo, key) for repo, key in self._by_qq.get(qq_id, ()) if repo in wanted]
+        current_time = int(time.time())
+        for repo, key in keys:
+            row = self._stars[repo][key]
+            self._set_qq(repo, row, None)
+            row.updated_at = current_time
+        return len(keys)
+
+    def _bound_outside(self, qq_id: str, repos: Sequence[str]) -> List[_StarRow]:
+        """QQ号在 repos 之外绑定的记录，最近更新的在前"""
+        excluded = set(repos)
+        rows = [
+            self._stars[repo][key] for repo, key in self._by_qq.get(qq_id, ()) if repo not in excluded
+        ]
+        rows.sort(key=lambda row: row.updated_at, reverse=True)
+        return rows
+
+    async def cross_repo_binding(self, qq_id: str, repo: str) -> Optional[str]:
+        for bound in self._bound_outside(qq_id, (repo,)):
+            row = self._row(repo, bound.github_id)
+            if row is not None and row.qq_id is None:
+                return row.github_id
+        return None
+
+    async def bound_github_ids_outside(self, qq_id: str, repos: Sequence[str]) -> List[str]:
+        github_ids: Dict[str, str] = {}
+        for row in self._bound_outside(qq_id, repos):
+            github_ids.setdefault(row.github_id.lower(), row.github_id)
+        return list(github_ids.values())
+
+    async def add_daily(self, repo: str, metric: str, count: int = 1):
+        self._bump(repo, day_of(time.time()), metric, count)
+
+    async def daily_stats(self, repo: str, first_day: str, last_day: str) -> Dict[Tuple[str, str], int]:
+        return {
+            (day, metric): count
+            for (stat_repo, day, metric), count in self._daily.items()
+            if stat_repo == repo and first_day <= day <= last_day
+        }
+
+    async def acquire_lease(self, repo: str, holder: str, ttl: float) -> bool:
+        now = time.time()
+        lease = self._leases.get(repo)
+        if lease is None or lease[1] < now or lease[0] == holder:
+            self._leases[repo] = (holder, now + ttl)
+            return True
+        return False
+
+    async def lease_holder(self, repo: str) -> Optional[str]:
+        lease = self._leases.get(repo)
+        return lease[0] if lease and lease[1] >= time.time() else None
+
+    async def lease_expires_at(self, repo: str) -> Optional[float]:
+        lease = self._leases.get(repo)
+        return lease[1] if lease else None
+
+    async def renew_lease(self, repo: str, holder: str, ttl: float) -> bool:
+        lease = self._leases.get(repo)
+        if lease is None or lease[0] != holder:
+            return False
+        self._leases[repo] = (holder, time.time() + ttl)
+        return True
+
+    async def release_lease(self, repo: str, holder: str):
+        lease = self._leases.get(repo)
+        if lease and lease[0] == holder:
+            del self._leases[repo]
+
+    async def iter_rows(
+        self, repo: Optional[str] = None, bound_only: bool = False, page_size: int = 5000
+    ) -> AsyncIterator[List[tuple]]:
+        for repo_name in sorted([repo] if repo else self._stars):
+            rows = self._stars.get(repo_name, {})
+            keys = sorted(rows)
+            for start in range(0, len(keys), page_size):
+                page = []
+                for key in keys[start:start + page_size]:
+                    row = rows.get(key)
+                    if row is None or (bound_only and not row.qq_id):
+                        continue
+                    page.append((
+                        row.github_id, repo_name, row.qq_id, row.created_at,
+                        row.updated_at, row.seen_at, row.starred_at,
+                    ))
+                if page:
+                    yield page
+                # 让出事件循环，导出大量数据时不阻塞其他请求
+                await asyncio.sleep(0)
+
+    async def import_rows(self, rows: List[tuple]) -> List[tuple]:
+        conflicts = []
+        for record in rows:
+            github_id, repo, qq_id, created_at, updated_at, seen_at, starred_at = record
+            if qq_id and any(
+                bound_repo == repo and key != github_id.lower()
+                for bound_repo, key in self._by_qq.get(qq_id, ())
+            ):
+                conflicts.append(tuple(record))
+                continue
+            row = self._row(repo, github_id)
+            if row is None:
+                row = _StarRow(github_id, created_at, seen_at, starred_at)
+                row.updated_at = updated_at
+                self._add_row(repo, row)
+            else:
+                # 与 SQLite 的触发器一致：先按原 created_at 移动计数，created_at 变化本身不移动
+                self._set_starred_at(repo, row, starred_at)
+                row.created_at = min(row.created_at, created_at)
+                if seen_at is not None:
+                    row.seen_at = seen_at
+                row.updated_at = updated_at
+            self._set_qq(repo, row, qq_id)
+        return conflicts
+
+    def __str__(self):
+        return "memory"
+
+
+def create_storage(backend: str, data_dir: str) -> StarStorage:
+    """按配置创建存储：memory 使用内存存储，其他值使用数据目录下的 SQLite 数据库"""
+    if backend == STORAGE_MEMORY:
+        return MemoryStarStorage()
+    if backend != STORAGE_SQLITE:
+        logger.warning(f"[GitHub Star Verify] 未知的存储类型 {backend}，使用 {STORAGE_SQLITE}")
+    return SQLiteStarStorage(os.path.join(data_dir, "github_stars.db"))
@@ -0,0 +1,151 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional
+from astrbot.api import logger
+
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+_STATE_LABELS = {
+    JOB_RUNNING: "运行中",
+    JOB_DONE: "已完成",
+    JOB_FAILED: "失败",
+    JOB_CANCELLED: "已取消",
+}
+
+
+class SyncJob:
+    """一次仓库同步的进度：页数、获取与写入的行数、吞吐与预计剩余时间"""
+
+    def __init__(self, repo: str, job_id: str = "", reconcile: bool = True):
+        self.id = job_id
+        self.repo = repo
+        # 完整同步后是否删除已取消Star的未绑定用户并复核绑定（预热同步不做）
+        self.reconcile = reconcile
+        self.state = JOB_RUNNING
+        self.pages = 0
+        self.rows_fetched = 0
+        self.rows_written = 0
+        self.total: Optional[int] = None  # 仓库的Star总数（来自仓库信息，可能未知）
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+        self.task: Optional[asyncio.Task] = None
+        # 本次同步开始的时间戳，以及是否完整获取了全部Star用户（完整时才复核绑定）
+        self.synced_at: Optional[float] = None
+        self.complete = False
+        self.audit_stale: Optional[int] = None
+
+    def start(self, total: Optional[int]):
+        self.total = total
+        self.started_at = time.monotonic()
+
+    def page_done(self, rows: int):
+        self.pages += 1
+        self.rows_fetched += rows
+
+    def finish(self, state: str):
+        self.state = state
+        self.finished_at = time.monotonic()
+
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed()
+        return self.rows_fetched / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rows_per_second()
+        if self.state != JOB_RUNNING or not self.total or rate <= 0:
+            return None
+        return max(self.total - self.rows_fetched, 0) / rate
+
+    def describe(self) -> str:
+        progress = f"{self.rows_fetched}/{self.total}" if self.total else f"{self.rows_fetched}"
+        line = (
+            f"#{self.id} {self.repo} [{_STATE_LABELS.get(self.state, self.state)}] "
+            f"{self.pages} 页，获取 {progress}，写入 {self.rows_written}，"
+            f"{self.rows_per_second():.0f} 行/秒，用时 {self.elapsed():.0f}s"
+        )
+        eta = self.eta_seconds()
+        if eta is not None:
+            line += f"，预计剩余 {eta:.0f}s"
+        if not self.reconcile:
+            line += "，不复核"
+        if self.audit_stale is not None:
+            line += f"，复核发现 {self.audit_stale} 个已取消Star的绑定"
+        if self.cancel_requested and self.state == JOB_RUNNING:
+            line += "（正在取消）"
+        return line
+
+
+class SyncJobManager:
+    """在后台运行同步任务，保留最近 history 个已结束的任务供查询"""
+
+    def __init__(self, runner: Callable[[SyncJob], Awaitable[bool]], history: int = 20):
+        self.runner = runner
+        self.history = history
+        self._ids = itertools.count(1)
+        self._jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+
+    def running_job(self, repo: str) -> Optional[SyncJob]:
+        for job in self._jobs.values():
+            if job.repo == repo and job.state == JOB_RUNNING:
+                return job
+        return None
+
+    def start(self, repo: str, reconcile: bool = True) -> SyncJob:
+        """启动同步任务；同一仓库已有运行中的任务时直接返回该任务（需要时改为复核）"""
+        existing = self.running_job(repo)
+        if existing:
+            existing.reconcile = existing.reconcile or reconcile
+            return existing
+        job = SyncJob(repo, str(next(self._ids)), reconcile=reconcile)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job))
+        self._trim()
+        return job
+
+    async def _run(self, job: SyncJob):
+        try:
+            success = await self.runner(job)
+            if job.cancel_requested:
+                job.finish(JOB_CANCELLED)
+            else:
+                job.finish(JOB_DONE if success else JOB_FAILED)
+        except asyncio.CancelledError:
+            job.finish(JOB_CANCELLED)
+            raise
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 同步任务 #{job.id} 异常: {e}")
+            job.finish(JOB_FAILED)
+        logger.info(f"[GitHub Star Verify] 同步任务结束: {job.describe()}")
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.state != JOB_RUNNING]
+        for job_id in finished[: max(len(finished) - self.history, 0)]:
+            self._jobs.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[SyncJob]:
+        return self._jobs.get(job_id.lstrip("#"))
+
+    def cancel(self, job_id: str) -> Optional[SyncJob]:
+        """请求在下一个页边界停止任务，已获取的数据会写入数据库"""
+        job = self.get(job_id)
+        if job and job.state == JOB_RUNNING:
+            job.cancel_requested = True
+        return job
+
+    def jobs(self) -> List[SyncJob]:
+        return list(self._jobs.values())
+
+    async def close(self):
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
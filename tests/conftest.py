@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+
+# 插件以包的形式加载（模块间使用相对导入），包名即仓库目录名
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+PACKAGE = os.path.basename(ROOT)
+
+
+def load(module: str):
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def storage(request, tmp_path):
+    """两种存储后端各运行一次"""
+    storage_module = load("storage")
+    if request.param == "sqlite":
+        backend = storage_module.SQLiteStarStorage(str(tmp_path / "github_stars.db"))
+    else:
+        backend = storage_module.MemoryStarStorage()
+    run(backend.init())
+    return backend
+
+
+class FakeApi:
+    """记录机器人 API 调用，按动作名返回预设结果"""
+
+    def __init__(self):
+        self.calls = []
+        self.results = {"get_group_member_info": {"role": "admin"}}
+
+    async def call_action(self, action, **params):
+        self.calls.append((action, params))
+        return self.results.get(action, {})
+
+    def actions(self, name):
+        return [params for action, params in self.calls if action == name]
+
+
+class FakeBot:
+    def __init__(self):
+        self.api = FakeApi()
+
+
+class FakeContext:
+    def __init__(self, bot):
+        self.bot = bot
+
+    def get_platform(self, name):
+        return self
+
+    def get_client(self):
+        return self.bot
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    """内存存储的插件实例，数据目录指向临时目录；配置可在创建后修改"""
+    main = load("main")
+
+    def get_data_dir(name):
+        path = tmp_path / name
+        path.mkdir(exist_ok=True)
+        return path
+
+    monkeypatch.setattr(main.StarTools, "get_data_dir", get_data_dir)
+    config = {
+        "github_token": "token",
+        "github_repo": "o/r",
+        "storage_backend": "memory",
+        "warmup_on_load": False,
+        "webhook_secret": "secret",
+    }
+    return main.GitHubStarVerifyPlugin(FakeContext(FakeBot()), config)
+
+
+class FakeMessage:
+    def __init__(self, raw_message):
+        self.raw_message = raw_message
+
+
+class FakeEvent:
+    """AstrMessageEvent 的最小替身，raw 为 OneBot 原始事件"""
+
+    def __init__(self, bot, raw, text=""):
+        self.bot = bot
+        self.message_obj = FakeMessage(raw)
+        self.message_str = text
+        self.stopped = False
+
+    def get_self_id(self):
+        return "999"
+
+    def get_sender_id(self):
+        return str(self.message_obj.raw_message.get("user_id"))
+
+    def get_group_id(self):
+        return str(self.message_obj.raw_message.get("group_id"))
+
+    def stop_event(self):
+        self.stopped = True
@@ -0,0 +1,38 @@
+from conftest import load, run
+
+etag_cache = load("etag_cache")
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = etag_cache.MemoryStarredPageCache(max_entries=2)
+    run(cache.put("a", '"1"', None, ["o/a"], False))
+    run(cache.put("b", '"2"', None, ["o/b"], True))
+    run(cache.touch("a"))
+    run(cache.put("c", None, "Mon, 19 Oct 2026 00:00:00 GMT", ["o/c"], False))
+
+    assert run(cache.get("b")) is None
+    assert run(cache.get("a")) == ('"1"', None, ["o/a"], False)
+    assert run(cache.get("c")) == (None, "Mon, 19 Oct 2026 00:00:00 GMT", ["o/c"], False)
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.path == ""
+
+
+def test_sqlite_cache_reuses_one_connection(tmp_path):
+    async def scenario():
+        cache = etag_cache.StarredPageCache(str(tmp_path / "cache" / "http_cache.db"))
+        await cache.put("a", '"1"', None, ["o/a"], True)
+        conn = cache._conn
+        await cache.touch("a")
+        page = await cache.get("a")
+        assert cache._conn is conn
+        await cache.close()
+        assert cache._conn is None
+
+        # 关闭后再次使用会重新打开连接，数据仍在磁盘上
+        reopened = await cache.get("a")
+        await cache.close()
+        return page, reopened
+
+    page, reopened = run(scenario())
+    assert page == ('"1"', None, ["o/a"], True)
+    assert reopened == page
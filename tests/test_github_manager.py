@@ -0,0 +1,188 @@
+import time
+
+import httpx
+import pytest
+
+from conftest import load, run
+
+github_manager = load("github_manager")
+storage_module = load("storage")
+sync_jobs = load("sync_jobs")
+fake_github = load("benchmarks.fake_github")
+
+
+@pytest.fixture(autouse=True)
+def no_page_delay(monkeypatch):
+    monkeypatch.setattr(github_manager.GitHubStarManager, "page_delay", 0)
+
+
+def _sync_with_leftovers(storage, handler, job=None, **options):
+    """预置一个未绑定的旧用户 gone 与一个已绑定的 kept，用 handler 模拟 GitHub 同步 o/r"""
+
+    async def scenario():
+        multi = github_manager.MultiRepoGitHubStarManager(
+            "token",
+            "o/r",
+            {},
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            storage=storage,
+            use_snapshot=False,
+            **options,
+        )
+        try:
+            await storage.upsert_stargazers("o/r", ["gone", "kept"], time.time() - 60)
+            assert await storage.bind("o/r", "kept", "1")
+            sync_job = job or sync_jobs.SyncJob("o/r")
+            success = await multi.sync_stargazers_for_repo("o/r", sync_job)
+            return success, sync_job
+        finally:
+            await multi.close()
+
+    return run(scenario())
+
+
+def _unstars(storage):
+    today = storage_module.day_of(time.time())
+    return run(storage.daily_stats("o/r", today, today)).get((today, storage_module.METRIC_UNSTARS), 0)
+
+
+def _assert_nothing_reconciled(storage, job):
+    assert not job.complete
+    assert run(storage.is_stargazer("o/r", "gone"))
+    assert run(storage.get_bindings("qq_id", "1", ["o/r"])) == {"o/r": "kept"}
+    assert _unstars(storage) == 0
+
+
+def test_bind_after_case_insensitive_snapshot_hit(storage):
+    # 同步保存的是规范写法 "Alice"，快照按小写匹配，用户输入 "alice" 也应能绑定
+    async def scenario():
+        multi = github_manager.MultiRepoGitHubStarManager("token", "o/r", {}, storage=storage)
+        try:
+            synced_at = time.time()
+            await storage.upsert_stargazers("o/r", ["Alice"], synced_at)
+            await multi.get_manager_for_repo("o/r").write_snapshot(synced_at)
+            assert await multi.is_stargazer("alice", "o/r")
+            assert await multi.bind_github_qq_to_repo("alice", "123", "o/r")
+            assert await multi.is_qq_bound_to_repo("123", "o/r") == "Alice"
+            assert await multi.is_github_id_bound_to_repo("ALICE", "o/r") == "123"
+        finally:
+            await multi.close()
+
+    run(scenario())
+
+
+def test_complete_sync_removes_unbound_unstarred_users(storage):
+    fake = fake_github.FakeGitHub()
+    fake.add_repo("o/r", 3)
+
+    success, job = _sync_with_leftovers(storage, fake.handle_sync)
+
+    assert success and job.complete
+    assert not run(storage.is_stargazer("o/r", "gone"))
+    assert _unstars(storage) == 1
+    # 已绑定的用户留给复核处理
+    assert run(storage.stale_bindings("o/r", job.synced_at)) == [("kept", "1")]
+    assert run(storage.count_stars("o/r")) == 4
+
+
+def test_cancelled_sync_removes_nothing(storage):
+    fake = fake_github.FakeGitHub()
+    fake.add_repo("o/r", 250)
+    job = sync_jobs.SyncJob("o/r")
+
+    def handler(request):
+        if request.url.params.get("page") == "2":
+            job.cancel_requested = True
+        return fake.handle_sync(request)
+
+    success, job = _sync_with_leftovers(storage, handler, job=job)
+
+    assert success and job.rows_written == 200
+    _assert_nothing_reconciled(storage, job)
+
+
+def test_unparseable_page_is_not_a_complete_sync(storage):
+    fake = fake_github.FakeGitHub()
+    fake.add_repo("o/r", 250)
+
+    def handler(request):
+        if request.url.path.endswith("/stargazers") and request.url.params.get("page") == "2":
+            return httpx.Response(200, content=b'[{"login": "user100"')
+        return fake.handle_sync(request)
+
+    success, job = _sync_with_leftovers(storage, handler)
+
+    assert success and job.rows_fetched == 100
+    _assert_nothing_reconciled(storage, job)
+
+
+def test_unknown_star_total_is_not_a_complete_sync(storage):
+    fake = fake_github.FakeGitHub()
+    fake.add_repo("o/r", 3)
+
+    def handler(request):
+        if request.url.path == "/repos/o/r":
+            return httpx.Response(502, json={"message": "Bad Gateway"})
+        return fake.handle_sync(request)
+
+    success, job = _sync_with_leftovers(storage, handler)
+
+    assert success and job.total is None and job.rows_fetched == 3
+    _assert_nothing_reconciled(storage, job)
+
+
+def test_failed_batch_write_fails_the_sync(storage, monkeypatch):
+    fake = fake_github.FakeGitHub()
+    fake.add_repo("o/r", 250)
+    upsert = storage.upsert_stargazers
+
+    async def flaky_upsert(repo, github_ids, *args):
+        github_ids = list(github_ids)
+        if "user100" in github_ids:
+            raise RuntimeError("database is locked")
+        return await upsert(repo, github_ids, *args)
+
+    monkeypatch.setattr(storage, "upsert_stargazers", flaky_upsert)
+    success, job = _sync_with_leftovers(storage, fake.handle_sync, sync_batch_size=100)
+
+    assert not success and job.rows_written == 100
+    _assert_nothing_reconciled(storage, job)
+    assert not run(storage.is_stargazer("o/r", "user100"))
+
+
+def test_fetch_streams_pages_without_keeping_the_list():
+    fake = fake_github.FakeGitHub()
+    fake.add_repo("o/r", 250)
+    pages = []
+
+    async def on_page(page, logins, starred_at):
+        pages.append((page, len(logins), len(starred_at)))
+        return True
+
+    async def scenario():
+        async with fake.client() as client:
+            manager = github_manager.GitHubStarManager(
+                "token", "o/r", client, storage=storage_module.MemoryStarStorage(), use_snapshot=False
+            )
+            streamed = await manager.fetch_stargazers(on_page)
+            streamed_count = manager.last_fetch_count
+            collected = await manager.fetch_stargazers()
+            return streamed, streamed_count, collected, manager.last_fetch_complete
+
+    streamed, streamed_count, collected, complete = run(scenario())
+    assert streamed == [] and streamed_count == 250
+    assert pages == [(1, 100, 100), (2, 100, 100), (3, 50, 50)]
+    assert collected == [f"user{i}" for i in range(250)] and complete
+
+
+def test_warm_up_sync_does_not_reconcile(storage):
+    fake = fake_github.FakeGitHub()
+    fake.add_repo("o/r", 3)
+
+    success, job = _sync_with_leftovers(
+        storage, fake.handle_sync, job=sync_jobs.SyncJob("o/r", reconcile=False)
+    )
+
+    assert success and job.complete
+    assert run(storage.is_stargazer("o/r", "gone"))
+    assert _unstars(storage) == 0
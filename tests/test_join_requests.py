@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from conftest import FakeEvent, run
+
+
+def _join_request(plugin, uid, comment=""):
+    return FakeEvent(
+        plugin.context.bot,
+        {
+            "post_type": "request",
+            "request_type": "group",
+            "sub_type": "add",
+            "user_id": uid,
+            "group_id": 5,
+            "comment": comment,
+            "flag": f"flag-{uid}",
+        },
+    )
+
+
+@pytest.fixture
+def answers(plugin):
+    """依次处理给定的加群申请，返回每个申请的 (是否同意, 拒绝理由)"""
+
+    def process(setup, *requests):
+        async def scenario():
+            try:
+                assert await plugin._ensure_github_manager()
+                await setup(plugin.github_manager.storage)
+                for uid, comment in requests:
+                    await plugin._process_join_request(_join_request(plugin, uid, comment))
+                await plugin.verification_pool.close()
+            finally:
+                await plugin.terminate()
+
+        run(scenario())
+        calls = plugin.context.bot.api.actions("set_group_add_request")
+        return [(call["approve"], call.get("reason")) for call in calls]
+
+    return process
+
+
+def test_bound_member_rejoins_without_username(answers):
+    async def setup(storage):
+        await storage.upsert_stargazers("o/r", ["alice"], time.time())
+        assert await storage.bind("o/r", "alice", "1")
+
+    (approved, _), (rejected, reason) = answers(setup, ("1", ""), ("2", ""))
+    assert approved and not rejected
+    assert "未填写有效的GitHub用户名" in reason
+
+
+def test_cross_repo_binding_approves_without_username(answers):
+    bindings = {}
+
+    async def setup(storage):
+        bindings["storage"] = storage
+        await storage.upsert_stargazers("o/other", ["alice"], time.time())
+        assert await storage.bind("o/other", "alice", "1")
+        await storage.upsert_stargazers("o/r", ["alice"], time.time())
+
+    assert answers(setup, ("1", "问题：GitHub用户名\n答案：")) == [(True, None)]
+    assert run(bindings["storage"].get_bindings("qq_id", "1", ["o/r"])) == {"o/r": "alice"}
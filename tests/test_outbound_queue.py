@@ -0,0 +1,39 @@
+from conftest import FakeBot, load, run
+
+outbound_queue = load("outbound_queue")
+
+
+def test_idle_group_buckets_are_evicted():
+    async def scenario():
+        queue = outbound_queue.OutboundMessageQueue(rate=1.0, burst=1)
+        bot = FakeBot()
+
+        await queue.send(bot, 1, "hello")
+        assert set(queue._buckets) == {1}
+
+        # 群1的令牌尚未回满，仍在限速中，不能清理
+        queue._buckets_swept_at = float("-inf")
+        await queue.send(bot, 2, "hello")
+        assert set(queue._buckets) == {1, 2}
+
+        queue._buckets[1].tokens = 1.0
+        queue._buckets_swept_at = float("-inf")
+        await queue.send(bot, 3, "hello")
+        return set(queue._buckets), queue._queues, queue._workers, bot.api.actions("send_group_msg")
+
+    buckets, queues, workers, sent = run(scenario())
+    assert buckets == {2, 3}
+    assert queues == {} and workers == {}
+    assert [params["group_id"] for params in sent] == [1, 2, 3]
+
+
+def test_eviction_is_rate_limited_to_refill_period():
+    async def scenario():
+        queue = outbound_queue.OutboundMessageQueue(rate=1.0, burst=1)
+        bot = FakeBot()
+        await queue.send(bot, 1, "hello")
+        queue._buckets[1].tokens = 1.0
+        await queue.send(bot, 2, "hello")
+        return set(queue._buckets)
+
+    assert run(scenario()) == {1, 2}
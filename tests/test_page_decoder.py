@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from conftest import load
+
+page_decoder = load("page_decoder")
+fake_github = load("benchmarks.fake_github")
+
+STARRED_AT = "2024-01-01T00:00:00Z"
+
+
+def _full_parse(content):
+    """不走快速路径的参照结果"""
+    logins, times = [], []
+    for item in json.loads(content):
+        user = item.get("user") if "starred_at" in item else item
+        if user and user.get("login"):
+            logins.append(user["login"])
+            times.append(page_decoder.parse_timestamp(item.get("starred_at")))
+    return logins, times
+
+
+def _user(login, **fields):
+    user = fake_github._user_object(login, 1)
+    user.update(fields)
+    return user
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        [{"starred_at": STARRED_AT, "user": _user("alice")}, {"starred_at": None, "user": _user("Bob")}],
+        [_user("alice"), _user("bob-2")],
+        # 字符串值中出现 "login" 时被转义，不会被误认为用户名
+        [{"starred_at": STARRED_AT, "user": _user("carol", bio='say "login": "mallory"')}],
+        # 条目缺少用户（账号已删除）时，starred_at 与 login 数量不一致，回退为完整解析
+        [{"starred_at": STARRED_AT, "user": None}, {"starred_at": STARRED_AT, "user": _user("dave")}],
+    ],
+)
+def test_stargazers_fast_path_matches_full_parse(body):
+    content = json.dumps(body, indent=1).encode()
+    assert page_decoder.parse_stargazers(content) == _full_parse(content)
+
+
+def test_stargazers_empty_and_truncated_pages():
+    assert page_decoder.parse_stargazers(b" [] \n") == ([], [])
+    truncated = json.dumps([{"starred_at": STARRED_AT, "user": _user("alice")}]).encode()[:-40]
+    with pytest.raises(ValueError):
+        page_decoder.parse_stargazers(truncated)
+
+
+def test_parse_timestamp():
+    assert page_decoder.parse_timestamp(STARRED_AT) == 1704067200.0
+    assert page_decoder.parse_timestamp(None) is None
+    assert page_decoder.parse_timestamp("yesterday") is None
+
+
+def _starred_page(*full_names):
+    return json.dumps(
+        [{"starred_at": STARRED_AT, "repo": fake_github._repo_object(name, i)} for i, name in enumerate(full_names)]
+    ).encode()
+
+
+def test_find_starred_repo():
+    content = _starred_page("a/one", "o/r", "b/two")
+    assert page_decoder.find_starred_repo(content, "o/r") == (3, True, STARRED_AT)
+    # 仓库名只出现在其他仓库的字段中时仍需完整解析确认
+    assert page_decoder.find_starred_repo(_starred_page("x/r", "y/z"), "o/r") == (2, False, None)
+    assert page_decoder.find_starred_repo(_starred_page("a/one"), "o/r") == (1, False, None)
+    assert page_decoder.find_starred_repo(b"[]", "o/r") == (0, False, None)
+    with pytest.raises(ValueError):
+        page_decoder.find_starred_repo(content[:-10], "o/missing")
+
+
+def test_starred_full_names():
+    assert page_decoder.starred_full_names(_starred_page("a/one", "o/r")) == ["a/one", "o/r"]
+    assert page_decoder.starred_full_names(b"[]") == []
+    with pytest.raises(ValueError):
+        page_decoder.starred_full_names(_starred_page("a/one", "o/r")[:-10])
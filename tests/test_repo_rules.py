@@ -0,0 +1,53 @@
+from conftest import load
+
+repo_rules = load("repo_rules")
+parse_repo_rule = repo_rules.parse_repo_rule
+
+
+def test_single_repo_is_plain_any_rule():
+    rule = parse_repo_rule("  owner/repo ")
+    assert rule == repo_rules.RepoRule(repo_rules.RULE_ANY, ("owner/repo",))
+    assert not rule.is_compound
+    assert str(rule) == "owner/repo"
+    assert rule.satisfied(["owner/repo"])
+    assert not rule.satisfied(["owner/other"])
+
+
+def test_empty_text_has_no_repos():
+    for text in ("", "   ", None):
+        rule = parse_repo_rule(text)
+        assert rule.repos == ()
+        assert str(rule) == ""
+        assert not rule.satisfied(["owner/repo"])
+
+
+def test_any_rule_needs_one_repo():
+    rule = parse_repo_rule("ANY( owner/a , owner/b,owner/a, )")
+    assert rule.mode == repo_rules.RULE_ANY
+    assert rule.repos == ("owner/a", "owner/b")
+    assert rule.is_compound
+    assert str(rule) == "any(owner/a, owner/b)"
+    assert rule.satisfied({"owner/b"})
+    assert not rule.satisfied(set())
+
+
+def test_all_rule_needs_every_repo():
+    rule = parse_repo_rule(" all(owner/a, owner/b) ")
+    assert rule.mode == repo_rules.RULE_ALL
+    assert rule.repos == ("owner/a", "owner/b")
+    assert str(rule) == "all(owner/a, owner/b)"
+    assert rule.satisfied(["owner/b", "owner/a", "owner/c"])
+    assert not rule.satisfied(["owner/a"])
+
+
+def test_compound_rule_with_one_repo_is_not_compound():
+    rule = parse_repo_rule("all(owner/a)")
+    assert rule.mode == repo_rules.RULE_ALL
+    assert not rule.is_compound
+    assert str(rule) == "owner/a"
+
+
+def test_unknown_mode_is_taken_as_repo_name():
+    rule = parse_repo_rule("some(owner/a, owner/b)")
+    assert rule.mode == repo_rules.RULE_ANY
+    assert rule.repos == ("some(owner/a, owner/b)",)
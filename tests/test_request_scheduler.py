@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from conftest import load, run
+
+request_scheduler = load("request_scheduler")
+LANE_BULK = request_scheduler.LANE_BULK
+LANE_INTERACTIVE = request_scheduler.LANE_INTERACTIVE
+
+
+async def _request(scheduler, lane, order, name, gate=None):
+    async with scheduler.slot(lane):
+        order.append(name)
+        if gate is not None:
+            await gate.wait()
+
+
+def test_interactive_lane_goes_before_queued_bulk():
+    async def scenario():
+        scheduler = request_scheduler.RequestScheduler(max_concurrency=1)
+        order, gate = [], asyncio.Event()
+        holder = asyncio.create_task(_request(scheduler, LANE_INTERACTIVE, order, "holder", gate))
+        await asyncio.sleep(0)
+        bulk = asyncio.create_task(_request(scheduler, LANE_BULK, order, "bulk"))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(_request(scheduler, LANE_INTERACTIVE, order, "interactive"))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(holder, bulk, interactive)
+        return order
+
+    assert run(scenario()) == ["holder", "interactive", "bulk"]
+
+
+def test_bulk_concurrency_leaves_room_for_interactive():
+    async def scenario():
+        scheduler = request_scheduler.RequestScheduler(max_concurrency=4, bulk_concurrency=1)
+        order, gate = [], asyncio.Event()
+        first = asyncio.create_task(_request(scheduler, LANE_BULK, order, "bulk-1", gate))
+        second = asyncio.create_task(_request(scheduler, LANE_BULK, order, "bulk-2"))
+        await asyncio.sleep(0.01)
+        # 批量并发已满，第二个批量请求排队，交互请求不受影响
+        await _request(scheduler, LANE_INTERACTIVE, order, "interactive")
+        started = list(order)
+        gate.set()
+        await asyncio.gather(first, second)
+        return started, order, scheduler.summary()
+
+    started, order, summary = run(scenario())
+    assert started == ["bulk-1", "interactive"]
+    assert order == ["bulk-1", "interactive", "bulk-2"]
+    assert summary.startswith("进行中 0（同步 0）")
+
+
+def test_bulk_requests_are_spaced_by_interval():
+    async def scenario():
+        scheduler = request_scheduler.RequestScheduler(bulk_interval=0.05)
+        order = []
+        start = time.monotonic()
+        await _request(scheduler, LANE_BULK, order, "first")
+        await _request(scheduler, LANE_BULK, order, "second")
+        return time.monotonic() - start
+
+    assert run(scenario()) >= 0.05
+
+
+def test_bulk_yields_while_budget_is_below_reserve():
+    async def scenario():
+        scheduler = request_scheduler.RequestScheduler(reserve=100)
+        scheduler.update_rate_limit("10", str(int(time.time()) + 60))
+        order = []
+        bulk = asyncio.create_task(_request(scheduler, LANE_BULK, order, "bulk"))
+        await asyncio.sleep(0.01)
+        paused = list(order)
+
+        # 交互请求照常发出；其响应带来重置后的配额，释放时唤醒批量请求重新判断
+        async with scheduler.slot(LANE_INTERACTIVE):
+            order.append("interactive")
+            scheduler.update_rate_limit("5000", str(int(time.time()) + 3600))
+        await asyncio.wait_for(bulk, timeout=1)
+        return paused, order
+
+    paused, order = run(scenario())
+    assert paused == []
+    assert order == ["interactive", "bulk"]
+
+
+def test_rate_limit_headers_ignore_invalid_values():
+    scheduler = request_scheduler.RequestScheduler()
+    scheduler.update_rate_limit("42", "1700000000")
+    scheduler.update_rate_limit("n/a", None)
+    assert (scheduler.remaining, scheduler.reset_at) == (42, 1700000000.0)
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from conftest import load
+
+stargazer_snapshot = load("stargazer_snapshot")
+
+
+@pytest.fixture
+def stat_calls(monkeypatch):
+    """统计对快照文件的 os.stat 调用"""
+    calls = []
+    stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        if str(path).endswith(".idx"):
+            calls.append(path)
+        return stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(stargazer_snapshot.os, "stat", counting_stat)
+    return calls
+
+
+def test_lookup_is_case_insensitive_and_honours_discard(tmp_path):
+    path = str(tmp_path / "o__r.idx")
+    assert stargazer_snapshot.write_snapshot(path, ["Bob", "alice", "bob", ""]) == 2
+    snapshot = stargazer_snapshot.StargazerSnapshot(path)
+
+    assert snapshot.load() == 2
+    assert snapshot.contains("ALICE") and snapshot.contains("bob")
+    assert not snapshot.contains("carol")
+    snapshot.discard("Bob")
+    assert not snapshot.contains("bob")
+    snapshot.close()
+
+
+@pytest.mark.parametrize("content", [None, b"not a snapshot", b"GS"])
+def test_missing_or_corrupt_file_is_rechecked_once_per_interval(tmp_path, stat_calls, content):
+    path = tmp_path / "o__r.idx"
+    if content is not None:
+        path.write_bytes(content)
+    snapshot = stargazer_snapshot.StargazerSnapshot(str(path))
+    snapshot.recheck_interval = 60
+
+    for _ in range(100):
+        assert not snapshot.contains("alice")
+    assert len(stat_calls) == 1
+    snapshot.close()
+
+
+def test_invalidate_picks_up_a_rewritten_file(tmp_path, stat_calls):
+    path = str(tmp_path / "o__r.idx")
+    stargazer_snapshot.write_snapshot(path, ["alice"])
+    snapshot = stargazer_snapshot.StargazerSnapshot(path)
+    snapshot.recheck_interval = 60
+    assert snapshot.contains("alice")
+
+    snapshot.close()
+    stargazer_snapshot.write_snapshot(path, ["alice", "bob"])
+    assert not snapshot.contains("bob")  # 检查间隔内不访问文件
+    snapshot.invalidate()
+    assert snapshot.contains("bob")
+    assert len(stat_calls) == 2
+    snapshot.close()
@@ -0,0 +1,171 @@
+import sqlite3
+import time
+
+import pytest
+
+from conftest import load, run
+
+storage_module = load("storage")
+
+
+def test_login_case_shares_one_record(storage):
+    # 用户输入 "bob" 经 API 确认后保存，之后同步返回规范写法 "Bob"
+    run(storage.record_stargazer("o/r", "bob"))
+    assert run(storage.bind("o/r", "bob", "456"))
+    synced_at = time.time()
+    assert run(storage.upsert_stargazers("o/r", ["Bob", "alice"], synced_at)) == 1
+
+    assert run(storage.count_stars("o/r")) == 2
+    assert run(storage.stale_bindings("o/r", synced_at)) == []
+    assert run(storage.get_bindings("qq_id", "456", ["o/r"])) == {"o/r": "Bob"}
+    assert run(storage.is_stargazer("o/r", "ALICE"))
+
+
+def test_upsert_counts_only_new_rows(storage):
+    assert run(storage.upsert_stargazers("o/r", ["a", "b"], time.time())) == 2
+    assert run(storage.upsert_stargazers("o/r", ["a", "b", "c"], time.time())) == 1
+    assert run(storage.upsert_stargazers("o/s", ["a"], time.time())) == 1
+
+
+def test_sqlite_migration_merges_case_duplicates(tmp_path):
+    path = str(tmp_path / "github_stars.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE github_stars (
+            github_id TEXT NOT NULL, repo TEXT NOT NULL, qq_id TEXT,
+            created_at INTEGER NOT NULL, updated_at INTEGER NOT NULL, seen_at REAL,
+            PRIMARY KEY (github_id, repo)
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO github_stars VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("bob", "o/r", "456", 100, 200, None),
+            ("Bob", "o/r", None, 150, 150, 300.0),
+            ("carol", "o/r", None, 100, 100, 50.0),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    storage = storage_module.SQLiteStarStorage(path)
+    run(storage.init())
+    rows = [row for page in _collect(storage.iter_rows()) for row in page]
+    assert [row[:6] for row in rows] == [
+        ("Bob", "o/r", "456", 100, 200, 300.0),
+        ("carol", "o/r", None, 100, 100, 50.0),
+    ]
+    assert run(storage.stale_bindings("o/r", 250.0)) == []
+
+
+def _collect(iterator):
+    async def collect():
+        return [page async for page in iterator]
+
+    return run(collect())
+
+
+def test_import_rejects_second_github_for_same_qq(storage):
+    run(storage.upsert_stargazers("o/r", ["alice", "bob"], time.time()))
+    assert run(storage.bind("o/r", "alice", "1"))
+    now = int(time.time())
+    rows = [
+        ("bob", "o/r", "1", now, now, None, None),  # QQ 1 已绑定 alice
+        ("carol", "o/r", "2", now, now, None, None),
+        ("dave", "o/r", "2", now, now, None, None),  # 与本批更早的 carol 冲突
+        ("ALICE", "o/r", "1", now, now, None, None),  # 同一用户，仅大小写不同
+    ]
+
+    conflicts = run(storage.import_rows(rows))
+
+    assert [row[0] for row in conflicts] == ["bob", "dave"]
+    assert run(storage.get_bindings("qq_id", "1", ["o/r"])) == {"o/r": "alice"}
+    assert run(storage.get_bindings("qq_id", "2", ["o/r"])) == {"o/r": "carol"}
+    assert run(storage.count_bound("o/r")) == 2
+
+
+def _stats(storage, repo, *days):
+    counts = run(storage.daily_stats(repo, min(days), max(days)))
+    return {key: count for key, count in counts.items() if count}
+
+
+def test_daily_stats_follow_stars_binds_and_unstars(storage):
+    now = time.time()
+    earlier = now - 3 * 86400
+    today, star_day = storage_module.day_of(now), storage_module.day_of(earlier)
+    run(storage.upsert_stargazers("o/r", ["a", "b", "c"], now, {"a": earlier}))
+    # 之后才获得 b 的实际Star时间：计数移到对应日期
+    run(storage.upsert_stargazers("o/r", ["b"], now, {"b": earlier}))
+    assert run(storage.bind("o/r", "a", "1"))
+    # 完整同步中只出现 a、b：未绑定的 c 视为已取消Star
+    run(storage.upsert_stargazers("o/r", ["a", "b"], now + 1))
+    assert run(storage.remove_unstarred("o/r", now + 1)) == 1
+
+    assert run(storage.count_stars("o/r")) == 2
+    assert _stats(storage, "o/r", star_day, today) == {
+        (star_day, storage_module.METRIC_STARS): 2,
+        (today, storage_module.METRIC_STARS): 1,
+        (today, storage_module.METRIC_BINDS): 1,
+        (today, storage_module.METRIC_UNSTARS): 1,
+    }
+
+
+def test_remove_unstarred_keeps_bound_and_recent_rows(storage):
+    run(storage.upsert_stargazers("o/r", ["bound", "gone"], 100.0))
+    assert run(storage.bind("o/r", "bound", "1"))
+    run(storage.record_stargazer("o/r", "checked"))  # 同步开始后经 API 确认
+
+    assert run(storage.remove_unstarred("o/r", 200.0)) == 1
+    assert not run(storage.is_stargazer("o/r", "gone"))
+    assert run(storage.is_stargazer("o/r", "bound"))
+    assert run(storage.is_stargazer("o/r", "checked"))
+    assert run(storage.stale_bindings("o/r", 200.0)) == [("bound", "1")]
+
+
+def test_sqlite_daily_stats_backfilled_from_existing_rows(tmp_path):
+    path = str(tmp_path / "github_stars.db")
+    earlier = time.time() - 3 * 86400
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE github_stars (
+            github_id TEXT NOT NULL, repo TEXT NOT NULL, qq_id TEXT,
+            created_at INTEGER NOT NULL, updated_at INTEGER NOT NULL, seen_at REAL,
+            starred_at REAL,
+            PRIMARY KEY (github_id, repo)
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO github_stars VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("a", "o/r", "1", int(earlier), int(earlier), earlier, None),
+            ("b", "o/r", None, int(earlier), int(earlier), earlier, earlier - 86400),
+            ("c", "o/s", None, int(earlier), int(earlier), earlier, None),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    storage = storage_module.SQLiteStarStorage(path)
+    run(storage.init())
+    run(storage.init())  # 再次启动不重复回填
+
+    day, day_before = storage_module.day_of(earlier), storage_module.day_of(earlier - 86400)
+    assert _stats(storage, "o/r", day_before, day) == {
+        (day, storage_module.METRIC_STARS): 1,
+        (day_before, storage_module.METRIC_STARS): 1,
+        (day, storage_module.METRIC_BINDS): 1,
+    }
+    assert _stats(storage, "o/s", day, day) == {(day, storage_module.METRIC_STARS): 1}
+
+
+def test_incomplete_backend_fails_at_construction():
+    class PartialStorage(storage_module.StarStorage):
+        async def init(self):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialStorage()
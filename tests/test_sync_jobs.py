@@ -0,0 +1,28 @@
+import asyncio
+
+from conftest import load, run
+
+sync_jobs = load("sync_jobs")
+
+
+def test_manual_sync_joining_a_warm_up_job_enables_reconciliation():
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def runner(job):
+            await gate.wait()
+            return True
+
+        manager = sync_jobs.SyncJobManager(runner)
+        try:
+            warm_up = manager.start("o/r", reconcile=False)
+            assert not warm_up.reconcile
+            assert manager.start("o/r") is warm_up and warm_up.reconcile
+            assert manager.start("o/r", reconcile=False).reconcile
+            gate.set()
+            await warm_up.task
+            return warm_up.state
+        finally:
+            await manager.close()
+
+    assert run(scenario()) == sync_jobs.JOB_DONE
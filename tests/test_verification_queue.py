@@ -0,0 +1,75 @@
+import asyncio
+
+from conftest import load, run
+
+verification_queue = load("verification_queue")
+
+
+def _recorder(ran, name, gate=None):
+    async def job():
+        if gate is not None:
+            await gate.wait()
+        ran.append(name)
+
+    return job
+
+
+def test_resubmission_replaces_queued_job():
+    async def scenario():
+        pool = verification_queue.VerificationWorkerPool(workers=1)
+        ran, gate = [], asyncio.Event()
+        try:
+            assert pool.submit("a", _recorder(ran, "a", gate)) == verification_queue.JOB_QUEUED
+            assert pool.submit("b", _recorder(ran, "b-typo")) == verification_queue.JOB_QUEUED
+            await asyncio.sleep(0)
+            assert pool.submit("b", _recorder(ran, "b-fixed")) == verification_queue.JOB_REPLACED
+            assert pool.in_flight() == 2
+            gate.set()
+            await pool._queue.join()
+            return ran, pool.in_flight()
+        finally:
+            await pool.close()
+
+    assert run(scenario()) == (["a", "b-fixed"], 0)
+
+
+def test_resubmission_while_running_runs_afterwards():
+    async def scenario():
+        pool = verification_queue.VerificationWorkerPool(workers=2)
+        ran, gate = [], asyncio.Event()
+        try:
+            pool.submit("a", _recorder(ran, "a-typo", gate))
+            await asyncio.sleep(0)
+            assert pool.submit("a", _recorder(ran, "a-1")) == verification_queue.JOB_REPLACED
+            assert pool.submit("a", _recorder(ran, "a-2")) == verification_queue.JOB_REPLACED
+            gate.set()
+            await pool._queue.join()
+            return ran
+        finally:
+            await pool.close()
+
+    assert run(scenario()) == ["a-typo", "a-2"]
+
+
+def test_full_queue_rejects_and_failures_do_not_stop_workers():
+    async def scenario():
+        pool = verification_queue.VerificationWorkerPool(workers=1, max_queue=1)
+        ran, gate = [], asyncio.Event()
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        try:
+            pool.submit("a", _recorder(ran, "a", gate))
+            await asyncio.sleep(0)
+            assert pool.submit("b", failing) == verification_queue.JOB_QUEUED
+            assert pool.submit("c", _recorder(ran, "c")) == verification_queue.JOB_REJECTED
+            gate.set()
+            await pool._queue.join()
+            assert pool.submit("c", _recorder(ran, "c")) == verification_queue.JOB_QUEUED
+            await pool._queue.join()
+            return ran
+        finally:
+            await pool.close()
+
+    assert run(scenario()) == ["a", "c"]
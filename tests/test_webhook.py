@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import socket
+
+import pytest
+
+from conftest import load, run
+
+webhook = load("webhook")
+
+SECRET = "secret"
+
+
+def _sign(body, secret=SECRET):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _star_payload(action="created", repo="o/r", login="alice"):
+    return json.dumps(
+        {"action": action, "repository": {"full_name": repo}, "sender": {"login": login}}
+    ).encode()
+
+
+def _server(events=None, secret=SECRET, port=0):
+    async def handler(action, repo, login):
+        if events is None:
+            raise RuntimeError("boom")
+        events.append((action, repo, login))
+
+    return webhook.GitHubWebhookServer(secret, handler, port=port)
+
+
+def _deliver(server, event, body, signature=None, method="POST", path="/github/webhook"):
+    headers = {"x-github-event": event, "x-hub-signature-256": signature or _sign(body)}
+    return run(server.handle_request(method, path, headers, body))
+
+
+def test_verify_signature():
+    body = _star_payload()
+    assert webhook.verify_signature(SECRET, body, _sign(body))
+    assert not webhook.verify_signature(SECRET, body, _sign(body, "other"))
+    assert not webhook.verify_signature(SECRET, body + b" ", _sign(body))
+    assert not webhook.verify_signature(SECRET, body, _sign(body)[len("sha256="):])
+    # 未配置密钥时任何签名都不通过
+    assert not webhook.verify_signature("", body, _sign(body, ""))
+
+
+def test_star_events_are_dispatched():
+    events = []
+    server = _server(events)
+    assert _deliver(server, "star", _star_payload("created")) == ("200 OK", b"ok\n")
+    assert _deliver(server, "star", _star_payload("deleted", login="bob"))[0] == "200 OK"
+    assert _deliver(server, "watch", json.dumps({
+        "action": "started", "repository": {"full_name": "o/r"}, "sender": {"login": "carol"}
+    }).encode())[0] == "200 OK"
+    assert events == [("star", "o/r", "alice"), ("unstar", "o/r", "bob"), ("star", "o/r", "carol")]
+    assert (server.received, server.rejected) == (3, 0)
+
+
+def test_ping_ignored_and_rejected_deliveries():
+    events = []
+    server = _server(events)
+    assert _deliver(server, "ping", b'{"zen": "hi"}') == ("200 OK", b"pong\n")
+    assert _deliver(server, "issues", _star_payload("opened"))[0] == "202 Accepted"
+    assert _deliver(server, "star", _star_payload("edited"))[0] == "202 Accepted"
+    assert _deliver(server, "star", b"{not json")[0] == "400 Bad Request"
+    assert _deliver(server, "star", _star_payload(), signature=_sign(b"other"))[0] == "401 Unauthorized"
+    assert _deliver(server, "star", _star_payload(), method="GET")[0] == "405 Method Not Allowed"
+    assert _deliver(server, "star", _star_payload(), path="/other")[0] == "404 Not Found"
+    assert events == []
+    assert server.rejected == 1
+
+
+def test_handler_failure_returns_500():
+    assert _deliver(_server(None), "star", _star_payload())[0] == "500 Internal Server Error"
+
+
+def test_server_not_started_without_secret():
+    server = _server([], secret="", port=_free_port())
+    run(server.start())
+    assert server._server is None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _http(port, head, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head.encode("latin-1") + b"\r\n" + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response.split(b"\r\n", 1)[0].decode()
+
+
+@pytest.mark.parametrize(
+    "content_length, status",
+    [
+        (str(webhook.MAX_BODY_SIZE + 1), "HTTP/1.1 413 Payload Too Large"),
+        ("12abc", "HTTP/1.1 400 Bad Request"),
+        ("-5", "HTTP/1.1 400 Bad Request"),
+    ],
+)
+def test_http_content_length_checks(content_length, status):
+    events = []
+    server = _server(events, port=_free_port())
+
+    async def scenario():
+        await server.start()
+        try:
+            return await _http(
+                server.port,
+                f"POST /github/webhook HTTP/1.1\r\nContent-Length: {content_length}\r\n",
+            )
+        finally:
+            await server.close()
+
+    assert run(scenario()) == status
+    assert events == []
+
+
+def test_http_signed_delivery():
+    events = []
+    server = _server(events, port=_free_port())
+    body = _star_payload()
+
+    async def scenario():
+        await server.start()
+        try:
+            return await _http(
+                server.port,
+                "POST /github/webhook?x=1 HTTP/1.1\r\n"
+                "X-GitHub-Event: star\r\n"
+                f"X-Hub-Signature-256: {_sign(body)}\r\n"
+                f"Content-Length: {len(body)}\r\n",
+                body,
+            )
+        finally:
+            await server.close()
+
+    assert run(scenario()) == "HTTP/1.1 200 OK"
+    assert events == [("star", "o/r", "alice")]
+
+
+def test_plugin_applies_star_webhook_events(plugin):
+    async def scenario():
+        try:
+            assert await plugin._ensure_github_manager()
+            storage = plugin.github_manager.storage
+            await plugin._handle_star_webhook("star", "o/r", "alice")
+            await plugin._handle_star_webhook("star", "o/r", "bob")
+            await plugin._handle_star_webhook("star", "x/other", "carol")
+            assert await storage.bind("o/r", "bob", "1")
+            await plugin._handle_star_webhook("unstar", "o/r", "alice")
+            await plugin._handle_star_webhook("unstar", "o/r", "bob")
+            return (
+                await storage.is_stargazer("o/r", "alice"),
+                await storage.is_stargazer("o/r", "bob"),
+                await storage.is_stargazer("x/other", "carol"),
+            )
+        finally:
+            await plugin.terminate()
+
+    # 已绑定用户取消Star时保留记录，由复核处理
+    assert run(scenario()) == (False, True, False)
@@ -0,0 +1,174 @@
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+from astrbot.api import logger
+
+# 事件中需要脱敏的QQ号字段
+_ID_FIELDS = ("user_id", "group_id", "self_id", "operator_id", "target_id")
+# 事件中保留的字段（其余如 sender 昵称、群名片等直接丢弃）
+_KEPT_FIELDS = (
+    "post_type",
+    "notice_type",
+    "request_type",
+    "sub_type",
+    "message_type",
+    "time",
+    "comment",
+    "flag",
+) + _ID_FIELDS
+_CQ_AT_RE = re.compile(r"(\[CQ:at,qq=)(\d+)(\])")
+
+
+class TraceRecorder:
+    """生产流量录制：将原始 OneBot 事件与 GitHub API 调用结果写入 gzip 压缩的 JSONL
+
+    QQ号与群号经 HMAC-SHA256 映射为稳定的假名，GitHub 响应只保留回放所需的摘要
+    （状态码、条目数、是否命中目标仓库、是否有下一页、耗时）。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path = ""
+        self._salt = b""
+        self._start = 0.0
+        self._buffer: List[str] = []
+        self.flush_every = 50
+
+    def configure(self, enabled: bool, path: str = "", salt: str = ""):
+        self.enabled = enabled and bool(path)
+        self.path = path
+        # 未配置盐时每次启动随机生成，不同录制之间的假名无法关联
+        self._salt = salt.encode("utf-8") if salt else os.urandom(16)
+        self._start = time.monotonic()
+        if self.enabled:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            logger.info(f"[GitHub Star Verify] 流量录制已开启: {path}")
+
+    def pseudonymize(self, qq_id: Any) -> int:
+        """将QQ号映射为稳定的10位假名"""
+        digest = hmac.new(self._salt, str(qq_id).encode("utf-8"), hashlib.sha256).digest()
+        return 1_000_000_000 + int.from_bytes(digest[:8], "big") % 9_000_000_000
+
+    def _pseudonymize_text(self, text: str) -> str:
+        return _CQ_AT_RE.sub(
+            lambda m: f"{m.group(1)}{self.pseudonymize(m.group(2))}{m.group(3)}", text
+        )
+
+    def _sanitize_event(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        event: Dict[str, Any] = {}
+        for key in _KEPT_FIELDS:
+            if key in raw:
+                event[key] = raw[key]
+        for key in _ID_FIELDS:
+            if event.get(key) is not None:
+                event[key] = self.pseudonymize(event[key])
+
+        segments = []
+        for seg in raw.get("message") or []:
+            if not isinstance(seg, dict):
+                continue
+            data = dict(seg.get("data") or {})
+            if seg.get("type") == "at" and "qq" in data and data["qq"] != "all":
+                data["qq"] = str(self.pseudonymize(data["qq"]))
+            elif seg.get("type") != "text":
+                # 图片、文件等内容不录制
+                data = {}
+            segments.append({"type": seg.get("type"), "data": data})
+        if segments:
+            event["message"] = segments
+        if isinstance(raw.get("raw_message"), str):
+            event["raw_message"] = self._pseudonymize_text(raw["raw_message"])
+        return event
+
+    def _write(self, record: Dict[str, Any]):
+        record["t"] = round(time.monotonic() - self._start, 6)
+        self._buffer.append(json.dumps(record, ensure_ascii=False))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def record_event(self, raw: Dict[str, Any], message_str: str = "", repo: Optional[str] = None):
+        if not self.enabled:
+            return
+        self._write(
+            {
+                "kind": "event",
+                "event": self._sanitize_event(raw),
+                "message_str": self._pseudonymize_text(message_str or ""),
+                "repo": repo,
+            }
+        )
+
+    def record_github(
+        self,
+        endpoint: str,
+        subject: str,
+        target_repo: str,
+        page: Optional[int],
+        status: Optional[int],
+        elapsed: float,
+        body: Any = None,
+        has_next: bool = False,
+        remaining: Optional[str] = None,
+    ):
+        """记录一次GitHub请求的结果摘要；subject 为被查询的用户名或仓库"""
+        if not self.enabled:
+            return
+        count = len(body) if isinstance(body, list) else 0
+        if endpoint == "repo" and isinstance(body, dict):
+            count = body.get("stargazers_count") or 0
+        matched = False
+        if endpoint == "starred" and isinstance(body, list):
+            matched = any(
+                isinstance(item, dict)
+                and (item.get("repo") or {}).get("full_name") == target_repo
+                for item in body
+            )
+        self._write(
+            {
+                "kind": "github",
+                "endpoint": endpoint,
+                "subject": subject,
+                "target": target_repo,
+                "page": page,
+                "status": status,
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "count": count,
+                "matched": matched,
+                "has_next": has_next,
+                "remaining": remaining,
+            }
+        )
+
+    def flush(self):
+        if not self._buffer or not self.path:
+            return
+        lines, self._buffer = self._buffer, []
+        try:
+            # gzip 支持追加多个成员，读取时会被连续解压
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 写入录制文件失败: {e}")
+
+
+# 全局录制器，由插件根据配置启用
+RECORDER = TraceRecorder()
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """读取录制文件，按时间排序返回所有记录"""
+    records = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    records.sort(key=lambda r: r.get("t", 0))
+    return records
@@ -0,0 +1,264 @@
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from astrbot.api import logger
+
+# 当前所在的 span，用于自动建立父子关系
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "github_star_verify_span", default=None
+)
+
+
+class SpanContext:
+    """跨任务传递的 span 标识（如排队的验证任务、出站消息）"""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+class Span:
+    """一次计时区间，既可用作 with 也可用作 async with"""
+
+    __slots__ = (
+        "tracer",
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attrs",
+        "start_time",
+        "start",
+        "duration",
+        "error",
+        "is_root",
+        "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional[SpanContext], attrs):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent.span_id if parent else None
+        self.attrs: Dict[str, Any] = attrs
+        self.start_time = 0.0
+        self.start = 0.0
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        self.is_root = False
+        self._token = None
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id)
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start_time = time.time()
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _current_span.reset(self._token)
+        self.tracer._finish(self)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start_time, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "attrs": self.attrs,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """追踪关闭时使用的空 span"""
+
+    context = None
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """轻量级追踪器：记录各阶段耗时，可导出为 JSONL"""
+
+    def __init__(self, buffer_size: int = 2000, flush_every: int = 100):
+        self.enabled = False
+        self.path = ""
+        self.flush_every = flush_every
+        self.recent: Deque[Span] = deque(maxlen=buffer_size)
+        self._pending_writes: List[str] = []
+
+    def configure(self, enabled: bool, path: str = ""):
+        self.enabled = enabled
+        self.path = path
+        if enabled and path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    def span(self, name: str, parent: Optional[SpanContext] = None, **attrs):
+        """创建 span；未指定 parent 时挂在当前 span 之下"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current else None
+        return Span(self, name, parent, attrs)
+
+    def root_span(self, name: str, parent: Optional[SpanContext] = None, **attrs):
+        """创建不继承当前上下文的 span（用于在工作协程中开始新的处理链）"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        span = Span(self, name, parent, attrs)
+        span.is_root = True
+        return span
+
+    def current_context(self) -> Optional[SpanContext]:
+        current = _current_span.get() if self.enabled else None
+        return current.context if current else None
+
+    def spans_for_trace(self, trace_id: str) -> List[Span]:
+        return [s for s in self.recent if s.trace_id == trace_id]
+
+    def summarize(self, span: Span) -> str:
+        """将某个 span 下各子阶段的耗时汇总为缩进文本"""
+        children: Dict[str, List[Span]] = {}
+        for s in self.spans_for_trace(span.trace_id):
+            children.setdefault(s.parent_id, []).append(s)
+
+        parts = []
+
+        def walk(parent_id: str, depth: int):
+            for child in sorted(children.get(parent_id, []), key=lambda s: s.start):
+                parts.append(f"{'  ' * depth}{child.name} {child.duration * 1000:.1f}ms")
+                walk(child.span_id, depth + 1)
+
+        walk(span.span_id, 1)
+        return "\n".join([f"{span.name} {span.duration * 1000:.1f}ms"] + parts)
+
+    def _finish(self, span: Span):
+        self.recent.append(span)
+        if not self.path:
+            return
+        self._pending_writes.append(json.dumps(span.to_dict(), ensure_ascii=False))
+        # 处理链的起点结束或缓冲较多时落盘
+        if span.is_root or len(self._pending_writes) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self._pending_writes or not self.path:
+            return
+        lines, self._pending_writes = self._pending_writes, []
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 写入追踪文件失败: {e}")
+
+
+# 全局追踪器，由插件根据配置启用
+TRACER = Tracer()
+
+
+class SlowPathProfiler:
+    """慢路径采样分析
+
+    按 sample_rate 对验证任务开启 cProfile，耗时超过 threshold 时将热点函数
+    写入 output_dir。cProfile 会统计同一事件循环中并发执行的其他协程，
+    因此同一时刻只分析一个任务，结果用于定位热点而非精确归因。
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.0,
+        enabled: bool = False,
+        sample_rate: float = 0.1,
+        output_dir: str = "",
+        top: int = 25,
+    ):
+        self.threshold = threshold
+        self.enabled = enabled and threshold > 0
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.top = top
+        self._active = False
+
+    def start(self) -> Optional[cProfile.Profile]:
+        if not self.enabled or self._active or random.random() >= self.sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 已有其他分析器在运行
+            return None
+        self._active = True
+        return profiler
+
+    def stop(self, profiler: Optional[cProfile.Profile], elapsed: float, label: str):
+        if profiler is None:
+            return
+        profiler.disable()
+        self._active = False
+        if elapsed < self.threshold:
+            return
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top)
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(
+                self.output_dir, f"slow-{int(time.time())}-{label}.txt"
+            )
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(stream.getvalue())
+            logger.warning(f"[GitHub Star Verify] 慢验证分析结果已写入: {path}")
+        except Exception as e:
+            logger.warning(f"[GitHub Star Verify] 写入分析结果失败: {e}")
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set
+from astrbot.api import logger
+
+# submit() 的返回值
+JOB_QUEUED = "queued"
+JOB_REPLACED = "replaced"
+JOB_REJECTED = "rejected"
+
+Job = Callable[[], Awaitable[None]]
+
+
+class VerificationWorkerPool:
+    """验证任务队列，由固定数量的异步工作协程处理
+
+    - 队列有长度上限，满时拒绝新任务（背压）
+    - 相同 key（如 (uid, group_id)）同时只有一个任务排队或执行；期间再次提交时
+      以新任务替换尚未开始的任务，或在当前任务结束后执行新任务（如用户更正了用户名）
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 200):
+        self.worker_count = max(workers, 1)
+        self.max_queue = max(max_queue, 1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._active_keys: Set[Hashable] = set()
+        # 各 key 尚未开始的任务（排队中，或等待同 key 的当前任务结束）
+        self._jobs: Dict[Hashable, Job] = {}
+
+    def _ensure_started(self):
+        """首次提交任务时在当前事件循环中启动工作协程"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    def depth(self) -> int:
+        """当前排队中的任务数"""
+        return self._queue.qsize() if self._queue else 0
+
+    def in_flight(self) -> int:
+        """排队与执行中的任务总数"""
+        return len(self._active_keys)
+
+    def submit(self, key: Hashable, job: Job) -> str:
+        """提交验证任务，返回 JOB_QUEUED / JOB_REPLACED / JOB_REJECTED"""
+        self._ensure_started()
+
+        if key in self._active_keys:
+            self._jobs[key] = job
+            return JOB_REPLACED
+
+        try:
+            self._queue.put_nowait(key)
+        except asyncio.QueueFull:
+            return JOB_REJECTED
+
+        self._jobs[key] = job
+        self._active_keys.add(key)
+        return JOB_QUEUED
+
+    async def _worker(self):
+        while True:
+            key = await self._queue.get()
+            try:
+                # 执行期间提交的新任务在同一工作协程中接着执行
+                while key in self._jobs:
+                    job = self._jobs.pop(key)
+                    try:
+                        await job()
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"[GitHub Star Verify] 验证任务 {key} 执行异常: {e}")
+            finally:
+                self._jobs.pop(key, None)
+                self._active_keys.discard(key)
+                self._queue.task_done()
+
+    async def close(self):
+        """停止所有工作协程并丢弃未处理的任务"""
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._active_keys.clear()
+        self._jobs.clear()
+        self._queue = None
@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import hmac
+import json
+from typing import Awaitable, Callable, Dict, Optional
+from astrbot.api import logger
+
+# GitHub 单次投递的负载上限为 25MB，star 事件远小于此，超过 1MB 直接拒绝
+MAX_BODY_SIZE = 1024 * 1024
+
+StarEventHandler = Callable[[str, str, str], Awaitable[None]]
+
+
+class WebhookRequestError(Exception):
+    """请求在读取阶段即被拒绝，携带要返回的状态行"""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def verify_signature(secret: str, body: bytes, signature: str) -> bool:
+    """校验 X-Hub-Signature-256 请求头（sha256=<hex>）"""
+    if not secret or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def parse_star_event(event: str, payload: Dict) -> Optional[tuple]:
+    """将 star / watch 事件解析为 (action, repo, login)，action 为 star 或 unstar"""
+    action = payload.get("action")
+    repo = (payload.get("repository") or {}).get("full_name")
+    login = (payload.get("sender") or {}).get("login")
+    if not repo or not login:
+        return None
+    if event == "star":
+        if action == "created":
+            return "star", repo, login
+        if action == "deleted":
+            return "unstar", repo, login
+    elif event == "watch" and action == "started":
+        return "star", repo, login
+    return None
+
+
+class GitHubWebhookServer:
+    """接收 GitHub star / watch 事件投递的本地 HTTP 端点
+
+    只接受 POST 到 path 的请求，签名校验失败返回 401；
+    解析出的事件交给 handler(action, repo, login) 处理。
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        handler: StarEventHandler,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/github/webhook",
+    ):
+        self.secret = secret
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.received = 0
+        self.rejected = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        if not self.port or self._server is not None:
+            return
+        if not self.secret:
+            logger.error("[GitHub Star Verify] 未配置 webhook_secret，Webhook 接收端未启动")
+            return
+        try:
+            self._server = await asyncio.start_server(self._handle_http, self.host, self.port)
+            logger.info(
+                f"[GitHub Star Verify] Webhook 接收端已启动: http://{self.host}:{self.port}{self.path}"
+            )
+        except OSError as e:
+            logger.error(f"[GitHub Star Verify] 启动 Webhook 接收端失败: {e}")
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+            if not line or line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise WebhookRequestError("400 Bad Request", "invalid content-length")
+        if length > MAX_BODY_SIZE:
+            raise WebhookRequestError("413 Payload Too Large", "too large")
+        body = await asyncio.wait_for(reader.readexactly(length), timeout=10) if length else b""
+        parts = request_line.decode("latin-1").split()
+        method = parts[0] if parts else ""
+        path = parts[1].split("?", 1)[0] if len(parts) > 1 else "/"
+        return method, path, headers, body
+
+    async def handle_request(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        """处理一次投递，返回 (状态行, 响应体)"""
+        if path != self.path:
+            return "404 Not Found", b"not found\n"
+        if method != "POST":
+            return "405 Method Not Allowed", b"method not allowed\n"
+        if not verify_signature(self.secret, body, headers.get("x-hub-signature-256", "")):
+            self.rejected += 1
+            logger.warning("[GitHub Star Verify] Webhook 签名校验失败，已拒绝")
+            return "401 Unauthorized", b"invalid signature\n"
+
+        self.received += 1
+        event = headers.get("x-github-event", "")
+        if event == "ping":
+            return "200 OK", b"pong\n"
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return "400 Bad Request", b"invalid json\n"
+
+        parsed = parse_star_event(event, payload)
+        if parsed is None:
+            return "202 Accepted", b"ignored\n"
+        try:
+            await self.handler(*parsed)
+        except Exception as e:
+            logger.error(f"[GitHub Star Verify] 处理 Webhook 事件失败: {e}")
+            return "500 Internal Server Error", b"error\n"
+        return "200 OK", b"ok\n"
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                status, body = await self.handle_request(*await self._read_request(reader))
+            except WebhookRequestError as e:
+                status, body = e.status, f"{e}\n".encode("utf-8")
+            writer.write(
+                (
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: text/plain; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"[GitHub Star Verify] Webhook 请求处理失败: {e}")
+        finally:
+            writer.close()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None